@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Measure /bb/preview latency with sequential and concurrent image rendering.
+
+Runs each payload through the Flask test client with ``PREVIEW_RENDER_WORKERS=0``
+(sequential) and with the configured worker count, then prints p50/p95 latency
+in milliseconds as JSON. The render cache is disabled so every request renders.
+
+Without the native Cairo library, bluey symbols come from a stub ``cairosvg``
+that returns a blank raster of the requested width. Symbol rasters are cached
+after the warm-up request either way, so timed requests never call it; the
+report says ``"cairosvg": "stub"`` when the stub was used.
+
+Usage::
+
+    .venv/bin/python scripts/benchmark_preview.py --iterations 40 --workers 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import types
+from pathlib import Path
+
+PAYLOADS: dict[str, dict[str, object]] = {
+    "best_by": {"template": "best_by", "data": {"Delta": "2 weeks"}},
+    "bluey": {
+        "template": "bluey_label",
+        "data": {"Line1": "Oat Milk", "Line2": "Shelf 2", "Side": "RT", "Bottom": "07/11/25"},
+    },
+    "bluey_jar": {
+        "template": "bluey_label",
+        "data": {
+            "Line1": "Sweet Potato",
+            "Line2": "Puree",
+            "Bottom": "07/11/25",
+            "Supplier": "Local Farm",
+            "Percentage": "50%",
+        },
+    },
+}
+
+
+def _percentile(samples: list[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def _install_cairosvg_stub() -> str:
+    """Return ``"native"``, or install a blank-raster ``cairosvg`` and return ``"stub"``."""
+    try:
+        import cairosvg  # noqa: F401
+    except OSError, ImportError:
+        pass
+    else:
+        return "native"
+    from PIL import Image
+
+    def svg2png(*, write_to=None, output_width=None, output_height=None, **_kwargs):
+        width = int(output_width or output_height or 120)
+        buffer = write_to or io.BytesIO()
+        Image.new("RGBA", (width, width), (0, 0, 0, 0)).save(buffer, format="PNG")
+        if write_to is None:
+            return buffer.getvalue()
+        return None
+
+    stub = types.ModuleType("cairosvg")
+    setattr(stub, "svg2png", svg2png)
+    sys.modules["cairosvg"] = stub
+    return "stub"
+
+
+def _measure(workers: int, iterations: int) -> dict[str, dict[str, float]]:
+    os.environ["PREVIEW_RENDER_WORKERS"] = str(workers)
+    from printer_service.app import create_app
+
+    client = create_app().test_client()
+    results: dict[str, dict[str, float]] = {}
+    for name, payload in PAYLOADS.items():
+        # Warm fonts, SVG rasters and imports; skip payloads this host cannot render
+        # (e.g. bluey labels without the native cairo library).
+        warmup = client.post("/bb/preview", json=payload)
+        if warmup.status_code != 200:
+            print(f"skipping {name}: preview returned {warmup.status_code}", file=sys.stderr)
+            continue
+        samples: list[float] = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            client.post("/bb/preview", json=payload)
+            samples.append((time.perf_counter() - started) * 1000)
+        results[name] = {
+            "p50_ms": round(statistics.median(samples), 2),
+            "p95_ms": round(_percentile(samples, 0.95), 2),
+        }
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=40)
+    parser.add_argument("--workers", type=int, default=3)
+    args = parser.parse_args()
+
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+    os.environ.setdefault("PRINTER_BACKEND", "file")
+    os.environ["LABEL_RENDER_CACHE_BYTES"] = "0"
+    os.environ.pop("MONGODB_URL", None)
+    os.environ.pop("PRINTER_DEV_RELOAD", None)
+
+    rasterizer = _install_cairosvg_stub()
+    report = {
+        "iterations": args.iterations,
+        "cairosvg": rasterizer,
+        "sequential": _measure(0, args.iterations),
+        "concurrent": _measure(args.workers, args.iterations),
+        "workers": args.workers,
+    }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
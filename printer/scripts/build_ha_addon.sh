@@ -180,6 +180,7 @@ COPY app/ /opt/printer/app/
 
 RUN \
   /opt/venv/bin/pip install --no-cache-dir /opt/printer/app \
+  && /opt/venv/bin/python -m printer_service.label_templates.symbol_pack \
   && find /opt/printer/app -type f -name '*.pyc' -delete \
   && find /opt/printer/app -type d -name '__pycache__' -delete \
   && apk del .build-deps
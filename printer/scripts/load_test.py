@@ -0,0 +1,581 @@
+#!/usr/bin/env python3
+"""Drive mixed HTTP traffic at the printer service and report latency as JSON.
+
+Starts ``create_app()`` under the real ``_serve_production`` server in a child
+process with ``PRINTER_BACKEND=file`` (labels are written to a temporary
+directory), seeds a handful of presets, then runs a fixed-duration load at the
+requested concurrency. Each worker picks a scenario by weight:
+
+- ``preview``: a burst of ``/bb/preview`` requests whose text grows one word at a
+  time, like someone typing into the form.
+- ``print``: ``POST /bb/print`` for one label.
+- ``presets``: ``GET /presets`` with a random sort column.
+- ``redirect``: ``GET /p/<slug>`` for a seeded preset (the 302 is not followed).
+
+Presets need a store. Pass ``--mongo-url`` to use a real MongoDB (e.g. the one
+started by ``just --justfile ../mongodb/Justfile start``), or ``--memory-presets``
+to back ``PresetStore`` with an in-process stand-in collection. Without either,
+preset scenarios are dropped from the mix.
+
+The report has throughput, p50/p95/p99 latency and error rate per scenario and
+overall. Every request opens a new connection, as ingress requests do today.
+
+Usage::
+
+    .venv/bin/python scripts/load_test.py --memory-presets --concurrency 8 --duration 30
+    .venv/bin/python scripts/load_test.py --mix preview=4,print=1 --output load.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import importlib
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+DEFAULT_MIX = "preview=5,print=1,presets=2,redirect=2"
+PRESET_SCENARIOS = {"presets", "redirect"}
+PRESET_SORTS = ("created", "updated", "name", "template", "prints")
+
+PREVIEW_WORDS = ("Roasted", "Butternut", "Squash", "&", "Sage", "Soup")
+
+SEED_PRESETS: tuple[dict[str, Any], ...] = (
+    {"name": "Two weeks", "template": "best_by", "data": {"Delta": "2 weeks"}},
+    {"name": "One month", "template": "best_by", "data": {"Delta": "1 month"}},
+    {
+        "name": "Oat milk",
+        "template": "bluey_label",
+        "data": {"Line1": "Oat Milk", "Line2": "Shelf 2", "Side": "RT", "Bottom": "07/11/25"},
+    },
+    {
+        "name": "Sweet potato jar",
+        "template": "bluey_label",
+        "data": {
+            "Line1": "Sweet Potato",
+            "Line2": "Puree",
+            "Supplier": "Local Farm",
+            "Percentage": "50%",
+        },
+    },
+    {
+        "name": "Meter",
+        "template": "bluey_label",
+        "data": {"Line1": "Rice", "Side": "=METER", "Percentage": "40:Half"},
+    },
+)
+
+
+# ---------------------------------------------------------------------------
+# Server child process
+# ---------------------------------------------------------------------------
+
+
+class _MemoryDeleteResult:
+    def __init__(self, deleted_count: int) -> None:
+        self.deleted_count = deleted_count
+
+
+class _MemoryCursor:
+    def __init__(self, docs: list[dict[str, Any]]) -> None:
+        self._docs = docs
+
+    def sort(self, key: str | list[tuple[str, int]], direction: int = 1) -> "_MemoryCursor":
+        keys = [(key, direction)] if isinstance(key, str) else key
+        # Stable sorts from the last key to the first; missing values sort first, as in Mongo.
+        for field_name, field_direction in reversed(keys):
+            self._docs.sort(
+                key=lambda doc: (doc.get(field_name) is not None, doc.get(field_name)),
+                reverse=field_direction < 0,
+            )
+        return self
+
+    def limit(self, limit: int) -> "_MemoryCursor":
+        self._docs = self._docs[:limit]
+        return self
+
+    def __iter__(self):
+        return iter(self._docs)
+
+
+class _MemoryCollection:
+    """The subset of a pymongo collection that ``PresetStore`` uses, keyed by slug."""
+
+    def __init__(self) -> None:
+        self._docs: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create_index(self, *_args: object, **_kwargs: object) -> None:
+        return None
+
+    def create_indexes(self, indexes: list[Any]) -> list[str]:
+        return [index.document["name"] for index in indexes]
+
+    def find(
+        self, query: dict[str, Any], projection: Optional[dict[str, int]] = None
+    ) -> _MemoryCursor:
+        with self._lock:
+            docs = [doc for doc in self._docs.values() if _matches(doc, query)]
+            return _MemoryCursor([_project(doc, projection) for doc in docs])
+
+    def count_documents(self, query: dict[str, Any]) -> int:
+        with self._lock:
+            return sum(1 for doc in self._docs.values() if _matches(doc, query))
+
+    def find_one(
+        self, query: dict[str, Any], projection: Optional[dict[str, int]] = None
+    ) -> Optional[dict[str, Any]]:
+        with self._lock:
+            doc = self._docs.get(query.get("slug", ""))
+            if doc is None:
+                return None
+            return _project(doc, projection)
+
+    def find_one_and_update(
+        self,
+        query: dict[str, Any],
+        update: dict[str, dict[str, Any]],
+        upsert: bool = False,
+        return_document: object = None,
+    ) -> Optional[dict[str, Any]]:
+        del return_document
+        slug = query.get("slug", "")
+        with self._lock:
+            doc = self._docs.get(slug)
+            if doc is None:
+                if not upsert:
+                    return None
+                doc = {"slug": slug, **update.get("$setOnInsert", {})}
+            _apply_update(doc, update)
+            self._docs[slug] = doc
+            return dict(doc)
+
+    def bulk_write(self, operations: list[Any], ordered: bool = True) -> None:
+        """Apply ``UpdateOne`` operations, as the print count buffer flushes them."""
+        del ordered
+        with self._lock:
+            for operation in operations:
+                # pymongo keeps the filter and update of an ``UpdateOne`` here.
+                doc = self._docs.get(operation._filter.get("slug", ""))
+                if doc is not None:
+                    _apply_update(doc, operation._doc)
+
+    def delete_one(self, query: dict[str, Any]) -> _MemoryDeleteResult:
+        with self._lock:
+            removed = self._docs.pop(query.get("slug", ""), None)
+        return _MemoryDeleteResult(0 if removed is None else 1)
+
+
+def _matches(doc: dict[str, Any], query: dict[str, Any]) -> bool:
+    """Evaluate the filters ``PresetStore`` sends: equality, ``$or`` and keyset ranges."""
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(_matches(doc, clause) for clause in condition):
+                return False
+            continue
+        value = doc.get(key)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+            continue
+        for operator, operand in condition.items():
+            if operator == "$ne":
+                matched = value != operand
+            elif operator in ("$gt", "$lt"):
+                # Range operators never match a missing value.
+                matched = value is not None and (
+                    value > operand if operator == "$gt" else value < operand
+                )
+            else:
+                raise ValueError(f"Unsupported query operator {operator!r}.")
+            if not matched:
+                return False
+    return True
+
+
+def _project(doc: dict[str, Any], projection: Optional[dict[str, int]]) -> dict[str, Any]:
+    included = [key for key, enabled in (projection or {}).items() if enabled]
+    if not included:
+        return dict(doc)
+    return {key: doc[key] for key in included if key in doc}
+
+
+def _apply_update(doc: dict[str, Any], update: dict[str, dict[str, Any]]) -> None:
+    doc.update(update.get("$set", {}))
+    for key, value in update.get("$inc", {}).items():
+        doc[key] = doc.get(key, 0) + value
+    for key, value in update.get("$max", {}).items():
+        current = doc.get(key)
+        doc[key] = value if current is None else max(current, value)
+
+
+class _MemoryMetaCollection:
+    """``preset_store_meta``: the store records its index version here, keyed by ``_id``."""
+
+    def __init__(self) -> None:
+        self._docs: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def find_one(self, query: dict[str, Any]) -> Optional[dict[str, Any]]:
+        with self._lock:
+            doc = self._docs.get(query["_id"])
+            return None if doc is None else dict(doc)
+
+    def update_one(
+        self, query: dict[str, Any], update: dict[str, dict[str, Any]], upsert: bool = False
+    ) -> None:
+        with self._lock:
+            doc = self._docs.get(query["_id"])
+            if doc is None:
+                if not upsert:
+                    return
+                doc = self._docs[query["_id"]] = {"_id": query["_id"]}
+            _apply_update(doc, update)
+
+
+class _MemoryClient:
+    def __init__(self) -> None:
+        self._collections = {
+            "presets": _MemoryCollection(),
+            "preset_store_meta": _MemoryMetaCollection(),
+        }
+
+    def __getitem__(self, _database: str) -> dict[str, Any]:
+        return self._collections
+
+    def close(self) -> None:
+        return None
+
+
+def _serve(host: str, port: int, memory_presets: bool) -> None:
+    sys.path.insert(0, str(SRC_DIR))
+    from printer_service import presets
+
+    # The package re-exports the Flask ``app`` object under the module's name.
+    app_module = importlib.import_module("printer_service.app")
+
+    if memory_presets:
+        client = _MemoryClient()
+
+        def from_env(cls: type[presets.PresetStore]) -> presets.PresetStore:
+            store = cls(client, presets.DEFAULT_DB)  # type: ignore[arg-type]
+            # Same start-up path as a real connection.
+            store.ensure_indexes()
+            return store
+
+        presets.PresetStore.from_env = classmethod(from_env)  # type: ignore[method-assign,assignment]
+    app_module._serve_production(app_module.create_app(), host, port)
+
+
+def _free_port(host: str) -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind((host, 0))
+        return int(probe.getsockname()[1])
+
+
+def _start_server(args: argparse.Namespace, output_dir: Path) -> subprocess.Popen[bytes]:
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC_DIR), os.getenv("PYTHONPATH")])),
+        "PRINTER_BACKEND": "file",
+        "PRINTER_OUTPUT_PATH": str(output_dir / "label-output.png"),
+    }
+    env.pop("PRINTER_DEV_RELOAD", None)
+    env.pop("MONGODB_URL", None)
+    if args.mongo_url:
+        env["MONGODB_URL"] = args.mongo_url
+    command = [sys.executable, __file__, "--serve", "--host", args.host, "--port", str(args.port)]
+    if args.memory_presets:
+        command.append("--memory-presets")
+    return subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL)
+
+
+def _wait_until_ready(
+    host: str, port: int, server: subprocess.Popen[bytes], timeout_seconds: float
+) -> None:
+    deadline = time.monotonic() + timeout_seconds
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Printer service exited with status {server.returncode}.")
+        try:
+            status, _body = _request(host, port, "GET", "/health/ready", timeout=1.0)
+            if status == 200:
+                return
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Printer service was not ready within {timeout_seconds:.0f}s.")
+
+
+def _stop_server(server: subprocess.Popen[bytes]) -> None:
+    if server.poll() is not None:
+        return
+    server.send_signal(signal.SIGTERM)
+    try:
+        server.wait(timeout=40)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        server.wait()
+
+
+# ---------------------------------------------------------------------------
+# Load generation
+# ---------------------------------------------------------------------------
+
+
+def _request(
+    host: str,
+    port: int,
+    method: str,
+    path: str,
+    payload: Optional[dict[str, Any]] = None,
+    *,
+    timeout: float = 30.0,
+) -> tuple[int, bytes]:
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        body = None if payload is None else json.dumps(payload)
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+
+@dataclass
+class _ScenarioStats:
+    latencies_ms: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: dict[str, int] = field(default_factory=dict)
+
+    def record(self, elapsed_ms: float, status: Optional[int], ok: bool) -> None:
+        self.latencies_ms.append(elapsed_ms)
+        key = str(status) if status is not None else "connection_error"
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+        if not ok:
+            self.errors += 1
+
+    def merge(self, other: "_ScenarioStats") -> None:
+        self.latencies_ms.extend(other.latencies_ms)
+        self.errors += other.errors
+        for key, count in other.statuses.items():
+            self.statuses[key] = self.statuses.get(key, 0) + count
+
+    def summary(self, elapsed_seconds: float) -> dict[str, object]:
+        count = len(self.latencies_ms)
+        return {
+            "requests": count,
+            "errors": self.errors,
+            "error_rate": round(self.errors / count, 4) if count else 0.0,
+            "throughput_rps": round(count / elapsed_seconds, 2) if elapsed_seconds else 0.0,
+            "p50_ms": _percentile(self.latencies_ms, 0.50),
+            "p95_ms": _percentile(self.latencies_ms, 0.95),
+            "p99_ms": _percentile(self.latencies_ms, 0.99),
+            "max_ms": round(max(self.latencies_ms), 2) if count else None,
+            "statuses": dict(sorted(self.statuses.items())),
+        }
+
+
+def _percentile(samples: list[float], fraction: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * (len(ordered) - 1)))))
+    return round(ordered[index], 2)
+
+
+class _LoadClient:
+    def __init__(self, host: str, port: int, slugs: list[str], burst: int) -> None:
+        self.host = host
+        self.port = port
+        self.slugs = slugs
+        self.burst = burst
+
+    def _timed(
+        self,
+        stats: _ScenarioStats,
+        method: str,
+        path: str,
+        payload: Optional[dict[str, Any]] = None,
+        *,
+        expected: tuple[int, ...] = (200,),
+    ) -> None:
+        started = time.perf_counter()
+        status: Optional[int] = None
+        try:
+            status, _body = _request(self.host, self.port, method, path, payload)
+        except OSError:
+            pass
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        stats.record(elapsed_ms, status, status in expected)
+
+    def preview(self, stats: _ScenarioStats, rng: random.Random) -> None:
+        line2 = f"Batch {rng.randint(1, 999)}"
+        for step in range(1, self.burst + 1):
+            words = PREVIEW_WORDS[: 1 + step % len(PREVIEW_WORDS)]
+            payload = {
+                "template": "bluey_label",
+                "data": {"Line1": " ".join(words), "Line2": line2, "Bottom": "07/11/25"},
+            }
+            self._timed(stats, "POST", "/bb/preview", payload)
+
+    def print(self, stats: _ScenarioStats, rng: random.Random) -> None:
+        payload = {"template": "best_by", "data": {"Delta": f"{rng.randint(1, 6)} weeks"}}
+        self._timed(stats, "POST", "/bb/print", payload)
+
+    def presets(self, stats: _ScenarioStats, rng: random.Random) -> None:
+        self._timed(stats, "GET", f"/presets?sort={rng.choice(PRESET_SORTS)}")
+
+    def redirect(self, stats: _ScenarioStats, rng: random.Random) -> None:
+        self._timed(stats, "GET", f"/p/{rng.choice(self.slugs)}", expected=(302,))
+
+
+def _seed_presets(host: str, port: int) -> list[str]:
+    slugs: list[str] = []
+    for preset in SEED_PRESETS:
+        status, body = _request(host, port, "POST", "/presets", preset)
+        if status != 200:
+            raise RuntimeError(f"Seeding preset {preset['name']!r} returned {status}: {body!r}")
+        slugs.append(json.loads(body)["preset"]["slug"])
+    return slugs
+
+
+def _parse_mix(raw: str) -> dict[str, int]:
+    mix: dict[str, int] = {}
+    for part in raw.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in {"preview", "print", "presets", "redirect"}:
+            raise argparse.ArgumentTypeError(f"Unknown scenario {name!r} in --mix.")
+        try:
+            mix[name] = int(weight or "1")
+        except ValueError as exc:
+            raise argparse.ArgumentTypeError(f"Weight for {name!r} must be an integer.") from exc
+    if not any(weight > 0 for weight in mix.values()):
+        raise argparse.ArgumentTypeError("--mix needs at least one positive weight.")
+    return mix
+
+
+def _run_load(
+    client: _LoadClient, mix: dict[str, int], concurrency: int, duration: float, seed: int
+) -> tuple[dict[str, _ScenarioStats], float]:
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    scenarios: dict[str, Callable[[_ScenarioStats, random.Random], None]] = {
+        name: getattr(client, name) for name in names
+    }
+    per_worker: list[dict[str, _ScenarioStats]] = [
+        {name: _ScenarioStats() for name in names} for _ in range(concurrency)
+    ]
+    deadline = time.monotonic() + duration
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed + index)
+        stats = per_worker[index]
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            scenarios[name](stats[name], rng)
+
+    threads = [
+        threading.Thread(target=worker, args=(index,), name=f"load-{index}", daemon=True)
+        for index in range(concurrency)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    combined = {name: _ScenarioStats() for name in names}
+    for stats in per_worker:
+        for name, scenario_stats in stats.items():
+            combined[name].merge(scenario_stats)
+    return combined, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds of load")
+    parser.add_argument("--mix", type=_parse_mix, default=_parse_mix(DEFAULT_MIX))
+    parser.add_argument("--burst", type=int, default=4, help="previews per preview burst")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--mongo-url", help="MONGODB_URL for the service under test")
+    parser.add_argument(
+        "--memory-presets",
+        action="store_true",
+        help="back presets with an in-process stand-in instead of MongoDB",
+    )
+    parser.add_argument("--startup-timeout", type=float, default=60.0)
+    parser.add_argument("--output", type=Path, help="also write the JSON report here")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        _serve(args.host, args.port, args.memory_presets)
+        return
+    if args.mongo_url and args.memory_presets:
+        parser.error("--mongo-url and --memory-presets are mutually exclusive")
+    if args.port == 0:
+        args.port = _free_port(args.host)
+
+    mix = dict(args.mix)
+    has_presets = bool(args.mongo_url or args.memory_presets)
+    if not has_presets:
+        for name in PRESET_SCENARIOS & mix.keys():
+            print(f"skipping {name}: no preset store configured", file=sys.stderr)
+            del mix[name]
+        if not any(weight > 0 for weight in mix.values()):
+            parser.error("nothing left to run; pass --memory-presets or --mongo-url")
+
+    with tempfile.TemporaryDirectory(prefix="printer-load-") as output_dir:
+        server = _start_server(args, Path(output_dir))
+        try:
+            startup_started = time.perf_counter()
+            _wait_until_ready(args.host, args.port, server, args.startup_timeout)
+            startup_seconds = time.perf_counter() - startup_started
+            slugs = _seed_presets(args.host, args.port) if has_presets else []
+            client = _LoadClient(args.host, args.port, slugs, max(args.burst, 1))
+            results, elapsed = _run_load(
+                client, mix, max(args.concurrency, 1), args.duration, args.seed
+            )
+        finally:
+            _stop_server(server)
+
+    overall = _ScenarioStats()
+    for stats in results.values():
+        overall.merge(stats)
+    report = {
+        "concurrency": args.concurrency,
+        "duration_s": round(elapsed, 2),
+        "mix": mix,
+        "presets": "mongo" if args.mongo_url else "memory" if args.memory_presets else None,
+        "startup_s": round(startup_seconds, 2),
+        "overall": overall.summary(elapsed),
+        "scenarios": {name: stats.summary(elapsed) for name, stats in results.items()},
+    }
+    rendered = json.dumps(report, indent=2)
+    print(rendered)
+    if args.output:
+        args.output.write_text(rendered + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,38 +1,94 @@
 from __future__ import annotations
 
-import base64
+import hashlib
 import json
 import os
 import signal
 import threading
 import time
 from collections.abc import Mapping
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import partial
 from pathlib import Path
 from typing import Any, Callable, List, Optional, Sequence, TypeGuard
 from urllib.parse import urlencode, urljoin
 
-from flask import Flask, abort, current_app, jsonify, redirect, render_template, request, url_for
+from flask import (
+    Flask,
+    Response,
+    abort,
+    copy_current_request_context,
+    current_app,
+    g,
+    jsonify,
+    redirect,
+    render_template,
+    request,
+    url_for,
+)
 from PIL import Image, UnidentifiedImageError
-from werkzeug.serving import make_server
+from werkzeug.serving import BaseWSGIServer, make_server
 
 from . import best_by as best_by_request
-from . import label_templates
+from . import label_templates, metrics
 from .label_templates import TemplateFormData, TemplateFormValue
-from .label_templates import best_by as best_by_label
-from .mongo import mongo_health
-from .presets import Preset, PresetStore, canonical_query_string, get_cached_store
+from .label_templates import symbol_pack
+from .mongo import MongoHealthMonitor, mongo_health
+from .presets import (
+    DEFAULT_PRESET_PAGE_SIZE,
+    PRESET_FIELDS,
+    Preset,
+    PresetBackend,
+    canonical_query_string,
+    flush_cached_store,
+    get_cached_store,
+    pooled_mongo_ping,
+    preset_cache_stats,
+    start_store_bootstrap,
+)
 from .preview import PreviewPayloadBuilder, PreviewPayloadError
-from .print_dispatcher import PrintDispatchService
+from .preview_images import PreviewImageStore, is_valid_digest
+from .print_dispatcher import BatchPrintItem, PrintDispatchService
+from .print_spooler import (
+    PRIORITIES,
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    PrintSpooler,
+    PrintWork,
+    SpoolerFull,
+)
 from .label import (
     SUPPORTED_BACKENDS,
     PrinterConfig,
     LabelMetrics,
     analyze_label_image,
+    close_brother_connections,
     dispatch_image,
+    dispatch_images,
     label_spec_from_metadata,
+    raster_cache_stats,
 )
 from .label_specs import BrotherLabelSpec
+from .serving import (
+    PrimaryForwarder,
+    WorkerGroup,
+    keepalive_seconds_from_env,
+    request_handler,
+    serve_prefork,
+    workers_from_env,
+)
+from .timings import PhaseTimings, collecting, phase
+from .warmup import WarmupState, default_steps, run_warmup
+
+MAX_BATCH_ITEMS = 50
+MAX_BATCH_LABELS = 100
+# Routes served only by pre-fork worker 0, which owns the print spooler, the
+# printer connection and the job registry; other workers forward them.
+PRIMARY_ROUTES = ("/bb/execute-print", "/bb/print", "/print", "/jobs/", "/metrics")
+DEFAULT_SNAPSHOT_SECONDS = 5.0
+# A shutdown during warm-up waits this long for the step in progress.
+WARMUP_SHUTDOWN_WAIT_SECONDS = 5.0
 
 
 class _IngressPrefixMiddleware:
@@ -66,12 +122,23 @@ def _dispatch_image(
     return dispatch_image(image, config, target_spec=target_spec)
 
 
+def _dispatch_images(
+    images: Sequence[Image.Image],
+    config: PrinterConfig,
+    *,
+    target_specs: Optional[Sequence[Optional[BrotherLabelSpec]]] = None,
+):
+    return dispatch_images(images, config, target_specs=target_specs)
+
+
 def create_app() -> Flask:
     app = Flask(__name__)
     app.wsgi_app = _IngressPrefixMiddleware(app.wsgi_app)  # type: ignore[method-assign]
+    preview_images = PreviewImageStore.from_env()
+    render_executor = _render_executor()
     preview_builder = PreviewPayloadBuilder(
         analyze_label_image=analyze_label_image,
-        data_url_for_image=_data_url_for_image,
+        image_url_for_image=partial(_preview_image_url, preview_images),
         best_by_template=best_by_request.best_by_template,
         print_url_for_template=_print_url_for_template,
         qr_caption_for_template=_qr_caption_for_template,
@@ -79,7 +146,8 @@ def create_app() -> Flask:
         jar_qr_url_for_template=_jar_qr_url_for_template,
         label_spec_from_metadata=label_spec_from_metadata,
         best_by_text_value=best_by_request.best_by_text_value,
-        compute_best_by=best_by_label.compute_best_by,
+        compute_best_by=_compute_best_by,
+        executor=render_executor,
     )
     print_dispatcher = PrintDispatchService(
         analyze_label_image=analyze_label_image,
@@ -92,10 +160,20 @@ def create_app() -> Flask:
         label_spec_from_metadata=label_spec_from_metadata,
         best_by_template=best_by_request.best_by_template,
         best_by_text_value=best_by_request.best_by_text_value,
-        compute_best_by=best_by_label.compute_best_by,
+        compute_best_by=_compute_best_by,
         success_payload=_success_payload,
         payload_error=LabelPayloadError,
+        raster_cache_stats=raster_cache_stats,
+        dispatch_images=_dispatch_images,
+        executor=render_executor,
     )
+    print_spooler = PrintSpooler.from_env()
+    warmup_state = WarmupState()
+    mongo_monitor = MongoHealthMonitor.from_env(_probe_mongo_health)
+    app.extensions["print_spooler"] = print_spooler
+    app.extensions["warmup"] = warmup_state
+    app.extensions["mongo_health"] = mongo_monitor
+    app.extensions["preview_images"] = preview_images
 
     @app.get("/")
     def index():
@@ -117,19 +195,42 @@ def create_app() -> Flask:
     def execute_print_route():
         """Execute print after countdown completion."""
         template = _template_from_request(default_template=best_by_request.best_by_template())
-        return _print_from_request(template, print_dispatcher)
+        return _print_from_request(template, print_dispatcher, print_spooler)
 
     @app.post("/bb/preview")
     def preview_bb():
         payload = request.get_json(silent=True) or {}
+        timings = PhaseTimings()
         try:
             template, form_data = _template_and_form_from_payload(payload)
-            preview = preview_builder.build(template, form_data)
+            with collecting(timings):
+                preview = preview_builder.build(template, form_data)
         except PreviewPayloadError as exc:
             return jsonify({"error": str(exc)}), 400
         except LabelPayloadError as exc:
             return jsonify({"error": str(exc)}), exc.status_code
-        return jsonify(preview)
+        if _wants_timings(payload):
+            preview["timings"] = timings.to_dict()
+        return _with_server_timing(jsonify(preview), timings)
+
+    @app.get("/bb/preview/img/<digest>.png")
+    def preview_image_route(digest: str):
+        if not is_valid_digest(digest):
+            abort(404)
+        # Digests are content hashes, so a matching validator is still valid
+        # after the image itself has expired from the store.
+        if request.if_none_match.contains(digest):
+            response = app.response_class(status=304)
+        else:
+            png = preview_images.get(digest)
+            if png is None:
+                abort(404)
+            response = app.response_class(png, mimetype="image/png")
+        response.set_etag(digest)
+        response.cache_control.private = True
+        response.cache_control.max_age = int(preview_images.ttl_seconds)
+        response.cache_control.immutable = True
+        return response
 
     @app.post("/bb/print")
     def print_bb():
@@ -143,9 +244,29 @@ def create_app() -> Flask:
             include_qr_label = _is_truthy(str(payload.get("qr_label")))
         return _dispatch_print(
             print_dispatcher,
+            print_spooler,
             template,
             form_data,
             include_qr_label=include_qr_label,
+            priority=_print_priority(payload),
+            asynchronous=_wants_async_print(payload),
+            include_timings=_wants_timings(payload),
+        )
+
+    @app.post("/bb/print/batch")
+    def print_batch_route():
+        payload = request.get_json(silent=True) or {}
+        try:
+            items = _batch_items_from_payload(payload)
+        except LabelPayloadError as exc:
+            return jsonify({"error": str(exc)}), exc.status_code
+        return _dispatch_batch_print(
+            print_dispatcher,
+            print_spooler,
+            items,
+            priority=_print_priority(payload, default=PRIORITY_BULK),
+            asynchronous=_wants_async_print(payload),
+            include_timings=_wants_timings(payload),
         )
 
     @app.post("/print")
@@ -160,13 +281,14 @@ def create_app() -> Flask:
             except UnidentifiedImageError, OSError:
                 return jsonify({"error": "Uploaded file must be a readable image."}), 400
             metrics = analyze_label_image(image, config)
-            try:
-                result = dispatch_image(image, config)
-            except ValueError as exc:
-                return jsonify({"error": str(exc)}), 400
-            except OSError as exc:
-                return jsonify({"error": f"Printer unavailable: {exc}"}), 503
-            return jsonify(_success_payload(result, warnings=metrics.warnings, metrics=metrics))
+            return _spool_print(
+                print_spooler,
+                _image_print_work(image, config, metrics),
+                backend=config.backend,
+                priority=_print_priority(request.form),
+                asynchronous=_wants_async_print(request.form),
+                include_timings=_wants_timings(request.form),
+            )
 
         payload = request.get_json(silent=True) or {}
         if "backend" in payload:
@@ -183,13 +305,21 @@ def create_app() -> Flask:
             return jsonify({"error": str(exc)}), exc.status_code
         target_spec = template_ref.preferred_label_spec() if template_ref else None
         metrics = analyze_label_image(image, config, target_spec=target_spec)
-        try:
-            result = dispatch_image(image, config, target_spec=target_spec)
-        except ValueError as exc:
-            return jsonify({"error": str(exc)}), 400
-        except OSError as exc:
-            return jsonify({"error": f"Printer unavailable: {exc}"}), 503
-        return jsonify(_success_payload(result, warnings=metrics.warnings, metrics=metrics))
+        return _spool_print(
+            print_spooler,
+            _image_print_work(image, config, metrics, target_spec=target_spec),
+            backend=config.backend,
+            priority=_print_priority(payload),
+            asynchronous=_wants_async_print(payload),
+            include_timings=_wants_timings(payload),
+        )
+
+    @app.get("/jobs/<job_id>")
+    def job_status_route(job_id: str):
+        job = print_spooler.get(job_id)
+        if job is None:
+            return jsonify({"error": "Unknown print job."}), 404
+        return jsonify(job.to_dict())
 
     @app.get("/presets")
     def list_presets_route():
@@ -220,14 +350,37 @@ def create_app() -> Flask:
                     in {"created", "created_at", "updated", "updated_at", "prints", "print_count"}
                     else "asc"
                 )
-            presets = store.list_presets(sort_by=sort_by, direction=direction)
+            try:
+                limit = int(request.args.get("limit") or DEFAULT_PRESET_PAGE_SIZE)
+            except ValueError:
+                limit = DEFAULT_PRESET_PAGE_SIZE
+            limit = min(max(1, limit), DEFAULT_PRESET_PAGE_SIZE)
+            after = request.args.get("after", "").strip() or None
+            fields = _preset_fields_from_query()
+            if fields is None:
+                return jsonify({"error": "Unknown preset field."}), 400
+            # An empty projection means every field.
+            selected = fields or None
+            etag = _preset_list_etag(
+                store.presets_version(), sort_by, direction, limit, after, selected
+            )
+            if request.if_none_match.contains_weak(etag):
+                return _preset_list_response(app.response_class(status=304), etag)
+            page = store.list_presets(
+                sort_by=sort_by, direction=direction, limit=limit, after=after, fields=selected
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
         except Exception as exc:
             app.logger.warning("Preset list failed: %s", exc)
             return jsonify({"error": "Preset storage unavailable."}), 503
         finally:
             store.close()
-        payload = [_preset_payload(preset) for preset in presets]
-        return jsonify({"presets": payload, "count": len(payload)})
+        payload = [_preset_payload(preset, selected) for preset in page.presets]
+        response = jsonify(
+            {"presets": payload, "count": len(payload), "next_cursor": page.next_cursor}
+        )
+        return _preset_list_response(response, etag)
 
     @app.post("/presets")
     def save_preset_route():
@@ -334,6 +487,22 @@ def create_app() -> Flask:
 
     mongo_logged = {"done": False}
 
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+        return None
+
+    @app.after_request
+    def record_request_latency(response: Response) -> Response:
+        started = g.pop("request_started", None)
+        if started is not None:
+            # Label by URL rule so /jobs/<job_id> is one series rather than one per job.
+            route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+            metrics.HTTP_REQUEST_SECONDS.labels(
+                route, request.method, response.status_code
+            ).observe(time.perf_counter() - started)
+        return response
+
     @app.before_request
     def log_mongo_health_once():
         # The health endpoint performs this check itself; avoid doubling its
@@ -343,7 +512,7 @@ def create_app() -> Flask:
         if mongo_logged["done"]:
             return None
         mongo_logged["done"] = True
-        status = mongo_health()
+        status = mongo_monitor.status()
         if not status.get("configured"):
             error = status.get("error")
             if error:
@@ -363,7 +532,7 @@ def create_app() -> Flask:
 
     @app.get("/health/mongo")
     def mongo_health_route():
-        status = mongo_health()
+        status = mongo_monitor.status()
         ok = status.get("ok")
         configured = status.get("configured")
         if configured and ok is False:
@@ -372,9 +541,103 @@ def create_app() -> Flask:
             return jsonify(status), 500
         return jsonify(status)
 
+    @app.get("/health/ready")
+    def readiness_route():
+        snapshot = warmup_state.snapshot()
+        return jsonify(snapshot), (200 if snapshot["ready"] else 503)
+
+    @app.get("/health/fonts")
+    def font_health_route():
+        return jsonify(label_templates.helper.font_report())
+
+    @app.get("/health/caches")
+    def cache_health_route():
+        # Imported on first use so loading the app does not import qrcode.
+        from .label_templates import qr_codes
+
+        return jsonify(
+            {
+                "render": label_templates.render_cache_stats(),
+                "preview_images": preview_images.stats(),
+                "raster": raster_cache_stats(),
+                "svg_symbols": symbol_pack.pack_stats(),
+                "qr": qr_codes.qr_cache_stats(),
+                "presets": preset_cache_stats(),
+            }
+        )
+
+    @app.get("/metrics")
+    def metrics_route():
+        group = app.extensions.get("worker_group")
+        peers = group.peer_snapshots() if isinstance(group, WorkerGroup) else []
+        registry = metrics.REGISTRY
+        if peers:
+            registry = registry.merged(peer.get("registry", {}) for peer in peers)
+        body = registry.exposition(extra=_scrape_time_metrics(print_spooler, peers))
+        return app.response_class(body, content_type=metrics.CONTENT_TYPE)
+
     return app
 
 
+def _scrape_time_metrics(
+    print_spooler: PrintSpooler, peers: Sequence[Mapping[str, Any]] = ()
+) -> list[metrics.Family]:
+    """Queue depth and cache counters, read from their owners when scraped.
+
+    ``peers`` are the snapshots of other pre-fork workers; their cache counters
+    are added to this process's.
+    """
+    depths = print_spooler.queue_depths()
+    queue_depth = metrics.Family(
+        "printer_print_queue_depth",
+        "gauge",
+        "Print jobs queued or running per backend.",
+        [
+            metrics.Sample((("backend", backend),), depth)
+            for backend, depth in sorted(depths.items())
+        ],
+    )
+    caches = _cache_counts()
+    for peer in peers:
+        peer_caches = peer.get("caches")
+        if not isinstance(peer_caches, Mapping):
+            continue
+        for name, counts in peer_caches.items():
+            if name in caches and isinstance(counts, Sequence) and len(counts) == 2:
+                hits, misses = caches[name]
+                caches[name] = (hits + int(counts[0]), misses + int(counts[1]))
+    return [queue_depth, *metrics.cache_families(caches)]
+
+
+def _cache_counts() -> dict[str, tuple[int, int]]:
+    from .label_templates import qr_codes
+
+    qr = qr_codes.qr_cache_stats()
+    cache_stats: dict[str, Mapping[str, object]] = {
+        "font": label_templates.helper.font_cache_stats(),
+        "qr": {"hits": qr["image_hits"], "misses": qr["image_misses"]},
+        "render": label_templates.render_cache_stats(),
+        "svg_pack": symbol_pack.pack_stats(),
+        "svg_raster": label_templates.helper.svg_raster_cache_stats(),
+    }
+    preset_stats = preset_cache_stats()
+    if preset_stats is not None and isinstance(preset_stats["presets"], Mapping):
+        cache_stats["presets"] = preset_stats["presets"]
+    return {
+        name: (_int_stat(stats, "hits"), _int_stat(stats, "misses"))
+        for name, stats in cache_stats.items()
+    }
+
+
+def _worker_snapshot() -> dict[str, object]:
+    return {"registry": metrics.REGISTRY.snapshot(), "caches": _cache_counts()}
+
+
+def _int_stat(stats: Mapping[str, object], key: str) -> int:
+    value = stats.get(key, 0)
+    return int(value) if isinstance(value, (int, float)) else 0
+
+
 def _success_payload(
     path: Optional[object],
     *,
@@ -397,7 +660,13 @@ class PresetServiceError(Exception):
         self.status_code = status_code
 
 
-def _get_preset_store() -> PresetStore:
+def _probe_mongo_health() -> dict[str, object]:
+    # Once the preset store has connected, ping through its pooled client rather
+    # than opening a client per candidate host.
+    return mongo_health(pooled=pooled_mongo_ping())
+
+
+def _get_preset_store() -> PresetBackend:
     try:
         store = get_cached_store()
     except ValueError as exc:
@@ -411,7 +680,7 @@ def _get_preset_store() -> PresetStore:
     return store
 
 
-def _preset_payload(preset: Preset) -> dict[str, object]:
+def _preset_payload(preset: Preset, fields: Optional[Sequence[str]] = None) -> dict[str, object]:
     payload: dict[str, object] = {
         "slug": preset.slug,
         "name": preset.name,
@@ -423,9 +692,34 @@ def _preset_payload(preset: Preset) -> dict[str, object]:
     }
     if preset.params is not None:
         payload["params"] = preset.params
+    if fields:
+        return {key: value for key, value in payload.items() if key == "slug" or key in fields}
     return payload
 
 
+def _preset_fields_from_query() -> Optional[list[str]]:
+    """Return the ``fields=`` selection, ``[]`` for all fields, or ``None`` if invalid."""
+    raw = request.args.get("fields", "")
+    fields = sorted({field.strip().lower() for field in raw.split(",") if field.strip()})
+    if any(field not in PRESET_FIELDS for field in fields):
+        return None
+    return fields
+
+
+def _preset_list_etag(version: str, *request_parts: object) -> str:
+    """Weak validator for one preset list page: store version plus the page's query."""
+    material = json.dumps([version, *request_parts], separators=(",", ":"))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:32]
+
+
+def _preset_list_response(response: Response, etag: str) -> Response:
+    response.set_etag(etag, weak=True)
+    # Cacheable, but revalidated on every load so new presets show up at once.
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
 def _coerce_slug(raw: object) -> str:
     return str(raw or "").strip().lower()
 
@@ -542,7 +836,9 @@ def _render_image_from_payload(
 
 
 def _print_from_request(
-    template: label_templates.LabelTemplate, print_dispatcher: PrintDispatchService
+    template: label_templates.LabelTemplate,
+    print_dispatcher: PrintDispatchService,
+    print_spooler: PrintSpooler,
 ):
     try:
         form_data = _form_data_from_args(template)
@@ -554,10 +850,14 @@ def _print_from_request(
     # Execute the print
     print_result = _dispatch_print(
         print_dispatcher,
+        print_spooler,
         template,
         form_data,
         include_qr_label=include_qr_label,
         include_jar_label=include_jar_label,
+        priority=_print_priority(request.args),
+        asynchronous=_wants_async_print(request.args),
+        include_timings=_wants_timings(request.args),
     )
 
     # Check if print was successful (status code 200)
@@ -585,27 +885,218 @@ def _render_bb_page(template: label_templates.LabelTemplate):
 
 def _dispatch_print(
     print_dispatcher: PrintDispatchService,
+    print_spooler: PrintSpooler,
     template: label_templates.LabelTemplate,
     form_data: TemplateFormData,
     *,
     include_qr_label: bool,
     include_jar_label: bool = False,
+    priority: int = PRIORITY_INTERACTIVE,
+    asynchronous: bool = False,
+    include_timings: bool = False,
 ):
+    @copy_current_request_context
+    def work(progress: Callable[[str], None]) -> tuple[dict, int]:
+        try:
+            response_payload = print_dispatcher.dispatch(
+                template,
+                form_data,
+                include_qr_label=include_qr_label,
+                include_jar_label=include_jar_label,
+                progress=progress,
+            )
+            _record_preset_print(template, form_data)
+        except LabelPayloadError as exc:
+            return {"error": str(exc)}, exc.status_code
+        except ValueError as exc:
+            return {"error": str(exc)}, 400
+        except OSError as exc:
+            return {"error": f"Printer unavailable: {exc}"}, 503
+        return response_payload, 200
+
+    return _spool_print(
+        print_spooler,
+        work,
+        backend=_configured_backend(),
+        priority=priority,
+        asynchronous=asynchronous,
+        include_timings=include_timings,
+    )
+
+
+def _batch_items_from_payload(payload: object) -> list[BatchPrintItem]:
+    if not isinstance(payload, Mapping):
+        raise LabelPayloadError("Provide a JSON object with 'items'.")
+    raw_items = payload.get("items")
+    if not isinstance(raw_items, list) or not raw_items:
+        raise LabelPayloadError("Provide a non-empty 'items' list.")
+    if len(raw_items) > MAX_BATCH_ITEMS:
+        raise LabelPayloadError(f"A batch can contain at most {MAX_BATCH_ITEMS} items.")
+    items: list[BatchPrintItem] = []
+    for position, raw_item in enumerate(raw_items, start=1):
+        if not isinstance(raw_item, Mapping):
+            raise LabelPayloadError(f"Item {position} must be an object.")
+        try:
+            template, form_data = _template_and_form_from_payload(raw_item)
+        except LabelPayloadError as exc:
+            raise LabelPayloadError(f"Item {position}: {exc}", exc.status_code) from exc
+        raw_copies = raw_item.get("copies", 1)
+        try:
+            copies = int(str(raw_copies))
+        except ValueError:
+            copies = 0
+        if copies < 1:
+            raise LabelPayloadError(f"Item {position}: copies must be a positive integer.")
+        items.append(
+            BatchPrintItem(
+                template=template,
+                form_data=form_data,
+                copies=copies,
+                include_qr_label=_is_truthy(str(raw_item.get("qr_label", ""))),
+                include_jar_label=_is_truthy(str(raw_item.get("jar_label", ""))),
+            )
+        )
+    if sum(item.copies for item in items) > MAX_BATCH_LABELS:
+        raise LabelPayloadError(f"A batch can print at most {MAX_BATCH_LABELS} labels.")
+    return items
+
+
+def _dispatch_batch_print(
+    print_dispatcher: PrintDispatchService,
+    print_spooler: PrintSpooler,
+    items: Sequence[BatchPrintItem],
+    *,
+    priority: int,
+    asynchronous: bool,
+    include_timings: bool = False,
+):
+    @copy_current_request_context
+    def work(progress: Callable[[str], None]) -> tuple[dict, int]:
+        try:
+            response_payload = print_dispatcher.dispatch_batch(items, progress=progress)
+            for item in items:
+                _record_preset_print(item.template, item.form_data, count=item.copies)
+        except LabelPayloadError as exc:
+            return {"error": str(exc)}, exc.status_code
+        except ValueError as exc:
+            return {"error": str(exc)}, 400
+        except OSError as exc:
+            return {"error": f"Printer unavailable: {exc}"}, 503
+        return response_payload, 200
+
+    return _spool_print(
+        print_spooler,
+        work,
+        backend=_configured_backend(),
+        priority=priority,
+        asynchronous=asynchronous,
+        include_timings=include_timings,
+    )
+
+
+def _image_print_work(
+    image: Image.Image,
+    config: PrinterConfig,
+    metrics: LabelMetrics,
+    *,
+    target_spec: Optional[BrotherLabelSpec] = None,
+) -> PrintWork:
+    """Print job for an already rendered image (the legacy ``/print`` route)."""
+
+    def work(progress: Callable[[str], None]) -> tuple[dict, int]:
+        progress("sending")
+        try:
+            result = dispatch_image(image, config, target_spec=target_spec)
+        except ValueError as exc:
+            return {"error": str(exc)}, 400
+        except OSError as exc:
+            return {"error": f"Printer unavailable: {exc}"}, 503
+        return _success_payload(result, warnings=metrics.warnings, metrics=metrics), 200
+
+    return work
+
+
+def _spool_print(
+    print_spooler: PrintSpooler,
+    work: PrintWork,
+    *,
+    backend: str,
+    priority: int,
+    asynchronous: bool,
+    include_timings: bool = False,
+):
+    """Queue ``work`` on the backend's print worker and wait for it unless async.
+
+    Phases recorded while the job runs are sent as ``Server-Timing`` on the
+    synchronous response and, with ``include_timings``, as ``timings`` in the
+    job's JSON payload.
+    """
+    timings = PhaseTimings()
     try:
-        response_payload = print_dispatcher.dispatch(
-            template,
-            form_data,
-            include_qr_label=include_qr_label,
-            include_jar_label=include_jar_label,
+        job = print_spooler.submit(
+            backend, _timed_work(work, timings, include_timings), priority=priority
         )
-        _record_preset_print(template, form_data)
-    except LabelPayloadError as exc:
-        return jsonify({"error": str(exc)}), exc.status_code
-    except ValueError as exc:
-        return jsonify({"error": str(exc)}), 400
-    except OSError as exc:
-        return jsonify({"error": f"Printer unavailable: {exc}"}), 503
-    return jsonify(response_payload)
+    except SpoolerFull as exc:
+        response = jsonify({"error": f"{exc} Retry shortly."})
+        response.status_code = 503
+        response.headers["Retry-After"] = "1"
+        return response
+    if asynchronous:
+        job_url = url_for("job_status_route", job_id=job.id)
+        response = jsonify({"status": "queued", "job_id": job.id, "job_url": job_url})
+        response.status_code = 202
+        response.headers["Location"] = job_url
+        return response
+    job.wait()
+    return _with_server_timing(jsonify(job.result), timings), job.status_code
+
+
+def _timed_work(work: PrintWork, timings: PhaseTimings, include_timings: bool) -> PrintWork:
+    def timed(progress: Callable[[str], None]) -> tuple[dict, int]:
+        with collecting(timings):
+            payload, status_code = work(progress)
+        if include_timings and status_code < 400:
+            payload = {**payload, "timings": timings.to_dict()}
+        return payload, status_code
+
+    return timed
+
+
+def _with_server_timing(response: Response, timings: PhaseTimings) -> Response:
+    header = timings.server_timing()
+    if header:
+        response.headers["Server-Timing"] = header
+    return response
+
+
+def _configured_backend() -> str:
+    return os.getenv("PRINTER_BACKEND", "file").strip().lower()
+
+
+def _wants_async_print(params: Mapping[str, object]) -> bool:
+    """Return True when the client asked for a job id instead of waiting for the print."""
+    if "respond-async" in request.headers.get("Prefer", "").lower():
+        return True
+    return _is_truthy(str(params.get("async", "")))
+
+
+def _wants_timings(params: Mapping[str, object]) -> bool:
+    """Return True when the client asked for per-phase timings in the JSON payload."""
+    return _is_truthy(str(params.get("timings", "")))
+
+
+def _print_priority(params: Mapping[str, object], *, default: int = PRIORITY_INTERACTIVE) -> int:
+    raw = str(params.get("priority", "")).strip().lower()
+    return PRIORITIES.get(raw, default)
+
+
+def _compute_best_by(
+    form_data: TemplateFormData,
+) -> tuple[Optional[date], Optional[date], str, str]:
+    # Imported on first use so loading the app does not import the template modules.
+    from .label_templates import best_by as best_by_label
+
+    return best_by_label.compute_best_by(form_data)
 
 
 def _qr_caption_for_template(
@@ -617,7 +1108,7 @@ def _qr_caption_for_template(
         if text_value:
             return f"Print: {text_value}"
         try:
-            base_date, _best_by_date, delta_label, prefix = best_by_label.compute_best_by(form_data)
+            base_date, _best_by_date, delta_label, prefix = _compute_best_by(form_data)
         except ValueError as exc:
             raise LabelPayloadError(str(exc))
         normalized_prefix = prefix.strip() or template.display_name
@@ -682,20 +1173,21 @@ def _print_url_for_template(
 def _preset_slug_for_form_data(
     template: label_templates.LabelTemplate, form_data: TemplateFormData
 ) -> Optional[str]:
-    try:
-        store = _get_preset_store()
-    except PresetServiceError:
-        return None
-    try:
-        return _find_preset_slug(store, template, form_data)
-    except Exception:
-        return None
-    finally:
-        store.close()
+    with phase("preset_lookup"):
+        try:
+            store = _get_preset_store()
+        except PresetServiceError:
+            return None
+        try:
+            return _find_preset_slug(store, template, form_data)
+        except Exception:
+            return None
+        finally:
+            store.close()
 
 
 def _find_preset_slug(
-    store: PresetStore,
+    store: PresetBackend,
     template: label_templates.LabelTemplate,
     form_data: TemplateFormData,
 ) -> Optional[str]:
@@ -711,22 +1203,28 @@ def _find_preset_slug(
 def _record_preset_print(
     template: label_templates.LabelTemplate,
     form_data: TemplateFormData,
+    *,
+    count: int = 1,
 ) -> None:
-    """Best-effort usage accounting after a label has been dispatched successfully."""
-    try:
-        store = _get_preset_store()
-    except PresetServiceError:
-        return
-    try:
-        slug = _find_preset_slug(store, template, form_data)
-        if slug:
-            store.record_print(slug)
-    except Exception as exc:
-        # The physical print has already happened. Never encourage a retry (and duplicate
-        # label) just because usage accounting is temporarily unavailable.
-        current_app.logger.warning("Preset print count update failed: %s", exc)
-    finally:
-        store.close()
+    """Best-effort usage accounting after a label has been dispatched successfully.
+
+    The shared store buffers the increment and writes it behind the response.
+    """
+    with phase("record_print"):
+        try:
+            store = _get_preset_store()
+        except PresetServiceError:
+            return
+        try:
+            slug = _find_preset_slug(store, template, form_data)
+            if slug:
+                store.record_print_later(slug, count)
+        except Exception as exc:
+            # The physical print has already happened. Never encourage a retry (and
+            # duplicate label) just because usage accounting is temporarily unavailable.
+            current_app.logger.warning("Preset print count update failed: %s", exc)
+        finally:
+            store.close()
 
 
 def _legacy_preset_form_data(
@@ -793,11 +1291,13 @@ def _build_public_url(path_fragment: str, params: Optional[Mapping[str, object]]
     return f"{url}?{query}" if query else url
 
 
-def _data_url_for_image(image: Image.Image) -> str:
-    buffer = BytesIO()
-    image.save(buffer, format="PNG")
-    encoded = base64.b64encode(buffer.getvalue()).decode("ascii")
-    return f"data:image/png;base64,{encoded}"
+def _preview_image_url(store: PreviewImageStore, image: Image.Image) -> str:
+    """Encode ``image`` into ``store`` and return its app-relative URL.
+
+    Runs on preview render workers, outside the request context, so the path is
+    built by hand rather than with ``url_for``; the browser adds the ingress prefix.
+    """
+    return f"/bb/preview/img/{store.put_image(image)}.png"
 
 
 def main() -> None:
@@ -820,14 +1320,65 @@ def main() -> None:
 
 
 def _serve_production(flask_app: Flask, host: str, port: int) -> None:
-    """Serve until SIGTERM/SIGINT, then stop accepting requests promptly."""
-    server = make_server(host, port, flask_app, threaded=True)
-    shutdown_started: Optional[float] = None
+    """Serve until SIGTERM/SIGINT, then stop accepting requests promptly.
+
+    With ``PRINTER_WORKERS`` above 1 the socket is bound here and shared by that
+    many forked workers, together with a :class:`WorkerGroup` through which they
+    reach worker 0 and share preview images; see :mod:`printer_service.serving`.
+    """
+    handler = request_handler(keepalive_seconds_from_env())
+    server = make_server(host, port, flask_app, threaded=True, request_handler=handler)
+    workers = workers_from_env()
+    if workers == 1:
+        _serve_worker(flask_app, server, host, port)
+        return
+    try:
+        group = WorkerGroup.create(flask_app, handler)
+    except BaseException:
+        server.server_close()
+        raise
+    preview_images = flask_app.extensions.get("preview_images")
+    if isinstance(preview_images, PreviewImageStore):
+        preview_images.share_directory(group.path("preview-images"))
+    try:
+        serve_prefork(
+            workers,
+            partial(_serve_worker, flask_app, server, host, port, group=group),
+            _emit_lifecycle_event,
+        )
+    finally:
+        server.server_close()
+        group.close()
+
+
+def _emit_lifecycle_event(event: dict[str, object]) -> None:
+    # Flask's app logger defaults to WARNING in production. Write lifecycle
+    # events directly so they are always visible in Supervisor logs.
+    print(json.dumps(event), flush=True)
+
+
+def _serve_worker(
+    flask_app: Flask,
+    server: BaseWSGIServer,
+    host: str,
+    port: int,
+    worker: Optional[int] = None,
+    *,
+    group: Optional[WorkerGroup] = None,
+) -> None:
+    """Serve ``server`` until SIGTERM/SIGINT, then drain the print spooler.
 
-    def emit_lifecycle_event(event: dict[str, object]) -> None:
-        # Flask's app logger defaults to WARNING in production. Write lifecycle
-        # events directly so they are always visible in Supervisor logs.
-        print(json.dumps(event), flush=True)
+    The warm-up runs on a background thread while the server already accepts
+    requests; ``GET /health/ready`` answers ``503`` until it has finished.
+
+    In a pre-fork ``group`` worker 0 also serves the group's loopback socket;
+    every other worker forwards :data:`PRIMARY_ROUTES` there and publishes its
+    metrics for worker 0 to merge.
+    """
+    shutdown_started: Optional[float] = None
+    snapshot_stop = threading.Event()
+    # Pre-fork workers tag their events so per-worker warm-ups can be told apart.
+    worker_fields: dict[str, object] = {} if worker is None else {"worker": worker}
 
     def handle_shutdown(received_signal: int, _frame: object) -> None:
         nonlocal shutdown_started
@@ -835,12 +1386,13 @@ def _serve_production(flask_app: Flask, host: str, port: int) -> None:
             return
         shutdown_started = time.monotonic()
         signal_name = signal.Signals(received_signal).name
-        emit_lifecycle_event(
+        _emit_lifecycle_event(
             {
                 "event": "service.shutdown.started",
                 "service": "printer-service",
                 "signal": signal_name,
                 "pid": os.getpid(),
+                **worker_fields,
             }
         )
         threading.Thread(
@@ -853,32 +1405,122 @@ def _serve_production(flask_app: Flask, host: str, port: int) -> None:
         shutdown_signal: signal.signal(shutdown_signal, handle_shutdown)
         for shutdown_signal in (signal.SIGTERM, signal.SIGINT)
     }
-    emit_lifecycle_event(
+    warmup_state = flask_app.extensions.get("warmup")
+    if not isinstance(warmup_state, WarmupState):
+        warmup_state = WarmupState()
+    # Connect to the preset store while the warm-up renders templates.
+    start_store_bootstrap()
+
+    def warm_up() -> None:
+        warmup = run_warmup(warmup_state, default_steps())
+        _emit_lifecycle_event(
+            {
+                "event": "service.warmed",
+                "service": "printer-service",
+                "pid": os.getpid(),
+                **worker_fields,
+                "templates": warmup.results.get("templates"),
+                "fonts": warmup.results.get("fonts"),
+                "warmup": warmup.to_dict(),
+            }
+        )
+
+    # Not ready from the first accepted request until the warm-up thread finishes.
+    warmup_state.begin()
+    warmup_thread = threading.Thread(target=warm_up, name="printer-service-warmup", daemon=True)
+    warmup_thread.start()
+    mongo_monitor = flask_app.extensions.get("mongo_health")
+    if isinstance(mongo_monitor, MongoHealthMonitor):
+        # Started per worker: forked children do not inherit the parent's threads.
+        mongo_monitor.start()
+    primary_thread: Optional[threading.Thread] = None
+    snapshot_thread: Optional[threading.Thread] = None
+    if group is not None:
+        group.worker = WorkerGroup.PRIMARY if worker is None else worker
+        flask_app.extensions["worker_group"] = group
+        if group.is_primary:
+            primary_thread = threading.Thread(
+                target=group.primary_server.serve_forever,
+                name="printer-service-primary",
+                daemon=True,
+            )
+            primary_thread.start()
+        else:
+            flask_app.wsgi_app = PrimaryForwarder(  # type: ignore[method-assign]
+                flask_app.wsgi_app, group.primary_address, PRIMARY_ROUTES
+            )
+            snapshot_thread = threading.Thread(
+                target=_publish_snapshots,
+                args=(group, snapshot_stop, _snapshot_seconds()),
+                name="printer-service-metrics-snapshot",
+                daemon=True,
+            )
+            snapshot_thread.start()
+    _emit_lifecycle_event(
         {
             "event": "service.started",
             "service": "printer-service",
             "host": host,
             "port": port,
             "pid": os.getpid(),
+            **worker_fields,
         }
     )
     try:
         server.serve_forever()
     finally:
         server.server_close()
+        warmup_thread.join(timeout=WARMUP_SHUTDOWN_WAIT_SECONDS)
+        if primary_thread is not None and group is not None:
+            group.primary_server.shutdown()
+        if snapshot_thread is not None:
+            snapshot_stop.set()
+            snapshot_thread.join(timeout=5)
+        spooler = flask_app.extensions.get("print_spooler")
+        if isinstance(spooler, PrintSpooler):
+            # Let labels that were already accepted finish printing.
+            spooler.shutdown(timeout=30)
+        if isinstance(mongo_monitor, MongoHealthMonitor):
+            mongo_monitor.close(timeout=5)
+        flush_cached_store()
+        close_brother_connections()
         for shutdown_signal, previous_handler in previous_handlers.items():
             signal.signal(shutdown_signal, previous_handler)
         if shutdown_started is not None:
-            emit_lifecycle_event(
+            _emit_lifecycle_event(
                 {
                     "event": "service.shutdown.completed",
                     "service": "printer-service",
+                    **worker_fields,
                     "elapsedMs": round((time.monotonic() - shutdown_started) * 1000),
                     "status": "ok",
                 }
             )
 
 
+def _publish_snapshots(group: WorkerGroup, stop: threading.Event, interval: float) -> None:
+    # One last write after ``stop`` so counters from the final requests are kept.
+    while True:
+        stopped = stop.wait(interval)
+        try:
+            group.write_snapshot(_worker_snapshot())
+        except OSError:
+            pass
+        if stopped:
+            return
+
+
+def _snapshot_seconds() -> float:
+    raw = os.getenv("PRINTER_METRICS_SNAPSHOT_SECONDS")
+    if raw is None or not raw.strip():
+        return DEFAULT_SNAPSHOT_SECONDS
+    try:
+        value = float(raw)
+    except ValueError:
+        return DEFAULT_SNAPSHOT_SECONDS
+    return value if value > 0 else DEFAULT_SNAPSHOT_SECONDS
+
+
 def _coerce_template_form_data(candidate: object) -> TemplateFormData:
     if isinstance(candidate, TemplateFormData):
         return candidate
@@ -905,6 +1547,20 @@ def _is_template_form_value(value: object) -> TypeGuard[TemplateFormValue]:
     return False
 
 
+def _render_executor() -> Optional[ThreadPoolExecutor]:
+    """Return the bounded pool for concurrent preview/batch renders, or None when disabled."""
+    # Off by default: on a single-core host the pool only adds hand-off overhead
+    # (see scripts/benchmark_preview.py).
+    raw = os.getenv("PREVIEW_RENDER_WORKERS", "0")
+    try:
+        workers = int(raw)
+    except ValueError:
+        workers = 0
+    if workers <= 0:
+        return None
+    return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="label-render")
+
+
 def _should_enable_dev_reload() -> bool:
     raw = os.getenv("PRINTER_DEV_RELOAD")
     if raw is None:
@@ -1,12 +1,30 @@
 from __future__ import annotations
 
+import hashlib
 import os
+import select
+import socket
+import threading
+import time
 import warnings
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from importlib import import_module
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Sequence, Type, cast
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Type,
+    cast,
+)
+from urllib.parse import urlsplit
 
 from PIL import Image, PngImagePlugin
 
@@ -34,6 +52,8 @@ from printer_service.label_specs import (
     DEFAULT_LABEL_CODE,
     resolve_brother_label_spec,
 )
+from printer_service.metrics import DISPATCH_SECONDS
+from printer_service.timings import phase
 
 SUPPORTED_BACKENDS = {
     "brother-network",
@@ -46,6 +66,17 @@ DIMENSION_TOLERANCE_IN = 0.02
 LABEL_SPEC_CODE_KEY = "label_spec_code"
 LABEL_SPEC_WIDTH_KEY = "label_spec_width_px"
 LABEL_SPEC_HEIGHT_KEY = "label_spec_height_px"
+DEFAULT_RASTER_CACHE_BYTES = 16 * 1024 * 1024
+DEFAULT_BROTHER_IDLE_SECONDS = 30.0
+BROTHER_CONNECT_TIMEOUT_SECONDS = 5.0
+BROTHER_WRITE_TIMEOUT_SECONDS = 10.0
+# Keepalive probing gives up on a silently vanished printer after
+# IDLE + INTERVAL * PROBES = 11 seconds, well inside the idle reuse window.
+BROTHER_KEEPALIVE_IDLE_SECONDS = 5
+BROTHER_KEEPALIVE_INTERVAL_SECONDS = 2
+BROTHER_KEEPALIVE_PROBES = 3
+
+RasterCacheKey = tuple[str, str, str, str, bool, bool]
 
 
 def _warning_list_from_info(raw: object) -> List[str]:
@@ -115,6 +146,16 @@ def dispatch_image(
 ) -> Optional[Path]:
     """Send a PIL image through the configured backend. Returns output path for file backend."""
     cfg = config or PrinterConfig.from_env()
+    with DISPATCH_SECONDS.labels(cfg.backend).time():
+        return _dispatch_single(image, cfg, target_spec=target_spec)
+
+
+def _dispatch_single(
+    image: Image.Image,
+    cfg: "PrinterConfig",
+    *,
+    target_spec: Optional[BrotherLabelSpec] = None,
+) -> Optional[Path]:
     backend = cfg.backend
     prepared = _prepare_image_for_dispatch(image, backend, target_spec)
     if backend == "brother-network":
@@ -122,16 +163,57 @@ def dispatch_image(
         _send_to_brother(prepared, cfg, label_override=label_override)
         return None
     elif backend == "escpos-usb":
-        _send_to_escpos_usb(prepared, cfg)
+        with phase("send"):
+            _send_to_escpos_usb(prepared, cfg)
         return None
     elif backend == "escpos-bluetooth":
-        _send_to_escpos_bluetooth(prepared, cfg)
+        with phase("send"):
+            _send_to_escpos_bluetooth(prepared, cfg)
         return None
     elif backend == "file":
-        return _write_to_file(prepared, cfg, target_spec=target_spec)
+        with phase("send"):
+            return _write_to_file(prepared, cfg, target_spec=target_spec)
     raise ValueError(f"Unsupported backend '{backend}'")
 
 
+def dispatch_images(
+    images: Sequence[Image.Image],
+    config: Optional["PrinterConfig"] = None,
+    *,
+    target_specs: Optional[Sequence[Optional[BrotherLabelSpec]]] = None,
+) -> List[Optional[Path]]:
+    """Send several labels, as a single printer job where the backend allows it.
+
+    The Brother backend converts all labels that share a label code into one
+    multi-page raster job and sends it in one write. Other backends print the
+    labels one at a time. Returns one output path (or None) per image.
+    """
+    cfg = config or PrinterConfig.from_env()
+    specs = list(target_specs) if target_specs is not None else [None] * len(images)
+    if len(specs) != len(images):
+        raise ValueError("Provide one target spec per image.")
+    with DISPATCH_SECONDS.labels(cfg.backend).time():
+        return _dispatch_batch(images, cfg, specs)
+
+
+def _dispatch_batch(
+    images: Sequence[Image.Image],
+    cfg: "PrinterConfig",
+    specs: Sequence[Optional[BrotherLabelSpec]],
+) -> List[Optional[Path]]:
+    if cfg.backend != "brother-network":
+        return [
+            _dispatch_single(image, cfg, target_spec=spec) for image, spec in zip(images, specs)
+        ]
+    jobs: Dict[Optional[str], List[Image.Image]] = {}
+    for image, spec in zip(images, specs):
+        prepared = _prepare_image_for_dispatch(image, cfg.backend, spec)
+        jobs.setdefault(spec.code if spec else None, []).append(prepared)
+    for label_override, pages in jobs.items():
+        _send_pages_to_brother(pages, cfg, label_override=label_override)
+    return [None] * len(images)
+
+
 def analyze_label_image(
     image: Image.Image,
     config: Optional["PrinterConfig"] = None,
@@ -173,6 +255,249 @@ def analyze_label_image(
     )
 
 
+class RasterInstructionCache:
+    """Byte-bounded LRU of brother_ql instruction streams for repeated prints.
+
+    Preset reprints send pixel-identical labels, so the monochrome conversion and
+    raster encoding done by ``brother_ql.conversion.convert`` only has to run once.
+    """
+
+    def __init__(self, *, max_bytes: int = DEFAULT_RASTER_CACHE_BYTES) -> None:
+        self._max_bytes = max(0, max_bytes)
+        self._entries: OrderedDict[RasterCacheKey, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: RasterCacheKey) -> Optional[bytes]:
+        with self._lock:
+            instructions = self._entries.get(key)
+            if instructions is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return instructions
+
+    def put(self, key: RasterCacheKey, instructions: bytes) -> None:
+        if len(instructions) > self._max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= len(previous)
+            self._entries[key] = instructions
+            self._size_bytes += len(instructions)
+            while self._size_bytes > self._max_bytes:
+                _key, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self._max_bytes,
+            }
+
+
+def _raster_cache_max_bytes() -> int:
+    raw = os.getenv("BROTHER_RASTER_CACHE_BYTES")
+    if raw is None or not raw.strip():
+        return DEFAULT_RASTER_CACHE_BYTES
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return DEFAULT_RASTER_CACHE_BYTES
+
+
+_RASTER_CACHE = RasterInstructionCache(max_bytes=_raster_cache_max_bytes())
+
+
+def raster_cache_stats() -> dict[str, int]:
+    """Return hit/miss counters and occupancy of the Brother raster cache."""
+    return _RASTER_CACHE.stats()
+
+
+def _image_content_hash(image: Image.Image) -> str:
+    digest = hashlib.sha256(f"{image.mode}:{image.width}x{image.height}:".encode("ascii"))
+    digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+class BrotherConnectionManager:
+    """Reuse one TCP connection to a networked Brother printer across print jobs.
+
+    The socket is health-checked before every job and closed after ``idle_timeout``
+    seconds without use, so other clients can still reach the printer. When the
+    warm connection breaks before the printer accepts any of a job, the job
+    falls back to brother_ql's connect-per-job ``send``.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        *,
+        idle_timeout: float = DEFAULT_BROTHER_IDLE_SECONDS,
+        connect: Callable[..., socket.socket] = socket.create_connection,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        parts = urlsplit(uri)
+        if parts.scheme != "tcp" or not parts.hostname:
+            raise ValueError(f"Unsupported Brother printer URI '{uri}'.")
+        self.uri = uri
+        self.address = (parts.hostname, parts.port or 9100)
+        self.idle_timeout = idle_timeout
+        self._connect = connect
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._socket: Optional[socket.socket] = None
+        self._last_used = 0.0
+        self._idle_timer: Optional[threading.Timer] = None
+
+    def send(self, instructions: bytes, *, fallback: Callable[[bytes, str], object]) -> None:
+        """Write ``instructions`` over the warm connection, or via ``fallback``.
+
+        ``fallback`` resends the whole job, so it is only used when the
+        connection broke before the printer accepted a single byte. A timeout
+        or a failure part-way through raises instead: the printer may already
+        be printing the first pages, and a resend would duplicate them.
+        """
+        with self._lock:
+            # Connection errors propagate exactly as brother_ql's own connect would.
+            connection = self._checkout()
+            sent = 0
+            try:
+                with memoryview(instructions) as pending:
+                    while sent < len(pending):
+                        sent += connection.send(pending[sent:])
+            except OSError as exc:
+                self._discard()
+                if sent or not isinstance(exc, ConnectionError):
+                    raise ConnectionError(
+                        f"Printer connection failed after {sent} of {len(instructions)} "
+                        "bytes; not resending the job to avoid duplicate labels."
+                    ) from exc
+            else:
+                self._last_used = self._clock()
+                self._schedule_idle_close()
+                return
+        fallback(instructions, self.uri)
+
+    def close(self) -> None:
+        with self._lock:
+            self._discard()
+
+    def _checkout(self) -> socket.socket:
+        connection = self._socket
+        if connection is not None:
+            idle_for = self._clock() - self._last_used
+            if idle_for < self.idle_timeout and _socket_is_alive(connection):
+                return connection
+            self._discard()
+        connection = self._connect(self.address, timeout=BROTHER_CONNECT_TIMEOUT_SECONDS)
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connection.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for option, value in (
+            ("TCP_KEEPIDLE", BROTHER_KEEPALIVE_IDLE_SECONDS),
+            ("TCP_KEEPINTVL", BROTHER_KEEPALIVE_INTERVAL_SECONDS),
+            ("TCP_KEEPCNT", BROTHER_KEEPALIVE_PROBES),
+        ):
+            if hasattr(socket, option):
+                connection.setsockopt(socket.IPPROTO_TCP, getattr(socket, option), value)
+        connection.settimeout(BROTHER_WRITE_TIMEOUT_SECONDS)
+        self._socket = connection
+        return connection
+
+    def _discard(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+            self._idle_timer = None
+        connection, self._socket = self._socket, None
+        if connection is None:
+            return
+        try:
+            connection.close()
+        except OSError:
+            pass
+
+    def _schedule_idle_close(self) -> None:
+        if self._idle_timer is not None:
+            self._idle_timer.cancel()
+        timer = threading.Timer(self.idle_timeout, self._close_if_idle)
+        timer.daemon = True
+        timer.start()
+        self._idle_timer = timer
+
+    def _close_if_idle(self) -> None:
+        with self._lock:
+            if self._socket is not None and self._clock() - self._last_used >= self.idle_timeout:
+                self._discard()
+
+
+def _socket_is_alive(connection: socket.socket) -> bool:
+    """Return False once the printer has closed, reset or stopped answering.
+
+    A printer that lost power sends no FIN or RST; the socket only learns about
+    it when keepalive probes go unanswered, which leaves a pending ``SO_ERROR``.
+    """
+    try:
+        if connection.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+            return False
+        readable, _, _ = select.select([connection], [], [], 0)
+        if not readable:
+            return True
+        # Readable without a pending job means EOF, or status bytes we can drop.
+        return bool(connection.recv(64))
+    except OSError, ValueError:
+        return False
+
+
+_BROTHER_CONNECTIONS: Dict[str, BrotherConnectionManager] = {}
+_BROTHER_CONNECTIONS_LOCK = threading.Lock()
+
+
+def _brother_idle_seconds() -> float:
+    raw = os.getenv("BROTHER_CONNECTION_IDLE_SECONDS")
+    if raw is None or not raw.strip():
+        return DEFAULT_BROTHER_IDLE_SECONDS
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return DEFAULT_BROTHER_IDLE_SECONDS
+
+
+def _brother_connection(uri: str) -> Optional[BrotherConnectionManager]:
+    idle_timeout = _brother_idle_seconds()
+    if idle_timeout <= 0 or not uri.startswith("tcp://"):
+        return None
+    with _BROTHER_CONNECTIONS_LOCK:
+        manager = _BROTHER_CONNECTIONS.get(uri)
+        if manager is None or manager.idle_timeout != idle_timeout:
+            if manager is not None:
+                manager.close()
+            manager = BrotherConnectionManager(uri, idle_timeout=idle_timeout)
+            _BROTHER_CONNECTIONS[uri] = manager
+        return manager
+
+
+def close_brother_connections() -> None:
+    """Close every warm printer connection (used on service shutdown)."""
+    with _BROTHER_CONNECTIONS_LOCK:
+        managers = list(_BROTHER_CONNECTIONS.values())
+        _BROTHER_CONNECTIONS.clear()
+    for manager in managers:
+        manager.close()
+
+
 @dataclass
 class PrinterConfig:
     backend: str
@@ -233,6 +558,16 @@ def _send_to_brother(
     *,
     label_override: Optional[str] = None,
 ) -> None:
+    _send_pages_to_brother([image], cfg, label_override=label_override)
+
+
+def _send_pages_to_brother(
+    images: Sequence[Image.Image],
+    cfg: PrinterConfig,
+    *,
+    label_override: Optional[str] = None,
+) -> None:
+    """Convert ``images`` into one multi-page raster job and send it in one write."""
     from brother_ql.backends.helpers import send
     from brother_ql.conversion import convert
     from brother_ql.raster import BrotherQLRaster
@@ -245,18 +580,39 @@ def _send_to_brother(
         raise ValueError("BROTHER_PRINTER_URI must be configured for brother-network backend.")
 
     label_code = (label_override or cfg.brother_label or DEFAULT_LABEL_CODE).strip().lower()
-    qlr = BrotherQLRaster(cfg.brother_model)
-    qlr.exception_on_warning = True
-    mono = _ensure_monochrome(image)
-    instructions = convert(
-        qlr,
-        [mono],
-        label_code,
-        rotate=cfg.rotate,
-        hq=cfg.high_quality,
-        cut=cfg.cut,
-    )
-    send(instructions, uri)
+    pages = [_ensure_monochrome(image) for image in images]
+    # Only single labels are cached: reprints repeat them, batches rarely repeat.
+    cache_key: Optional[RasterCacheKey] = None
+    if len(pages) == 1:
+        cache_key = (
+            _image_content_hash(pages[0]),
+            cfg.brother_model,
+            label_code,
+            str(cfg.rotate),
+            cfg.high_quality,
+            cfg.cut,
+        )
+    instructions = _RASTER_CACHE.get(cache_key) if cache_key is not None else None
+    if instructions is None:
+        qlr = BrotherQLRaster(cfg.brother_model)
+        qlr.exception_on_warning = True
+        with phase("convert"):
+            instructions = convert(
+                qlr,
+                pages,
+                label_code,
+                rotate=cfg.rotate,
+                hq=cfg.high_quality,
+                cut=cfg.cut,
+            )
+        if cache_key is not None:
+            _RASTER_CACHE.put(cache_key, instructions)
+    connection = _brother_connection(uri)
+    with phase("send"):
+        if connection is None:
+            send(instructions, uri)
+        else:
+            connection.send(instructions, fallback=send)
 
 
 def _send_to_escpos_usb(image: Image.Image, cfg: PrinterConfig) -> None:
@@ -6,39 +6,78 @@ New templates should live in this package and expose either a ``TEMPLATE``
 instance or a ``Template`` subclass with no required constructor arguments. The
 project loader binds metadata automatically and re-exports the helper toolkit
 to ensure every template follows the same interface.
+
+Template modules are imported lazily: discovery only lists the package and
+reads each module's ``DISPLAY_NAME`` constant from source, so importing the
+service does not pay for every template's dependencies. A module is imported on
+the first :func:`get_template` call (or :func:`preload` at startup).
 """
 
+import ast
+import threading
+import time
 from collections.abc import Mapping
-from dataclasses import dataclass
 from importlib import import_module
+from importlib.util import find_spec
 from inspect import isclass
 from pkgutil import iter_modules
 from types import ModuleType
 from typing import Dict, List, Optional
 
-_INTERNAL_MODULES = {"base", "helper", "bb_2_weeks"}
+_INTERNAL_MODULES = {
+    "base",
+    "helper",
+    "bb_2_weeks",
+    "qr_codes",
+    "render_cache",
+    "symbol_pack",
+}
 _ALIAS_SLUGS = {"bb_2_weeks": "best_by"}
 
 from PIL import Image
 
 from printer_service.label_specs import BrotherLabelSpec
+from printer_service.metrics import RENDER_SECONDS
 
 from . import helper as helper
 from .base import (
+    SymbolLayout,
     TemplateContext,
     TemplateDefinition,
     TemplateFormData,
     TemplateFormValue,
     TemplateRenderable,
 )
+from .render_cache import RenderCache, max_bytes_from_env
 
 
-@dataclass(frozen=True)
 class LabelTemplate:
-    """Runtime wrapper for a discovered template implementation."""
+    """Runtime wrapper for a discovered template; imports its module on first use."""
+
+    def __init__(self, slug: str, *, declared_display_name: Optional[str] = None) -> None:
+        self.slug = slug
+        self._declared_display_name = declared_display_name
+        self._implementation: Optional[TemplateDefinition] = None
+
+    def __repr__(self) -> str:
+        return f"LabelTemplate(slug={self.slug!r}, loaded={self.loaded})"
+
+    @property
+    def loaded(self) -> bool:
+        return self._implementation is not None
 
-    slug: str
-    implementation: TemplateDefinition
+    @property
+    def implementation(self) -> TemplateDefinition:
+        implementation = self._implementation
+        if implementation is None:
+            with _LOAD_LOCK:
+                implementation = self._implementation
+                if implementation is None:
+                    module = import_module(f"{__name__}.{self.slug}")
+                    implementation = _resolve_template(module, self.slug)
+                    implementation.bind_slug(self.slug)
+                    self._implementation = implementation
+        return implementation
 
     def form_context(self) -> TemplateContext:
         """Return the auxiliary data exposed to the Jinja form."""
@@ -47,6 +86,8 @@ class LabelTemplate:
     @property
     def display_name(self) -> str:
         """Human-readable name used throughout navigation."""
+        if self._declared_display_name is not None and not self.loaded:
+            return self._declared_display_name
         return self.implementation.display_name
 
     @property
@@ -55,36 +96,88 @@ class LabelTemplate:
         return self.implementation.form_template
 
     def render(self, form_data: Mapping[str, TemplateFormValue]) -> Image.Image:
-        """Delegate label creation to the underlying implementation."""
+        """Delegate label creation to the underlying implementation.
+
+        Results are served from the shared render cache when the same canonical
+        form data was rendered earlier today.
+        """
         normalized = (
             form_data if isinstance(form_data, TemplateFormData) else TemplateFormData(form_data)
         )
-        return self.implementation.render(normalized)
+        if not _RENDER_CACHE.enabled:
+            return self._render_uncached(normalized)
+        key = _RENDER_CACHE.key_for(self.slug, normalized)
+        cached = _RENDER_CACHE.get(key)
+        if cached is not None:
+            image, label_spec = cached
+            self.implementation.restore_label_spec(label_spec)
+            return image
+        image = self._render_uncached(normalized)
+        _RENDER_CACHE.put(key, image, self.implementation.preferred_label_spec())
+        return image
+
+    def _render_uncached(self, form_data: TemplateFormData) -> Image.Image:
+        implementation = self.implementation
+        with RENDER_SECONDS.labels(self.slug).time():
+            return implementation.render(form_data)
 
     def preferred_label_spec(self) -> Optional[BrotherLabelSpec]:
         """Expose the template's preferred label spec for diagnostics."""
         return self.implementation.preferred_label_spec()
 
+    def font_sizes(self) -> tuple[int, ...]:
+        """Font sizes the template loads while rendering."""
+        return self.implementation.font_sizes()
+
+    def symbol_layouts(self) -> tuple[SymbolLayout, ...]:
+        """Background symbol layouts the template draws while rendering."""
+        return self.implementation.symbol_layouts()
+
+    def warmup_form_data(self) -> tuple[Mapping[str, TemplateFormValue], ...]:
+        """Form payloads rendered during startup warm-up."""
+        return self.implementation.warmup_form_data()
+
 
-def _load_templates() -> Dict[str, LabelTemplate]:
+def _discover_templates() -> Dict[str, LabelTemplate]:
     discovered: Dict[str, LabelTemplate] = {}
     for module_info in iter_modules(__path__):
         if module_info.name.startswith("_") or module_info.ispkg:
             continue
         if module_info.name in _INTERNAL_MODULES:
             continue
-        module = import_module(f"{__name__}.{module_info.name}")
-        implementation = _resolve_template(module, module_info.name)
-        implementation.bind_slug(module_info.name)
         discovered[module_info.name] = LabelTemplate(
-            slug=implementation.slug,
-            implementation=implementation,
+            module_info.name,
+            declared_display_name=_declared_display_name(module_info.name),
         )
     if not discovered:
         raise RuntimeError("No label templates discovered. Add at least one template module.")
     return discovered
 
 
+def _declared_display_name(slug: str) -> Optional[str]:
+    """Read a module-level ``DISPLAY_NAME = "..."`` from source without importing it."""
+    spec = find_spec(f"{__name__}.{slug}")
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        return None
+    try:
+        with open(spec.origin, encoding="utf-8") as handle:
+            tree = ast.parse(handle.read(), filename=spec.origin)
+    except OSError, SyntaxError:
+        return None
+    for node in tree.body:
+        if (
+            isinstance(node, ast.Assign)
+            and any(
+                isinstance(target, ast.Name) and target.id == "DISPLAY_NAME"
+                for target in node.targets
+            )
+            and isinstance(node.value, ast.Constant)
+            and isinstance(node.value.value, str)
+        ):
+            return node.value.value
+    return None
+
+
 def _resolve_template(module: ModuleType, slug: str) -> TemplateDefinition:
     candidate = getattr(module, "TEMPLATE", None)
     if isinstance(candidate, TemplateDefinition):
@@ -98,7 +191,35 @@ def _resolve_template(module: ModuleType, slug: str) -> TemplateDefinition:
     )
 
 
-_TEMPLATES = _load_templates()
+_LOAD_LOCK = threading.RLock()
+_TEMPLATES = _discover_templates()
+_RENDER_CACHE = RenderCache(max_bytes=max_bytes_from_env())
+
+
+def render_cache_stats() -> dict[str, int | float]:
+    """Return hit/miss counters for the rendered-label cache."""
+    return _RENDER_CACHE.stats()
+
+
+def clear_render_cache() -> None:
+    """Drop every cached render (counters are preserved)."""
+    _RENDER_CACHE.clear()
+
+
+def preload_fonts() -> dict[str, object]:
+    """Load every font size the templates declare and report the chosen font file."""
+    sizes = {size for template in _TEMPLATES.values() for size in template.font_sizes()}
+    return helper.preload_fonts(sizes)
+
+
+def preload() -> dict[str, float]:
+    """Import every template module now and return the import time per slug in ms."""
+    timings: dict[str, float] = {}
+    for slug, template in _TEMPLATES.items():
+        started = time.perf_counter()
+        template.implementation
+        timings[slug] = round((time.perf_counter() - started) * 1000, 2)
+    return timings
 
 
 def all_templates() -> List[LabelTemplate]:
@@ -110,9 +231,11 @@ def get_template(slug: str) -> LabelTemplate:
     """Return the template associated with ``slug``."""
     resolved = _ALIAS_SLUGS.get(slug, slug)
     try:
-        return _TEMPLATES[resolved]
+        template = _TEMPLATES[resolved]
     except KeyError as exc:
         raise KeyError(f"Unknown template '{slug}'.") from exc
+    template.implementation
+    return template
 
 
 def default_template() -> LabelTemplate:
@@ -122,13 +245,18 @@ def default_template() -> LabelTemplate:
 
 __all__ = [
     "LabelTemplate",
+    "SymbolLayout",
     "TemplateContext",
     "TemplateDefinition",
     "TemplateFormData",
     "TemplateFormValue",
     "TemplateRenderable",
     "all_templates",
+    "clear_render_cache",
     "get_template",
     "default_template",
     "helper",
+    "preload",
+    "preload_fonts",
+    "render_cache_stats",
 ]
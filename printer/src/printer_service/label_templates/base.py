@@ -11,7 +11,15 @@ Subclass :class:`TemplateDefinition` and provide concrete implementations of
 
 from abc import ABC, abstractmethod
 from collections.abc import ItemsView, Iterator, Mapping
-from typing import Optional, Protocol, Sequence, Mapping as TypingMapping, TypeAlias, TypeVar
+from typing import (
+    NamedTuple,
+    Optional,
+    Protocol,
+    Sequence,
+    Mapping as TypingMapping,
+    TypeAlias,
+    TypeVar,
+)
 
 from PIL import Image
 
@@ -93,6 +101,14 @@ import-time template discovery when only the typing helpers are needed.
 """
 
 
+class SymbolLayout(NamedTuple):
+    """Canvas size and opacity a template draws background SVG symbols at."""
+
+    canvas_width: int
+    canvas_height: int
+    alpha_percent: int
+
+
 class TemplateRenderable(Protocol):
     """Protocol describing any object that can produce a label image from form data."""
 
@@ -159,8 +175,39 @@ class TemplateDefinition(ABC):
         """Return the target label spec used for sizing diagnostics, if any."""
         return None
 
+    def font_sizes(self) -> tuple[int, ...]:
+        """Return the font sizes (in points) :meth:`render` loads.
+
+        Startup preloads these so the first label does not pay for font loading.
+        """
+        return ()
+
+    def symbol_layouts(self) -> tuple[SymbolLayout, ...]:
+        """Return the layouts :meth:`render` passes to ``helper.draw_background_symbol``.
+
+        The SVG symbol pack is built for exactly these sizes and opacities.
+        """
+        return ()
+
+    def warmup_form_data(self) -> tuple[TypingMapping[str, TemplateFormValue], ...]:
+        """Return form payloads rendered once at startup before traffic is accepted.
+
+        The default renders the empty form. Override to also cover render paths
+        (QR labels, alternate layouts) that the empty form does not reach.
+        """
+        return ({},)
+
+    def restore_label_spec(self, label_spec: Optional[BrotherLabelSpec]) -> None:
+        """Reapply the label spec recorded alongside a cached render.
+
+        Templates whose :meth:`preferred_label_spec` depends on the most recent
+        render override this so cache hits report the same spec as a fresh render.
+        """
+        del label_spec
+
 
 __all__ = [
+    "SymbolLayout",
     "TemplateContext",
     "TemplateDefinition",
     "TemplateFormData",
@@ -1,27 +1,27 @@
 from __future__ import annotations
 
 import urllib.parse
-import math
+from collections.abc import Mapping
 from datetime import date, timedelta
 from typing import Optional, Tuple
 
-import qrcode  # type: ignore[import-untyped]
-from PIL import Image, ImageDraw
-from PIL.Image import Resampling
+from PIL import Image
 
 from printer_service.label_specs import BrotherLabelSpec, QL810W_DPI
 from printer_service.label_templates import bluey_label
 from printer_service.label_templates import helper as helper
+from printer_service.label_templates import qr_codes
 from printer_service.label_templates.base import (
     TemplateContext,
     TemplateDefinition,
     TemplateFormData,
+    TemplateFormValue,
 )
 
+DISPLAY_NAME = "Best By"
 FONT_POINTS = 48
 # Target a ~0.5\" printed QR so it stays readable while keeping the label compact.
 QR_TARGET_HEIGHT_IN = 0.5
-QR_MIN_MODULE_PX = 2
 HORIZONTAL_PADDING = 20
 MIN_LENGTH_PX = bluey_label.CANVAS_HEIGHT_PX // 2  # keep length tight but readable
 MARGIN_TOTAL_PX = int(round(QL810W_DPI / 8))  # add 1/8" total margin to text height
@@ -31,6 +31,8 @@ QR_LABEL_MIN_HEIGHT_PX = 120
 QR_TEXT_FONT_POINTS = 28
 QR_TEXT_MAX_LINES = 4
 QR_TEXT_LINE_GAP_PX = 6
+# Only used to exercise the QR label path during startup warm-up.
+WARMUP_QR_URL = "http://localhost:8099/bb"
 QR_TEXT_VERTICAL_PADDING_PX = 10
 QR_TEXT_HORIZONTAL_PADDING_PX = 12
 
@@ -47,77 +49,8 @@ _BASE_DATE_KEYS = ("BaseDate", "baseDate", "base_date")
 
 
 def _measure_text_size(text: str, font) -> tuple[int, int]:
-    dummy = Image.new("L", (1, 1), 255)
-    draw = ImageDraw.Draw(dummy)
-    bbox = draw.textbbox((0, 0), text, font=font)
-    width = int(round(bbox[2] - bbox[0]))
-    height = int(round(bbox[3] - bbox[1]))
-    return width, height
-
-
-def _trim_text_to_width(text: str, font, max_width: int) -> str:
-    if max_width <= 0:
-        return ""
-    if _measure_text_size(text, font)[0] <= max_width:
-        return text
-
-    ellipsis = "..."
-    ellipsis_width, _ = _measure_text_size(ellipsis, font)
-    if ellipsis_width > max_width:
-        # Fall back to the smallest visible slice we can fit.
-        for char in text:
-            if _measure_text_size(char, font)[0] <= max_width:
-                return char
-        return ""
-
-    for end in range(len(text), 0, -1):
-        candidate = text[:end].rstrip()
-        if not candidate:
-            continue
-        candidate_with_ellipsis = f"{candidate}{ellipsis}"
-        if _measure_text_size(candidate_with_ellipsis, font)[0] <= max_width:
-            return candidate_with_ellipsis
-    return ""
-
-
-def _wrap_caption_lines(text: str, font, max_width: int, max_lines: int) -> list[str]:
-    """Wrap caption text into ``max_lines`` respecting ``max_width`` per line."""
-    if max_width <= 0 or max_lines <= 0:
-        return []
-    normalized = " ".join(text.split())
-    if not normalized:
-        return []
-
-    lines: list[str] = []
-    current = ""
-    words = normalized.split(" ")
-    index = 0
-    while index < len(words):
-        word = words[index]
-        candidate = word if not current else f"{current} {word}"
-        if _measure_text_size(candidate, font)[0] <= max_width:
-            current = candidate
-            index += 1
-            continue
-
-        if current:
-            lines.append(current)
-        else:
-            lines.append(_trim_text_to_width(word, font, max_width))
-            index += 1
-        current = ""
-        if len(lines) == max_lines:
-            break
-
-    if current and len(lines) < max_lines:
-        lines.append(current)
-
-    if len(lines) > max_lines:
-        lines = lines[:max_lines]
-
-    if len(lines) == max_lines and index < len(words):
-        lines[-1] = _trim_text_to_width(lines[-1], font, max_width)
-    return lines
+    size = helper.text_metrics(font).size(text)
+    return size.width, size.height
 
 
 def _measure_text_block_height(lines: list[str], font, line_gap: int) -> int:
@@ -282,27 +215,7 @@ def compute_best_by(
 
 
 def _qr_image(qr_url: str, target_height_px: Optional[int] = None) -> Image.Image:
-    qr = qrcode.QRCode(
-        version=None,
-        error_correction=qrcode.constants.ERROR_CORRECT_H,
-        border=1,
-        box_size=1,
-    )
-    qr.add_data(qr_url)
-    qr.make(fit=True)
-    qr_image = qr.make_image(fill_color="black", back_color="white").convert("L")
-    modules_count = qr.modules_count
-    quiet_zone_modules = qr.border
-    total_modules = modules_count + (quiet_zone_modules * 2)
-
-    qr_image.info["modules_count"] = modules_count
-    qr_image.info["quiet_zone_modules"] = quiet_zone_modules
-
-    if target_height_px is not None and target_height_px != qr_image.height:
-        module_px = max(QR_MIN_MODULE_PX, int(math.ceil(target_height_px / max(total_modules, 1))))
-        target_size_px = max(qr_image.width, total_modules * module_px)
-        qr_image = qr_image.resize((target_size_px, target_size_px), resample=Resampling.NEAREST)
-
+    qr_image = qr_codes.qr_image(qr_url, target_size=target_height_px)
     qr_image.info["qr_overlay_applied"] = False
     return qr_image
 
@@ -319,11 +232,8 @@ def _render_qr_label(*, qr_url: str, caption: str, template_slug: str) -> Image.
     text_area_left = QR_MARGIN_PX + qr_image.width + QR_TEXT_GAP_PX
     text_area_right = width_px - QR_TEXT_HORIZONTAL_PADDING_PX
     max_text_width = max(text_area_right - (text_area_left + QR_TEXT_HORIZONTAL_PADDING_PX), 1)
-    wrapped_caption = _wrap_caption_lines(
-        caption_text,
-        text_font,
-        max_text_width,
-        QR_TEXT_MAX_LINES,
+    wrapped_caption = helper.text_metrics(text_font).wrap(
+        caption_text, max_text_width, QR_TEXT_MAX_LINES
     )
     text_height_px = _measure_text_block_height(wrapped_caption, text_font, QR_TEXT_LINE_GAP_PX)
 
@@ -379,7 +289,7 @@ class Template(TemplateDefinition):
 
     @property
     def display_name(self) -> str:
-        return "Best By"
+        return DISPLAY_NAME
 
     @property
     def form_template(self) -> str:
@@ -395,6 +305,15 @@ class Template(TemplateDefinition):
     def preferred_label_spec(self) -> BrotherLabelSpec:
         return self._last_spec or bluey_label.LABEL_SPEC
 
+    def font_sizes(self) -> tuple[int, ...]:
+        return (FONT_POINTS, QR_TEXT_FONT_POINTS)
+
+    def restore_label_spec(self, label_spec: Optional[BrotherLabelSpec]) -> None:
+        self._last_spec = label_spec
+
+    def warmup_form_data(self) -> tuple[Mapping[str, TemplateFormValue], ...]:
+        return ({}, {"QrUrl": WARMUP_QR_URL})
+
     def render(self, form_data: TemplateFormData) -> Image.Image:
         if form_data.get_str("QrUrl", "qr_url"):
             delta_label = describe_delta(form_data)
@@ -1,21 +1,27 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Optional
 
-import qrcode  # type: ignore[import-untyped]
-from PIL import Image, ImageChops, ImageDraw, ImageFilter
-from PIL.Image import Dither, Resampling
+from PIL import Image, ImageChops, ImageDraw
+from PIL.Image import Dither
 
 from printer_service.label_specs import BrotherLabelSpec, QL810W_DPI
 from printer_service.label_templates import helper as helper
+from printer_service.label_templates import qr_codes
 from printer_service.label_templates.helper import LabelDrawingHelper, SvgSymbolOption
 from printer_service.label_templates.base import (
+    SymbolLayout,
     TemplateContext,
     TemplateDefinition,
     TemplateFormData,
+    TemplateFormValue,
 )
 
+DISPLAY_NAME = "Bluey Label"
+
 # Bluey targets the 2.4" x 1.3" roll but rotates the artwork so it runs lengthwise.
 LABEL_WIDTH_IN = 2.4
 LABEL_HEIGHT_IN = 1.3
@@ -57,6 +63,12 @@ METER_BOTTOM_WIDTH = METER_TOP_WIDTH * 3
 METER_DOT_RADIUS = 20
 METER_CHIP_PADDING = 3
 METER_LABEL_FONT_POINTS = int(INITIALS_FONT_POINTS * 0.75 * 0.75)
+# Jar labels keep the long edge and trim the short edge by 15%.
+JAR_CANVAS_WIDTH_PX = CANVAS_HEIGHT_PX
+JAR_CANVAS_HEIGHT_PX = int(CANVAS_WIDTH_PX * 0.85)
+JAR_TITLE_FONT_POINTS = int(TITLE_FONT_POINTS * 0.8 * 1.1)  # Increase by 10%
+JAR_SIDE_FONT_POINTS = int(INITIALS_FONT_POINTS * 0.5)  # Reduced for better fit
+JAR_DETAIL_FONT_POINTS = int(DATE_FONT_POINTS * 0.8 * 3)  # Triple the size
 METER_TEXT_HALO_SIZE = 7
 METER_STRIP_CENTER_INSET = 36
 TITLE_TEXT_HALO_SIZE = 13
@@ -71,7 +83,7 @@ class MeterValue:
 class Template(TemplateDefinition):
     @property
     def display_name(self) -> str:
-        return "Bluey Label"
+        return DISPLAY_NAME
 
     @property
     def form_template(self) -> str:
@@ -87,6 +99,27 @@ class Template(TemplateDefinition):
     def preferred_label_spec(self) -> BrotherLabelSpec:
         return LABEL_SPEC
 
+    def font_sizes(self) -> tuple[int, ...]:
+        return (
+            TITLE_FONT_POINTS,
+            INITIALS_FONT_POINTS,
+            DATE_FONT_POINTS,
+            METER_LABEL_FONT_POINTS,
+            JAR_TITLE_FONT_POINTS,
+            JAR_SIDE_FONT_POINTS,
+            JAR_DETAIL_FONT_POINTS,
+        )
+
+    def symbol_layouts(self) -> tuple[SymbolLayout, ...]:
+        return (
+            SymbolLayout(CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX, BACKGROUND_ALPHA_PERCENT),
+            SymbolLayout(CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX, METER_BACKGROUND_ALPHA_PERCENT),
+            SymbolLayout(JAR_CANVAS_WIDTH_PX, JAR_CANVAS_HEIGHT_PX, BACKGROUND_ALPHA_PERCENT),
+        )
+
+    def warmup_form_data(self) -> tuple[Mapping[str, TemplateFormValue], ...]:
+        return ({}, {"jar_label_request": "true"})
+
     def render(self, form_data: TemplateFormData) -> Image.Image:
         # Check if this is an explicit jar label request
         jar_request = form_data.get_str("jar_label_request")
@@ -221,7 +254,7 @@ class Template(TemplateDefinition):
             initials_top_margin: Optional[int] = None
             initials_min_top: Optional[int] = None
             initials_center = True
-            bbox = renderer.draw.textbbox((0, 0), side, font=initials_font)
+            bbox = renderer.text_bbox(side, initials_font)
             text_width = int(round(bbox[2] - bbox[0]))
             text_height = int(round(bbox[3] - bbox[1]))
             if text_width > 0 and text_height > 0:
@@ -417,7 +450,7 @@ class Template(TemplateDefinition):
         reading: int,
     ) -> None:
         chip_font = helper.load_font(size_points=METER_LABEL_FONT_POINTS)
-        bbox = renderer.draw.textbbox((0, 0), text, font=chip_font)
+        bbox = renderer.text_bbox(text, chip_font)
         text_width = int(round(bbox[2] - bbox[0]))
         text_height = int(round(bbox[3] - bbox[1]))
         chip_width = text_width + (2 * METER_CHIP_PADDING)
@@ -428,10 +461,9 @@ class Template(TemplateDefinition):
 
         text_x = chip_left + METER_CHIP_PADDING - bbox[0]
         text_y = chip_top + METER_CHIP_PADDING - bbox[1]
-        text_mask = Image.new("L", (CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX), color=0)
-        text_draw = ImageDraw.Draw(text_mask)
-        text_draw.text((text_x, text_y), text, fill=255, font=chip_font)
-        halo_mask = text_mask.filter(ImageFilter.MaxFilter(size=METER_TEXT_HALO_SIZE))
+        text_mask, halo_mask = _text_and_halo_masks(
+            text, chip_font, (int(text_x), int(text_y)), METER_TEXT_HALO_SIZE
+        )
         background_canvas.paste(255, (0, 0), halo_mask)
         renderer.canvas.paste(255, (0, 0), halo_mask)
         renderer.canvas.paste(0, (0, 0), text_mask)
@@ -464,43 +496,13 @@ class Template(TemplateDefinition):
         if bottom_edge > CANVAS_HEIGHT_PX:
             renderer.add_warning(height_warning or "Text exceeds label height and may be clipped.")
 
-        text_mask = Image.new("L", (CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX), color=0)
-        text_draw = ImageDraw.Draw(text_mask)
-        text_draw.text((left, top), text, fill=255, font=font)
-        halo_mask = self._expanded_mask(text_mask, TITLE_TEXT_HALO_SIZE)
+        text_mask, halo_mask = _text_and_halo_masks(text, font, (left, top), TITLE_TEXT_HALO_SIZE)
         if background_clear_mask is not None:
             restricted_halo = ImageChops.multiply(halo_mask, background_clear_mask)
             background_canvas.paste(255, (0, 0), restricted_halo)
         renderer.canvas.paste(255, (0, 0), halo_mask)
         renderer.canvas.paste(0, (0, 0), text_mask)
 
-    def _expanded_mask(self, mask: Image.Image, filter_size: int) -> Image.Image:
-        bbox = mask.getbbox()
-        if bbox is None:
-            return mask
-        radius = filter_size // 2
-        output_left = max(0, bbox[0] - radius)
-        output_top = max(0, bbox[1] - radius)
-        output_right = min(mask.width, bbox[2] + radius)
-        output_bottom = min(mask.height, bbox[3] + radius)
-        input_left = max(0, output_left - radius)
-        input_top = max(0, output_top - radius)
-        input_right = min(mask.width, output_right + radius)
-        input_bottom = min(mask.height, output_bottom + radius)
-        crop = mask.crop((input_left, input_top, input_right, input_bottom))
-        expanded_crop = crop.filter(ImageFilter.MaxFilter(size=filter_size))
-        paste_crop = expanded_crop.crop(
-            (
-                output_left - input_left,
-                output_top - input_top,
-                output_right - input_left,
-                output_bottom - input_top,
-            )
-        )
-        expanded = Image.new("L", mask.size, color=0)
-        expanded.paste(paste_crop, (output_left, output_top))
-        return expanded
-
     def _render_jar_label(self, form_data: TemplateFormData) -> Image.Image:
         """Render a portrait-oriented jar label with HTML table layout."""
         # Extract form data
@@ -520,8 +522,8 @@ class Template(TemplateDefinition):
 
         # Portrait orientation: rotate main label 90° and reduce short edge by 15%
         # Main label canvas: 390×720, so jar label should be 720×(390*0.85) = 720×331
-        portrait_width_px = CANVAS_HEIGHT_PX  # 720px (long edge stays same)
-        portrait_height_px = int(CANVAS_WIDTH_PX * 0.85)  # 331px (short edge reduced by 15%)
+        portrait_width_px = JAR_CANVAS_WIDTH_PX  # 720px (long edge stays same)
+        portrait_height_px = JAR_CANVAS_HEIGHT_PX  # 331px (short edge reduced by 15%)
 
         # Create renderer with portrait dimensions
         renderer = LabelDrawingHelper(width=portrait_width_px, height=portrait_height_px)
@@ -538,18 +540,10 @@ class Template(TemplateDefinition):
         renderer.canvas.paste(background_canvas, (0, 0))
 
         # Define fonts with requested size adjustments
-        title_font = helper.load_font(
-            size_points=int(TITLE_FONT_POINTS * 0.8 * 1.1)
-        )  # Increase by 10%
-        side_font = helper.load_font(
-            size_points=int(INITIALS_FONT_POINTS * 0.5)
-        )  # Reduced for better fit
-        supplier_font = helper.load_font(
-            size_points=int(DATE_FONT_POINTS * 0.8 * 3)
-        )  # Triple the size
-        bottom_font = helper.load_font(
-            size_points=int(DATE_FONT_POINTS * 0.8 * 3)
-        )  # Triple the size
+        title_font = helper.load_font(size_points=JAR_TITLE_FONT_POINTS)
+        side_font = helper.load_font(size_points=JAR_SIDE_FONT_POINTS)
+        supplier_font = helper.load_font(size_points=JAR_DETAIL_FONT_POINTS)
+        bottom_font = helper.load_font(size_points=JAR_DETAIL_FONT_POINTS)
 
         # Layout following HTML table structure:
         # Row 1: Line1 Line2 (centered, colspan=3) with Side below
@@ -607,7 +601,7 @@ class Template(TemplateDefinition):
 
         # Generate QR code with form data (excluding print=true)
         qr_data = self._build_jar_qr_data(form_data)
-        qr_image = self._create_qr_image(qr_data, target_size=qr_size)
+        qr_image = qr_codes.qr_image(qr_data, target_size=qr_size, rounding="down")
 
         # Center QR code in its column
         qr_x = qr_col_x + (col_width - qr_image.width) // 2
@@ -650,32 +644,91 @@ class Template(TemplateDefinition):
         # Fallback to a basic URL if not provided
         return "http://localhost:8099/bb"
 
-    def _create_qr_image(self, data: str, target_size: int) -> Image.Image:
-        """Create a QR code image with the specified target size, maintaining scannability."""
-        qr = qrcode.QRCode(
-            version=None,
-            error_correction=qrcode.constants.ERROR_CORRECT_H,
-            border=1,
-            box_size=1,
-        )
-        qr.add_data(data)
-        qr.make(fit=True)
-        qr_image = qr.make_image(fill_color="black", back_color="white").convert("L")
-
-        # Use the better resizing approach from best_by.py to maintain scannability
-        if target_size != qr_image.width:
-            modules_count = qr.modules_count
-            quiet_zone_modules = qr.border
-            total_modules = modules_count + (quiet_zone_modules * 2)
-
-            # Ensure each QR module is at least 2 pixels for scannability
-            QR_MIN_MODULE_PX = 2
-            module_px = max(QR_MIN_MODULE_PX, int(target_size / max(total_modules, 1)))
-            actual_size = total_modules * module_px
-
-            qr_image = qr_image.resize((actual_size, actual_size), resample=Resampling.NEAREST)
 
-        return qr_image
+def _text_and_halo_masks(
+    text: str, font: helper.FontType, position: tuple[int, int], halo_size: int
+) -> tuple[Image.Image, Image.Image]:
+    """Return canvas-sized ``(text, halo)`` masks for ``text`` drawn at ``position``.
+
+    The halo is the text mask grown by ``ImageFilter.MaxFilter(halo_size)``.
+    """
+    text_mask = Image.new("L", (CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX), color=0)
+    halo_mask = Image.new("L", (CANVAS_WIDTH_PX, CANVAS_HEIGHT_PX), color=0)
+    text_stamp, halo_stamp, (ink_left, ink_top) = _halo_stamp(text, font, halo_size)
+    left = position[0] + ink_left
+    top = position[1] + ink_top
+    inside = (
+        left >= 0
+        and top >= 0
+        and left + text_stamp.width <= CANVAS_WIDTH_PX
+        and top + text_stamp.height <= CANVAS_HEIGHT_PX
+    )
+    if not inside:
+        # Clipped text grows a different halo than the whole stamp would.
+        ImageDraw.Draw(text_mask).text(position, text, fill=255, font=font)
+        return text_mask, _expanded_mask(text_mask, halo_size)
+    radius = halo_size // 2
+    text_mask.paste(text_stamp, (left, top))
+    halo_mask.paste(halo_stamp, (left - radius, top - radius))
+    return text_mask, halo_mask
+
+
+@lru_cache(maxsize=64)
+def _halo_stamp(
+    text: str, font: helper.FontType, halo_size: int
+) -> tuple[Image.Image, Image.Image, tuple[int, int]]:
+    """Render ``text`` and its halo once; titles repeat several times per label.
+
+    Fonts come from the shared font registry, so the font object stands in for
+    its file and size in the cache key.
+    """
+    left, top, right, bottom = (int(value) for value in helper.text_metrics(font).bbox(text))
+    text_stamp = Image.new("L", (max(1, right - left), max(1, bottom - top)), color=0)
+    ImageDraw.Draw(text_stamp).text((-left, -top), text, fill=255, font=font)
+    return text_stamp, _dilate(text_stamp, halo_size), (left, top)
+
+
+def _expanded_mask(mask: Image.Image, filter_size: int) -> Image.Image:
+    """Return ``mask.filter(ImageFilter.MaxFilter(filter_size))``, computed around the ink only."""
+    bbox = mask.getbbox()
+    if bbox is None:
+        return mask
+    radius = filter_size // 2
+    expanded = Image.new("L", mask.size, color=0)
+    expanded.paste(_dilate(mask.crop(bbox), filter_size), (bbox[0] - radius, bbox[1] - radius))
+    return expanded
+
+
+def _dilate(mask: Image.Image, size: int) -> Image.Image:
+    """Grow ``mask`` by a ``size`` x ``size`` max filter, keeping the grown border.
+
+    The result is ``size - 1`` pixels wider and taller than ``mask``; cropping it
+    by ``size // 2`` on each side matches ``ImageFilter.MaxFilter(size)``. The
+    square window is split into a horizontal and a vertical running max, each
+    built from about log2(size) shifted ``ImageChops.lighter`` passes instead of
+    a size-squared rank filter per pixel.
+    """
+    grown = size - 1
+    # A forward running max at index i covers [i, i + size - 1]; shifting the
+    # mask by ``grown`` centres that window on mask pixel i - size // 2.
+    padded = Image.new("L", (mask.width + 2 * grown, mask.height + 2 * grown), color=0)
+    padded.paste(mask, (grown, grown))
+    dilated = _running_max(_running_max(padded, size, (1, 0)), size, (0, 1))
+    return dilated.crop((0, 0, mask.width + grown, mask.height + grown))
+
+
+def _running_max(image: Image.Image, length: int, direction: tuple[int, int]) -> Image.Image:
+    # After each pass every pixel holds the max of the ``covered`` pixels
+    # starting at it along ``direction``; out-of-range pixels count as zero.
+    result = image
+    covered = 1
+    while covered < length:
+        step = min(covered, length - covered)
+        shifted = Image.new("L", image.size, color=0)
+        shifted.paste(result, (-step * direction[0], -step * direction[1]))
+        result = ImageChops.lighter(result, shifted)
+        covered += step
+    return result
 
 
 TEMPLATE = Template()
@@ -21,6 +21,8 @@ from printer_service.label_templates import helper
 
 import io
 import os
+import threading
+import time
 from datetime import datetime
 from functools import lru_cache
 from pathlib import Path
@@ -38,31 +40,34 @@ from typing import (
     TypeAlias,
 )
 
-try:
-    import cairosvg as _cairosvg
-except OSError, ImportError:
-    _cairosvg = None
-cairosvg: Any | None = _cairosvg
 from PIL import Image, ImageDraw, ImageFont
 from PIL.Image import Dither
 
 FontType: TypeAlias = ImageFont.FreeTypeFont | ImageFont.ImageFont
 ColorValue: TypeAlias = int | tuple[int, int, int] | tuple[int, int, int, int]
 
+from . import symbol_pack
 from .base import TemplateFormValue
 
 __all__ = [
     "Box",
+    "FontRegistry",
     "LabelDrawingHelper",
     "available_symbol_slugs",
+    "font_cache_stats",
+    "font_report",
     "load_font",
     "normalize_choice",
     "normalize_date",
+    "preload_fonts",
     "render_svg_symbol",
     "sanitize_lines",
     "SvgSymbolOption",
+    "TextMetrics",
+    "svg_raster_cache_stats",
     "svg_symbol_directory",
     "svg_symbol_options",
+    "text_metrics",
     "draw_background_symbol",
 ]
 
@@ -99,15 +104,114 @@ def _iter_candidate_fonts() -> Iterable[str]:
     yield "DejaVuSans.ttf"
 
 
-@lru_cache(maxsize=32)
+class FontRegistry:
+    """Resolve the label font file once per ``LABEL_FONT_PATH`` and cache each size.
+
+    Walking the Futura candidates costs an ``OSError`` per missing file, so the
+    winning path is remembered and later sizes load it directly.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # LABEL_FONT_PATH -> resolved file, or None when only Pillow's default loads.
+        self._paths: dict[Optional[str], Optional[str]] = {}
+        self._fonts: dict[tuple[Optional[str], int], FontType] = {}
+        self._resolve_ms: dict[Optional[str], float] = {}
+        self._load_ms: dict[tuple[Optional[str], int], float] = {}
+        # Separate from ``_lock`` so counting a hit never waits for a font load.
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def load(self, size_points: int) -> FontType:
+        configured = os.getenv("LABEL_FONT_PATH") or None
+        key = (configured, size_points)
+        font = self._fonts.get(key)
+        if font is not None:
+            with self._stats_lock:
+                self._hits += 1
+            return font
+        with self._lock:
+            font = self._fonts.get(key)
+            if font is None:
+                started = time.perf_counter()
+                font = self._load_locked(configured, size_points)
+                self._load_ms[key] = (time.perf_counter() - started) * 1000
+                self._fonts[key] = font
+        with self._stats_lock:
+            self._misses += 1
+        return font
+
+    def stats(self) -> dict[str, int]:
+        with self._stats_lock:
+            return {"hits": self._hits, "misses": self._misses}
+
+    def preload(self, sizes: Iterable[int]) -> dict[str, object]:
+        """Load every size in ``sizes`` now and return :meth:`report`."""
+        for size_points in sorted(set(sizes)):
+            self.load(size_points)
+        return self.report()
+
+    def report(self) -> dict[str, object]:
+        """Describe the chosen font file and how long resolving and loading took."""
+        configured = os.getenv("LABEL_FONT_PATH") or None
+        with self._lock:
+            resolved = configured in self._paths
+            loaded = {
+                size: load_ms
+                for (path_setting, size), load_ms in self._load_ms.items()
+                if path_setting == configured
+            }
+            return {
+                "label_font_path": configured,
+                "path": self._paths.get(configured),
+                "fallback": resolved and self._paths.get(configured) is None,
+                "resolve_ms": round(self._resolve_ms.get(configured, 0.0), 2),
+                "load_ms": round(sum(loaded.values()), 2),
+                "sizes": sorted(loaded),
+            }
+
+    def _load_locked(self, configured: Optional[str], size_points: int) -> FontType:
+        if configured in self._paths:
+            path = self._paths[configured]
+            if path is None:
+                return ImageFont.load_default()
+            return ImageFont.truetype(path, size=size_points)
+
+        started = time.perf_counter()
+        for candidate in _iter_candidate_fonts():
+            try:
+                font = ImageFont.truetype(candidate, size=size_points)
+            except OSError:
+                continue
+            # Pillow reports the file it found on the font search path.
+            self._paths[configured] = font.path if isinstance(font.path, str) else candidate
+            self._resolve_ms[configured] = (time.perf_counter() - started) * 1000
+            return font
+        self._paths[configured] = None
+        self._resolve_ms[configured] = (time.perf_counter() - started) * 1000
+        return ImageFont.load_default()
+
+
+_FONT_REGISTRY = FontRegistry()
+
+
 def load_font(*, size_points: int) -> FontType:
     """Load the project default font at ``size_points``."""
-    for candidate in _iter_candidate_fonts():
-        try:
-            return ImageFont.truetype(candidate, size=size_points)
-        except OSError:
-            continue
-    return ImageFont.load_default()
+    return _FONT_REGISTRY.load(size_points)
+
+
+def preload_fonts(sizes: Iterable[int]) -> dict[str, object]:
+    """Load ``sizes`` ahead of the first render and report the chosen font file."""
+    return _FONT_REGISTRY.preload(sizes)
+
+
+def font_report() -> dict[str, object]:
+    return _FONT_REGISTRY.report()
+
+
+def font_cache_stats() -> dict[str, int]:
+    return _FONT_REGISTRY.stats()
 
 
 def normalize_choice(
@@ -232,6 +336,16 @@ def render_svg_symbol(*, path: Path, output_width: int) -> Image.Image:
     return raster.copy()
 
 
+def _symbol_planes(path: Path, output_width: int) -> tuple[Image.Image, Image.Image]:
+    """Return the ``(L, alpha)`` planes of a symbol, from the symbol pack when possible."""
+    pack = symbol_pack.default_pack()
+    planes = pack.planes(path, output_width) if pack is not None else None
+    if planes is not None:
+        return planes
+    symbol = render_svg_symbol(path=path, output_width=output_width)
+    return symbol.convert("L"), symbol.getchannel("A")
+
+
 def draw_background_symbol(
     *,
     canvas: Image.Image,
@@ -252,17 +366,18 @@ def draw_background_symbol(
     if not path.exists():
         raise ValueError(f"Symbol SVG '{slug}.svg' not found.")
 
-    symbol = render_svg_symbol(path=path, output_width=canvas.width)
-    width, height = symbol.size
+    symbol_l, alpha = _symbol_planes(path, canvas.width)
+    width, height = symbol_l.size
     if height > canvas.height:
         scale = canvas.height / float(height)
         adjusted_width = max(1, int(round(width * scale)))
-        symbol = render_svg_symbol(path=path, output_width=adjusted_width)
-        width, height = symbol.size
+        symbol_l, alpha = _symbol_planes(path, adjusted_width)
+        width, height = symbol_l.size
 
-    symbol_l = symbol.convert("L")
-    alpha_scale = alpha_percent / 100.0
-    faded_alpha = symbol.getchannel("A").point(lambda value: int(round(value * alpha_scale)))
+    pack = symbol_pack.default_pack()
+    faded_alpha = pack.faded_alpha(path, width, alpha_percent) if pack is not None else None
+    if faded_alpha is None:
+        faded_alpha = symbol_pack.fade_alpha(alpha, alpha_percent)
     left = (canvas.width - width) // 2
     top = (canvas.height - height) // 2
     canvas.paste(symbol_l, (left, top), faded_alpha)
@@ -276,10 +391,185 @@ def _measure_text(
     font: FontType,
 ) -> Box:
     """Return ``(width, height)`` for the given ``text`` and ``font``."""
-    bbox = draw.textbbox((0, 0), text, font=font)
-    width = int(round(bbox[2] - bbox[0]))
-    height = int(round(bbox[3] - bbox[1]))
-    return Box(width=width, height=height)
+    return text_metrics(font, fontmode=draw.fontmode).size(text)
+
+
+# Pillow's ink box can come in up to half a pixel narrower than the summed
+# advances, so a candidate is only rejected on advances alone past this slack.
+_ADVANCE_SLACK_PX = 1.0
+_TEXT_BBOX_CACHE_SIZE = 2048
+_MAX_KERNING_PAIRS = 16384
+_ELLIPSIS = "..."
+
+
+class TextMetrics:
+    """Cached text measurement for one font drawn with one ``fontmode``.
+
+    Glyph advances and kerning pairs are read from the font once, so the
+    advance width of a candidate line is a dictionary walk instead of a
+    FreeType layout. The advance width never exceeds the ink box by more than
+    ``_ADVANCE_SLACK_PX``, which lets wrapping and trimming discard lines that
+    are too long without asking Pillow. Lines that might fit are measured
+    exactly by Pillow and memoised, so layouts stay pixel-identical.
+    """
+
+    def __init__(self, font: FontType, *, fontmode: str = "L") -> None:
+        self._font = font
+        self._fontmode = fontmode
+        self._draw = ImageDraw.Draw(Image.new(fontmode, (1, 1)))
+        # Raqm shapes whole runs, so per-glyph sums are only valid for BASIC.
+        self._per_glyph = (
+            isinstance(font, ImageFont.FreeTypeFont)
+            and font.layout_engine == ImageFont.Layout.BASIC
+        )
+        self._advances: dict[str, float] = {}
+        self._kerning: dict[tuple[str, str], float] = {}
+        # FreeType faces are not safe to use from several threads at once.
+        self._lock = threading.Lock()
+        self._cached_bbox = lru_cache(maxsize=_TEXT_BBOX_CACHE_SIZE)(self._measure_bbox)
+
+    def bbox(self, text: str) -> tuple[float, float, float, float]:
+        """Return Pillow's ``textbbox`` for ``text`` drawn at the origin."""
+        return self._cached_bbox(text)
+
+    def size(self, text: str) -> Box:
+        left, top, right, bottom = self.bbox(text)
+        return Box(width=int(round(right - left)), height=int(round(bottom - top)))
+
+    def advance(self, text: str) -> float:
+        """Return the pen advance of ``text`` using cached glyph metrics."""
+        if not self._per_glyph:
+            with self._lock:
+                return float(self._font.getlength(text, self._fontmode))
+        total = 0.0
+        previous = ""
+        for char in text:
+            total += self._glyph_advance(char)
+            if previous:
+                total += self._pair_kerning(previous, char)
+            previous = char
+        return total
+
+    def fits(self, text: str, max_width: int) -> bool:
+        if "\n" not in text and self.advance(text) - _ADVANCE_SLACK_PX > max_width:
+            return False
+        return self.size(text).width <= max_width
+
+    def trim(self, text: str, max_width: int) -> str:
+        """Return ``text`` or its longest prefix plus an ellipsis that fits ``max_width``."""
+        if max_width <= 0:
+            return ""
+        if self.fits(text, max_width):
+            return text
+
+        if not self.fits(_ELLIPSIS, max_width):
+            # Fall back to the smallest visible slice we can fit.
+            for char in text:
+                if self.fits(char, max_width):
+                    return char
+            return ""
+
+        for end in range(len(text), 0, -1):
+            candidate = text[:end].rstrip()
+            if not candidate:
+                continue
+            candidate_with_ellipsis = f"{candidate}{_ELLIPSIS}"
+            if self.fits(candidate_with_ellipsis, max_width):
+                return candidate_with_ellipsis
+        return ""
+
+    def wrap(self, text: str, max_width: int, max_lines: int) -> list[str]:
+        """Wrap ``text`` into ``max_lines`` respecting ``max_width`` per line."""
+        if max_width <= 0 or max_lines <= 0:
+            return []
+        normalized = " ".join(text.split())
+        if not normalized:
+            return []
+
+        lines: list[str] = []
+        current = ""
+        words = normalized.split(" ")
+        index = 0
+        while index < len(words):
+            word = words[index]
+            candidate = word if not current else f"{current} {word}"
+            if self.fits(candidate, max_width):
+                current = candidate
+                index += 1
+                continue
+
+            if current:
+                lines.append(current)
+            else:
+                lines.append(self.trim(word, max_width))
+                index += 1
+            current = ""
+            if len(lines) == max_lines:
+                break
+
+        if current and len(lines) < max_lines:
+            lines.append(current)
+
+        if len(lines) > max_lines:
+            lines = lines[:max_lines]
+
+        if len(lines) == max_lines and index < len(words):
+            lines[-1] = self.trim(lines[-1], max_width)
+        return lines
+
+    def _measure_bbox(self, text: str) -> tuple[float, float, float, float]:
+        with self._lock:
+            return self._draw.textbbox((0, 0), text, font=self._font)
+
+    def _glyph_advance(self, char: str) -> float:
+        advance = self._advances.get(char)
+        if advance is None:
+            with self._lock:
+                advance = float(self._font.getlength(char, self._fontmode))
+            self._advances[char] = advance
+        return advance
+
+    def _pair_kerning(self, first: str, second: str) -> float:
+        pair = (first, second)
+        kerning = self._kerning.get(pair)
+        if kerning is None:
+            with self._lock:
+                pair_length = float(self._font.getlength(first + second, self._fontmode))
+            kerning = pair_length - self._glyph_advance(first) - self._glyph_advance(second)
+            if len(self._kerning) < _MAX_KERNING_PAIRS:
+                self._kerning[pair] = kerning
+        return kerning
+
+
+_TEXT_METRICS: dict[tuple[object, ...], TextMetrics] = {}
+_TEXT_METRICS_LOCK = threading.Lock()
+
+
+def text_metrics(font: FontType, *, fontmode: str = "L") -> TextMetrics:
+    """Return the shared :class:`TextMetrics` for ``font`` and ``fontmode``.
+
+    ``FontRegistry`` caches one font object per ``LABEL_FONT_PATH`` setting and
+    size, but several settings can resolve to the same file, and callers may
+    build fonts with ``ImageFont.truetype`` directly. Engines are therefore
+    shared by font file, size and layout rather than by object identity, so equal
+    fonts measure through one warm engine. Fonts loaded from memory have no
+    stable key and get a private engine.
+    """
+    key = _font_key(font, fontmode)
+    if key is None:
+        return TextMetrics(font, fontmode=fontmode)
+    with _TEXT_METRICS_LOCK:
+        metrics = _TEXT_METRICS.get(key)
+        if metrics is None:
+            metrics = TextMetrics(font, fontmode=fontmode)
+            _TEXT_METRICS[key] = metrics
+        return metrics
+
+
+def _font_key(font: FontType, fontmode: str) -> Optional[tuple[object, ...]]:
+    if not isinstance(font, ImageFont.FreeTypeFont) or not isinstance(font.path, (str, bytes)):
+        return None
+    return (font.path, font.size, font.index, font.encoding, font.layout_engine, fontmode)
 
 
 def sanitize_lines(lines: Sequence[TemplateFormValue]) -> List[str]:
@@ -318,10 +608,9 @@ def _draw_symbol(
     if not path.exists():
         raise ValueError(f"Symbol SVG '{slug}.svg' not found.")
     output_width = canvas.width - (horizontal_margin * 2)
-    symbol = render_svg_symbol(path=path, output_width=output_width)
-    symbol_l = symbol.convert("L")  # Convert to greyscale for consistent raster quality.
-    alpha = symbol.getchannel("A")  # Preserve original alpha channel for masking.
-    width, height = symbol.size
+    # Greyscale plane for consistent raster quality; alpha preserved for masking.
+    symbol_l, alpha = _symbol_planes(path, output_width)
+    width, height = symbol_l.size
     left = (canvas.width - width) // 2
     canvas.paste(symbol_l, (left, top), alpha)
     return top + height
@@ -395,6 +684,10 @@ class LabelDrawingHelper:
     def measure_text(self, text: str, font: FontType) -> Box:
         return _measure_text(draw=self._draw, text=text, font=font)
 
+    def text_bbox(self, text: str, font: FontType) -> tuple[float, float, float, float]:
+        """Return the cached ``textbbox`` of ``text`` drawn at the origin."""
+        return text_metrics(font, fontmode=self._draw.fontmode).bbox(text)
+
     def draw_centered_text(
         self,
         *,
@@ -482,7 +775,7 @@ class LabelDrawingHelper:
         mask_dither: Dither | None = None,
     ) -> None:
         """Draw rotated ``text`` along both edges, repeating down the label."""
-        bbox = self._draw.textbbox((0, 0), text, font=font)
+        bbox = self.text_bbox(text, font)
         text_width = int(round(bbox[2] - bbox[0]))
         text_height = int(round(bbox[3] - bbox[1]))
         if text_width <= 0 or text_height <= 0:
@@ -543,16 +836,48 @@ class LabelDrawingHelper:
         return _finalize_label_image(self._canvas, self._warnings, monochrome=monochrome)
 
 
+_cairosvg: Any | None = None
+_cairosvg_loaded = False
+
+
+def _load_cairosvg() -> Any | None:
+    """Import cairosvg on first use; loading Cairo dominates the import time of this module."""
+    global _cairosvg, _cairosvg_loaded
+    if not _cairosvg_loaded:
+        try:
+            import cairosvg as module
+        except OSError, ImportError:
+            module = None
+        _cairosvg = module
+        _cairosvg_loaded = True
+    return _cairosvg
+
+
+def __getattr__(name: str) -> Any:
+    # ``helper.cairosvg`` stays available without importing Cairo up front.
+    if name == "cairosvg":
+        return _load_cairosvg()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def _svg2png_cache_token() -> int:
     """Return a cache token for the active SVG rasterizer implementation."""
+    cairosvg = _load_cairosvg()
     if cairosvg is None:
         return 0
     return id(cairosvg.svg2png)
 
 
+def svg_raster_cache_stats() -> dict[str, int]:
+    """Hit/miss counters for SVG symbols rasterised with cairosvg (symbol pack misses)."""
+    info = _render_svg_symbol_cached.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "entries": info.currsize}
+
+
 @lru_cache(maxsize=128)
 def _render_svg_symbol_cached(path: Path, output_width: int, rasterizer_token: int) -> Image.Image:
     del rasterizer_token
+    cairosvg = _load_cairosvg()
     if cairosvg is None:
         raise RuntimeError("cairosvg is required to render SVG symbols but is not installed.")
     buffer = io.BytesIO()
@@ -0,0 +1,105 @@
+"""Shared, cached QR code generation for label templates.
+
+Best By's QR label and Bluey's jar label both encode the preset URL, so a
+single preview used to build the same QR matrix twice. Matrices are cached per
+(data, error correction) and module-scaled images per target size on top of
+that, so each distinct URL costs one matrix computation.
+"""
+
+from __future__ import annotations
+
+import math
+from functools import lru_cache
+from typing import Literal, Optional
+
+import qrcode  # type: ignore[import-untyped]
+from PIL import Image
+from PIL.Image import Resampling
+
+ERROR_CORRECT_H: int = qrcode.constants.ERROR_CORRECT_H
+QR_BORDER_MODULES = 1
+# Keep every module at least 2 pixels wide so printed codes stay scannable.
+QR_MIN_MODULE_PX = 2
+_CACHE_SIZE = 128
+
+# "up" picks the module size that reaches ``target_size`` (Best By);
+# "down" picks the largest module size that stays within it (Bluey).
+ModuleRounding = Literal["up", "down"]
+
+
+def qr_image(
+    data: str,
+    *,
+    target_size: Optional[int] = None,
+    error_correction: int = ERROR_CORRECT_H,
+    rounding: ModuleRounding = "up",
+) -> Image.Image:
+    """Return a greyscale QR code for ``data`` scaled by whole modules toward ``target_size``.
+
+    ``info`` carries ``modules_count`` and ``quiet_zone_modules``. The image is
+    a copy, so callers may modify it.
+    """
+    return _scaled_qr(data, target_size, error_correction, rounding).copy()
+
+
+def qr_cache_stats() -> dict[str, int]:
+    matrices = _qr_matrix.cache_info()
+    images = _scaled_qr.cache_info()
+    return {
+        "matrix_hits": matrices.hits,
+        "matrix_misses": matrices.misses,
+        "image_hits": images.hits,
+        "image_misses": images.misses,
+        "entries": images.currsize,
+        "max_entries": _CACHE_SIZE,
+    }
+
+
+def clear_qr_cache() -> None:
+    _qr_matrix.cache_clear()
+    _scaled_qr.cache_clear()
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _qr_matrix(data: str, error_correction: int) -> Image.Image:
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=error_correction,
+        border=QR_BORDER_MODULES,
+        box_size=1,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.make_image(fill_color="black", back_color="white").convert("L")
+    matrix.info["modules_count"] = qr.modules_count
+    matrix.info["quiet_zone_modules"] = qr.border
+    return matrix
+
+
+@lru_cache(maxsize=_CACHE_SIZE)
+def _scaled_qr(
+    data: str,
+    target_size: Optional[int],
+    error_correction: int,
+    rounding: ModuleRounding,
+) -> Image.Image:
+    matrix = _qr_matrix(data, error_correction)
+    if target_size is None or target_size == matrix.width:
+        return matrix
+    total_modules = max(matrix.width, 1)
+    if rounding == "up":
+        module_px = max(QR_MIN_MODULE_PX, int(math.ceil(target_size / total_modules)))
+    else:
+        module_px = max(QR_MIN_MODULE_PX, int(target_size / total_modules))
+    size_px = max(matrix.width, total_modules * module_px)
+    return matrix.resize((size_px, size_px), resample=Resampling.NEAREST)
+
+
+__all__ = [
+    "ERROR_CORRECT_H",
+    "ModuleRounding",
+    "QR_MIN_MODULE_PX",
+    "clear_qr_cache",
+    "qr_cache_stats",
+    "qr_image",
+]
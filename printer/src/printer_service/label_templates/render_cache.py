@@ -0,0 +1,170 @@
+"""Byte-bounded LRU cache for rendered label images.
+
+Kitchen tablets re-preview and re-print the same handful of presets all day, so
+:class:`printer_service.label_templates.LabelTemplate` keeps the most recent
+renders in memory keyed by the canonical preset query. The calendar day is part
+of every key because date-driven templates (Best By) resolve "today" while
+rendering; entries from yesterday simply stop matching and age out.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, Optional
+
+from PIL import Image
+
+from printer_service.label_specs import BrotherLabelSpec
+
+from .base import TemplateFormValue
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+RenderCacheKey = tuple[str, str, tuple[tuple[str, Optional[str]], ...]]
+
+
+@dataclass(frozen=True)
+class _CacheEntry:
+    image: Image.Image
+    label_spec: Optional[BrotherLabelSpec]
+    size_bytes: int
+
+
+def image_size_bytes(image: Image.Image) -> int:
+    """Approximate the in-memory footprint of ``image``.
+
+    Pillow stores mode ``1`` images with one byte per pixel, so width x height x
+    bands is a close enough bound for cache accounting.
+    """
+    return max(1, image.width * image.height * len(image.getbands()))
+
+
+def max_bytes_from_env() -> int:
+    """Return the configured cache budget from ``LABEL_RENDER_CACHE_BYTES``."""
+    raw = os.getenv("LABEL_RENDER_CACHE_BYTES")
+    if raw is None or not raw.strip():
+        return DEFAULT_MAX_BYTES
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+
+def render_cache_key(
+    template_slug: str,
+    form_data: Mapping[str, TemplateFormValue],
+    *,
+    today: date,
+) -> RenderCacheKey:
+    """Return the cache key for rendering ``form_data`` with ``template_slug``.
+
+    The canonical preset query drops blank values and trims whitespace, but
+    templates can still tell those inputs apart (an explicitly blank ``Prefix``
+    or ``BaseDate`` changes the Best By output). Such raw values are appended so
+    distinct renders never share a key.
+    """
+    from printer_service.presets import canonical_query_string
+
+    residual: list[tuple[str, Optional[str]]] = []
+    for key, value in form_data.items():
+        if value is None:
+            residual.append((str(key), None))
+        elif isinstance(value, str) and (not value or value != value.strip()):
+            residual.append((str(key), value))
+    residual.sort(key=lambda item: (item[0], item[1] or ""))
+    query = canonical_query_string(template_slug, form_data)
+    return query, today.isoformat(), tuple(residual)
+
+
+class RenderCache:
+    """Thread-safe LRU of rendered images bounded by an approximate byte budget."""
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        today: Callable[[], date] = date.today,
+    ) -> None:
+        self._max_bytes = max(0, max_bytes)
+        self._today = today
+        self._entries: OrderedDict[RenderCacheKey, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_bytes > 0
+
+    def key_for(
+        self, template_slug: str, form_data: Mapping[str, TemplateFormValue]
+    ) -> RenderCacheKey:
+        return render_cache_key(template_slug, form_data, today=self._today())
+
+    def get(self, key: RenderCacheKey) -> Optional[tuple[Image.Image, Optional[BrotherLabelSpec]]]:
+        """Return a private copy of the cached image and its label spec, if present."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        return entry.image.copy(), entry.label_spec
+
+    def put(
+        self,
+        key: RenderCacheKey,
+        image: Image.Image,
+        label_spec: Optional[BrotherLabelSpec],
+    ) -> None:
+        """Store a copy of ``image``; oversized images are never cached."""
+        size_bytes = image_size_bytes(image)
+        if size_bytes > self._max_bytes:
+            return
+        entry = _CacheEntry(image=image.copy(), label_spec=label_spec, size_bytes=size_bytes)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous.size_bytes
+            self._entries[key] = entry
+            self._size_bytes += size_bytes
+            while self._size_bytes > self._max_bytes and self._entries:
+                _evicted_key, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= evicted.size_bytes
+                self._evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self._max_bytes,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+__all__ = [
+    "DEFAULT_MAX_BYTES",
+    "RenderCache",
+    "RenderCacheKey",
+    "image_size_bytes",
+    "max_bytes_from_env",
+    "render_cache_key",
+]
@@ -0,0 +1,288 @@
+"""Pre-rasterised SVG symbols, memory-mapped at runtime.
+
+Rasterising a symbol with cairosvg on first use costs a Cairo render per
+(symbol, width), and every background symbol then has its alpha faded again.
+``python -m printer_service.label_templates.symbol_pack`` renders every SVG in
+``svg_symbols`` at the sizes templates declare through
+``TemplateDefinition.symbol_layouts()`` and writes the raw L and alpha planes,
+plus alpha planes pre-faded to each declared opacity, into one pack file. At
+runtime the pack is memory-mapped and symbols are served from it; anything the
+pack does not cover (another width, an edited SVG) still goes through cairosvg.
+
+Entries are keyed by the SVG's content hash, so a stale pack never serves an
+outdated drawing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+from PIL import Image
+
+from .base import SymbolLayout
+
+PACK_FILENAME = "svg_symbols.pack"
+_MAGIC = b"LBLSYMP1"
+_HEADER = struct.Struct("<8sI")
+_ALIGNMENT = 16
+
+# Rasterises the SVG at a path to an "LA" image ``output_width`` pixels wide.
+Rasterizer = Callable[[Path, int], Image.Image]
+
+
+def default_pack_path() -> Path:
+    configured = os.getenv("LABEL_SYMBOL_PACK")
+    if configured:
+        return Path(configured)
+    return Path(__file__).resolve().parent / PACK_FILENAME
+
+
+def svg_digest(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def fade_alpha(alpha: Image.Image, alpha_percent: int) -> Image.Image:
+    """Scale ``alpha`` to ``alpha_percent`` opacity."""
+    alpha_scale = alpha_percent / 100.0
+    return alpha.point(lambda value: int(round(value * alpha_scale)))
+
+
+class SymbolPack:
+    """Read-only view over a pack file; planes are zero-copy slices of the map."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with path.open("rb") as handle:
+            self._map = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, index_length = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not an SVG symbol pack.")
+        index_end = _HEADER.size + index_length
+        index = json.loads(self._map[_HEADER.size : index_end].decode("utf-8"))
+        self._data_offset = _aligned(index_end)
+        self._entries: dict[str, dict] = index["entries"]
+        self._digests: dict[tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["SymbolPack"]:
+        """Return the pack at ``path``, or ``None`` when it is missing or unreadable."""
+        try:
+            return cls(path)
+        except OSError, ValueError, KeyError:
+            return None
+
+    def planes(
+        self, svg_path: Path, output_width: int
+    ) -> Optional[tuple[Image.Image, Image.Image]]:
+        """Return the ``(L, alpha)`` planes for ``svg_path`` at ``output_width``."""
+        entry = self._entry(svg_path, output_width)
+        if entry is None:
+            return None
+        size = (entry["width"], entry["height"])
+        return self._plane(entry["l"], size), self._plane(entry["a"], size)
+
+    def faded_alpha(
+        self, svg_path: Path, output_width: int, alpha_percent: int
+    ) -> Optional[Image.Image]:
+        entry = self._entry(svg_path, output_width, count=False)
+        if entry is None:
+            return None
+        offset = entry["faded"].get(str(alpha_percent))
+        if offset is None:
+            return None
+        return self._plane(offset, (entry["width"], entry["height"]))
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "entries": len(self._entries),
+                "size_bytes": len(self._map),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+    def _entry(self, svg_path: Path, output_width: int, *, count: bool = True) -> Optional[dict]:
+        try:
+            digest = self._digest(svg_path)
+        except OSError:
+            return None
+        entry = self._entries.get(f"{digest}:{output_width}")
+        if count:
+            with self._lock:
+                if entry is None:
+                    self._misses += 1
+                else:
+                    self._hits += 1
+        return entry
+
+    def _digest(self, svg_path: Path) -> str:
+        stat = svg_path.stat()
+        key = (str(svg_path), stat.st_mtime_ns, stat.st_size)
+        digest = self._digests.get(key)
+        if digest is None:
+            digest = svg_digest(svg_path)
+            self._digests[key] = digest
+        return digest
+
+    def _plane(self, offset: int, size: tuple[int, int]) -> Image.Image:
+        start = self._data_offset + offset
+        view = memoryview(self._map)[start : start + size[0] * size[1]]
+        # Pillow accepts any buffer here; its stubs only list bytes and arrays.
+        return Image.frombuffer("L", size, view, "raw", "L", 0, 1)  # type: ignore[arg-type]
+
+
+_PACK: Optional[SymbolPack] = None
+_PACK_LOADED = False
+_PACK_LOCK = threading.Lock()
+
+
+def default_pack() -> Optional[SymbolPack]:
+    """Return the process-wide pack, opening it on first use."""
+    global _PACK, _PACK_LOADED
+    if _PACK_LOADED:
+        return _PACK
+    with _PACK_LOCK:
+        if not _PACK_LOADED:
+            _PACK = SymbolPack.open(default_pack_path())
+            _PACK_LOADED = True
+    return _PACK
+
+
+def reset_default_pack() -> None:
+    """Forget the process-wide pack so the next lookup reopens it."""
+    global _PACK, _PACK_LOADED
+    with _PACK_LOCK:
+        _PACK = None
+        _PACK_LOADED = False
+
+
+def pack_stats() -> dict[str, object]:
+    pack = default_pack()
+    if pack is None:
+        return {"path": str(default_pack_path()), "entries": 0, "loaded": False}
+    return {**pack.stats(), "loaded": True}
+
+
+def build_pack(
+    *,
+    directory: Path,
+    layouts: Iterable[SymbolLayout],
+    output: Path,
+    rasterize: Rasterizer,
+) -> dict[str, int]:
+    """Rasterise every SVG in ``directory`` for ``layouts`` and write ``output``.
+
+    Sizes mirror ``helper.draw_background_symbol``: the symbol is rendered at
+    the canvas width and, when that is too tall, again at the width that fits
+    the canvas height. Faded alpha planes are stored for the final size only.
+    """
+    layouts = list(layouts)
+    planned: dict[tuple[Path, int], set[int]] = {}
+    for svg_path in sorted(directory.glob("*.svg")):
+        for layout in layouts:
+            width = layout.canvas_width
+            planned.setdefault((svg_path, width), set())
+            height = rasterize(svg_path, width).height
+            if height > layout.canvas_height:
+                scale = layout.canvas_height / float(height)
+                width = max(1, int(round(width * scale)))
+                planned.setdefault((svg_path, width), set())
+            planned[(svg_path, width)].add(layout.alpha_percent)
+
+    entries: dict[str, dict] = {}
+    blobs: list[bytes] = []
+    offset = 0
+
+    def append(plane: Image.Image) -> int:
+        nonlocal offset
+        start = offset
+        data = plane.tobytes()
+        blobs.append(data)
+        offset += len(data)
+        return start
+
+    for (svg_path, width), alpha_levels in planned.items():
+        symbol = rasterize(svg_path, width)
+        alpha = symbol.getchannel("A")
+        entries[f"{svg_digest(svg_path)}:{width}"] = {
+            "symbol": svg_path.stem,
+            "width": symbol.width,
+            "height": symbol.height,
+            "l": append(symbol.convert("L")),
+            "a": append(alpha),
+            "faded": {
+                str(alpha_percent): append(fade_alpha(alpha, alpha_percent))
+                for alpha_percent in sorted(alpha_levels)
+            },
+        }
+
+    index = json.dumps({"version": 1, "entries": entries}, sort_keys=True).encode("utf-8")
+    header = _HEADER.pack(_MAGIC, len(index)) + index
+    padding = b"\0" * (_aligned(len(header)) - len(header))
+    temporary = output.with_suffix(output.suffix + ".tmp")
+    with temporary.open("wb") as handle:
+        handle.write(header + padding)
+        for blob in blobs:
+            handle.write(blob)
+    temporary.replace(output)
+    return {"entries": len(entries), "size_bytes": len(header) + len(padding) + offset}
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+__all__ = [
+    "PACK_FILENAME",
+    "SymbolPack",
+    "build_pack",
+    "default_pack",
+    "default_pack_path",
+    "fade_alpha",
+    "pack_stats",
+    "reset_default_pack",
+    "svg_digest",
+]
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    from printer_service import label_templates
+    from printer_service.label_templates import helper
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--output", type=Path, default=default_pack_path())
+    parser.add_argument("--directory", type=Path, default=helper.svg_symbol_directory())
+    args = parser.parse_args(argv)
+
+    layouts = sorted(
+        {
+            layout
+            for template in label_templates.all_templates()
+            for layout in template.symbol_layouts()
+        }
+    )
+    summary = build_pack(
+        directory=args.directory,
+        layouts=layouts,
+        output=args.output,
+        rasterize=lambda path, width: helper.render_svg_symbol(path=path, output_width=width),
+    )
+    print(json.dumps({"output": str(args.output), **summary}))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
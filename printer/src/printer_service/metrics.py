@@ -0,0 +1,391 @@
+"""In-process Prometheus metrics served as text from ``GET /metrics``.
+
+Counters and histograms live in a module-level :data:`REGISTRY`. Each label
+combination owns its own small lock, so concurrent Werkzeug request threads only
+contend when they update the very same series, and the registry lock is taken
+only the first time a label combination is seen. Values that already exist
+elsewhere (queue depth, cache counters) are not duplicated here; the route reads
+them at scrape time and passes them in as :class:`Sample` families.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Generic, Iterable, Self, Sequence, TypeVar
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; spans a cached render (a few ms) up to a slow printer round-trip.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+@dataclass(frozen=True)
+class Sample:
+    """One value of a scrape-time metric family."""
+
+    labels: tuple[tuple[str, str], ...]
+    value: float
+
+
+@dataclass(frozen=True)
+class Family:
+    """A metric family computed at scrape time rather than recorded by the registry."""
+
+    name: str
+    kind: str
+    help: str
+    samples: Sequence[Sample]
+
+
+class _CounterSeries:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+
+class _HistogramSeries:
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self._lock = threading.Lock()
+        self._buckets = buckets
+        # One slot per bucket plus the +Inf overflow, stored non-cumulatively.
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started)
+
+    def snapshot(self) -> tuple[list[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+    def add(self, counts: Sequence[int], total: float) -> None:
+        if len(counts) != len(self._counts):
+            return
+        with self._lock:
+            for index, count in enumerate(counts):
+                self._counts[index] += int(count)
+            self._sum += total
+
+
+_S = TypeVar("_S", _CounterSeries, _HistogramSeries)
+
+
+class _Metric(ABC, Generic[_S]):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series: dict[tuple[str, ...], _S] = {}
+
+    def labels(self, *values: object) -> _S:
+        key = tuple(str(value) for value in values)
+        series = self._series.get(key)
+        if series is not None:
+            return series
+        return self._create(key)
+
+    def _create(self, values: tuple[str, ...]) -> _S:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}.")
+        with self._lock:
+            series = self._series.get(values)
+            if series is None:
+                series = self._new_series()
+                self._series[values] = series
+        return series
+
+    @abstractmethod
+    def _new_series(self) -> _S:
+        """Create the series for a label combination seen for the first time."""
+
+    @abstractmethod
+    def empty_copy(self) -> Self:
+        """Return a metric with the same definition and no series."""
+
+    def _items(self) -> list[tuple[tuple[str, ...], _S]]:
+        with self._lock:
+            return sorted(self._series.items())
+
+    def snapshot(self) -> list[list[object]]:
+        """Return every series as ``[label values, *data]`` for :meth:`merge`."""
+        return [[list(values)] + self._dump(series) for values, series in self._items()]
+
+    def merge(self, entries: Iterable[Sequence[object]]) -> None:
+        """Add the series of another process's :meth:`snapshot` to this metric."""
+        for values, *data in entries:
+            if isinstance(values, Sequence) and len(values) == len(self.labelnames):
+                self._load(self.labels(*values), data)
+
+    @abstractmethod
+    def _dump(self, series: _S) -> list[object]: ...
+
+    @abstractmethod
+    def _load(self, series: _S, data: Sequence[object]) -> None: ...
+
+    def clear(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Return the exposition lines of every series, without HELP and TYPE."""
+
+
+class Counter(_Metric[_CounterSeries]):
+    kind = "counter"
+
+    def _new_series(self) -> _CounterSeries:
+        return _CounterSeries()
+
+    def empty_copy(self) -> Counter:
+        return Counter(self.name, self.help, self.labelnames)
+
+    def _dump(self, series: _CounterSeries) -> list[object]:
+        return [series.value]
+
+    def _load(self, series: _CounterSeries, data: Sequence[object]) -> None:
+        series.inc(_number(data[0]))
+
+    def render(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(zip(self.labelnames, values))} {_format_value(series.value)}"
+            for values, series in self._items()
+        ]
+
+
+class Histogram(_Metric[_HistogramSeries]):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str],
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self) -> _HistogramSeries:
+        return _HistogramSeries(self.buckets)
+
+    def empty_copy(self) -> Histogram:
+        return Histogram(self.name, self.help, self.labelnames, buckets=self.buckets)
+
+    def _dump(self, series: _HistogramSeries) -> list[object]:
+        counts, total = series.snapshot()
+        return [counts, total]
+
+    def _load(self, series: _HistogramSeries, data: Sequence[object]) -> None:
+        counts, total = data
+        if isinstance(counts, Sequence):
+            series.add([int(_number(count)) for count in counts], _number(total))
+
+    def render(self) -> list[str]:
+        lines: list[str] = []
+        for values, series in self._items():
+            counts, total = series.snapshot()
+            labels = list(zip(self.labelnames, values))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                bucket_labels = _format_labels([*labels, ("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = self._register(Counter(name, help, labelnames))
+        assert isinstance(metric, Counter)
+        return metric
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        *,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        metric = self._register(Histogram(name, help, labelnames, buckets=buckets))
+        assert isinstance(metric, Histogram)
+        return metric
+
+    def clear(self) -> None:
+        """Drop every recorded series (the metrics stay registered)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.clear()
+
+    def snapshot(self) -> dict[str, list[list[object]]]:
+        """Return every series by metric name, JSON-serialisable, for :meth:`merged`."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.snapshot() for metric in metrics}
+
+    def merged(self, snapshots: Iterable[Mapping[str, Iterable[Sequence[object]]]]) -> Registry:
+        """Return a copy of this registry with the series of ``snapshots`` added in.
+
+        Pre-fork workers each record into their own registry; the worker that
+        answers ``/metrics`` adds the other workers' snapshots so the scrape
+        covers every process.
+        """
+        merged = Registry()
+        with self._lock:
+            metrics = list(self._metrics.values())
+        pending = list(snapshots)
+        for metric in metrics:
+            copy = merged._register(metric.empty_copy())
+            copy.merge(metric.snapshot())
+            for snapshot in pending:
+                copy.merge(snapshot.get(metric.name, ()))
+        return merged
+
+    def exposition(self, extra: Iterable[Family] = ()) -> str:
+        """Render every metric plus ``extra`` in the Prometheus text format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.extend(_header(metric.name, metric.kind, metric.help))
+            lines.extend(metric.render())
+        for family in extra:
+            lines.extend(_header(family.name, family.kind, family.help))
+            lines.extend(
+                f"{family.name}{_format_labels(sample.labels)} {_format_value(sample.value)}"
+                for sample in family.samples
+            )
+        return "\n".join(lines) + "\n"
+
+    def _register(self, metric: Counter | Histogram) -> Counter | Histogram:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric '{metric.name}' is already registered differently.")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "printer_http_request_duration_seconds",
+    "Time spent handling HTTP requests.",
+    ("route", "method", "status"),
+)
+RENDER_SECONDS = REGISTRY.histogram(
+    "printer_label_render_seconds",
+    "Time spent rendering a label, excluding render cache hits.",
+    ("template",),
+)
+DISPATCH_SECONDS = REGISTRY.histogram(
+    "printer_dispatch_duration_seconds",
+    "Time spent sending rendered labels to a printer backend.",
+    ("backend",),
+)
+MONGO_OPERATION_SECONDS = REGISTRY.histogram(
+    "printer_mongo_operation_duration_seconds",
+    "Latency of MongoDB preset store operations.",
+    ("operation",),
+)
+MONGO_ERRORS = REGISTRY.counter(
+    "printer_mongo_operation_errors_total",
+    "MongoDB preset store operations that raised.",
+    ("operation",),
+)
+
+
+def cache_families(stats: dict[str, tuple[int, int]]) -> list[Family]:
+    """Build hit, miss and hit-ratio families from ``{cache: (hits, misses)}``."""
+    hits: list[Sample] = []
+    misses: list[Sample] = []
+    ratios: list[Sample] = []
+    for cache, (cache_hits, cache_misses) in sorted(stats.items()):
+        labels = (("cache", cache),)
+        lookups = cache_hits + cache_misses
+        hits.append(Sample(labels, cache_hits))
+        misses.append(Sample(labels, cache_misses))
+        ratios.append(Sample(labels, cache_hits / lookups if lookups else 0.0))
+    return [
+        Family("printer_cache_hits_total", "counter", "Cache lookups served from cache.", hits),
+        Family("printer_cache_misses_total", "counter", "Cache lookups that missed.", misses),
+        Family("printer_cache_hit_ratio", "gauge", "Hits divided by lookups.", ratios),
+    ]
+
+
+def _number(value: object) -> float:
+    return float(value) if isinstance(value, (int, float)) else 0.0
+
+
+def _header(name: str, kind: str, help: str) -> list[str]:
+    return [f"# HELP {name} {_escape(help, quote=False)}", f"# TYPE {name} {kind}"]
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    rendered = ",".join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return f"{{{rendered}}}" if rendered else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str, *, quote: bool = True) -> str:
+    escaped = value.replace("\\", "\\\\").replace("\n", "\\n")
+    return escaped.replace('"', '\\"') if quote else escaped
+
+
+__all__ = [
+    "CONTENT_TYPE",
+    "Counter",
+    "DISPATCH_SECONDS",
+    "Family",
+    "HTTP_REQUEST_SECONDS",
+    "Histogram",
+    "MONGO_ERRORS",
+    "MONGO_OPERATION_SECONDS",
+    "REGISTRY",
+    "RENDER_SECONDS",
+    "Registry",
+    "Sample",
+    "cache_families",
+]
@@ -1,11 +1,16 @@
 from __future__ import annotations
 
+import json
 import os
+import queue
 import re
 import socket
+import threading
 import time
+from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Callable, Optional, TypeVar, cast
 from urllib.parse import ParseResult, urlparse, urlunparse
 
 DEFAULT_DB = "smarthome"
@@ -18,6 +23,11 @@ MONGO_HOST_FALLBACKS = (
     "addon_mongodb",
     "mongodb",
 )
+DEFAULT_HEALTH_TTL_SECONDS = 5.0
+DEFAULT_HEALTH_INTERVAL_SECONDS = 2.0
+DEFAULT_CONNECT_STAGGER_SECONDS = 0.25
+
+_T = TypeVar("_T")
 
 
 @dataclass(frozen=True)
@@ -120,7 +130,170 @@ def load_mongo_configs() -> list[MongoConfig]:
     # Do not pre-resolve every fallback hostname here. Home Assistant DNS can
     # take seconds to reject each legacy alias, outside the health-check time
     # budget. Let the bounded driver connection try canonical-first candidates.
-    return [_build_mongo_config(url, source) for url in urls]
+    configs = [_build_mongo_config(url, source) for url in urls]
+    remembered = _remembered_host()
+    if remembered is None:
+        return configs
+    # The host that answered last time goes first; the rest keep their order.
+    return sorted(configs, key=lambda config: config.host != remembered)
+
+
+class MongoUnreachableError(ConnectionError):
+    """No candidate answered; ``config`` is the preferred candidate that failed."""
+
+    def __init__(self, config: MongoConfig, message: str) -> None:
+        super().__init__(message)
+        self.config = config
+
+
+def connect_first(
+    configs: Sequence[MongoConfig],
+    connect: Callable[[MongoConfig], _T],
+    *,
+    timeout_seconds: Optional[float] = None,
+    stagger_seconds: Optional[float] = None,
+    discard: Optional[Callable[[_T], object]] = None,
+) -> tuple[MongoConfig, _T]:
+    """Race ``connect`` across candidates and return the first that succeeds.
+
+    Candidates start in order, each ``stagger_seconds`` after the previous one
+    (``MONGO_CONNECT_STAGGER_MS``, default 250) or as soon as it fails, so a
+    dead first alias costs one stagger instead of a full timeout. Candidates
+    not started when one succeeds are skipped. Attempts already running cannot
+    be interrupted; ``connect`` must bound its own time, and ``discard``
+    receives anything they return after the race is decided. The winning host
+    is remembered for the next ``load_mongo_configs`` call. Raises
+    ``MongoUnreachableError`` with the error of the earliest candidate that
+    failed, or a timeout after ``timeout_seconds``.
+    """
+    if not configs:
+        raise ValueError("connect_first needs at least one candidate.")
+    if stagger_seconds is None:
+        stagger_seconds = _float_from_env("MONGO_CONNECT_STAGGER_MS", 250.0) / 1000
+    deadline = None if timeout_seconds is None else time.monotonic() + timeout_seconds
+    results: queue.Queue[tuple[int, Optional[_T], Optional[Exception]]] = queue.Queue()
+    decided = threading.Lock()
+    state = {"done": False}
+
+    def attempt(index: int) -> None:
+        try:
+            value = connect(configs[index])
+        except Exception as exc:
+            results.put((index, None, exc))
+            return
+        with decided:
+            late = state["done"]
+            if not late:
+                results.put((index, value, None))
+        if late and discard is not None:
+            discard(value)
+
+    def start(index: int) -> None:
+        threading.Thread(
+            target=attempt, args=(index,), name=f"mongo-connect-{index}", daemon=True
+        ).start()
+
+    errors: dict[int, Exception] = {}
+    started = 0
+    next_start = 0.0
+    winner: Optional[tuple[MongoConfig, _T]] = None
+    while len(errors) < len(configs):
+        now = time.monotonic()
+        if started < len(configs) and now >= next_start:
+            start(started)
+            started += 1
+            next_start = now + stagger_seconds
+        waits = [] if deadline is None else [deadline - now]
+        if started < len(configs):
+            waits.append(next_start - now)
+        wait = max(min(waits), 0.0) if waits else None
+        try:
+            index, value, error = results.get(timeout=wait)
+        except queue.Empty:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            continue
+        if error is None:
+            winner = configs[index], cast("_T", value)
+            break
+        errors[index] = error
+        # A failure starts the next candidate now rather than after the stagger.
+        next_start = time.monotonic()
+
+    with decided:
+        state["done"] = True
+    # Successes queued while the loop was deciding lose to the winner.
+    while True:
+        try:
+            _, late_value, late_error = results.get_nowait()
+        except queue.Empty:
+            break
+        if late_error is None and discard is not None:
+            discard(cast("_T", late_value))
+
+    if winner is not None:
+        _remember_host(winner[0])
+        return winner
+    if errors:
+        index = min(errors)
+        failed = configs[index]
+        raise MongoUnreachableError(failed, _redacted_error(errors[index], failed)) from errors[
+            index
+        ]
+    raise MongoUnreachableError(
+        configs[0], f"No MongoDB host answered within {timeout_seconds:.2f}s."
+    )
+
+
+# Host cache file contents by path, so health probes do not rewrite it.
+_REMEMBERED: dict[str, dict[str, str]] = {}
+
+
+def _host_cache_path() -> Optional[str]:
+    raw = os.getenv("MONGO_HOST_CACHE_PATH", "").strip()
+    return raw or None
+
+
+def _configured_key() -> Optional[str]:
+    # The configured URL without its password; a changed URL forgets the host.
+    raw, _ = _load_mongo_url()
+    return _redact_mongo_url(urlparse(raw)) if raw else None
+
+
+def _remembered_host() -> Optional[str]:
+    """Host that won the last race for the configured URL, if one was recorded."""
+    path = _host_cache_path()
+    if path is None:
+        return None
+    if path not in _REMEMBERED:
+        try:
+            with open(path, encoding="utf-8") as handle:
+                record = json.load(handle)
+        except OSError, ValueError:
+            record = None
+        _REMEMBERED[path] = record if isinstance(record, dict) else {}
+    record = _REMEMBERED[path]
+    if not record or record.get("configured") != _configured_key():
+        return None
+    return record.get("host") or None
+
+
+def _remember_host(winner: MongoConfig) -> None:
+    path = _host_cache_path()
+    configured = _configured_key()
+    if path is None or configured is None:
+        return
+    record = {"configured": configured, "host": winner.host}
+    if _REMEMBERED.get(path) == record:
+        return
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(record, handle)
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+    _REMEMBERED[path] = record
 
 
 def _tcp_ping(host: str, port: int, timeout_seconds: float) -> None:
@@ -146,7 +319,24 @@ def _driver_ping(config: MongoConfig, timeout_seconds: float) -> None:
         client.close()
 
 
-def mongo_health(timeout_seconds: float = 1.0) -> dict[str, object]:
+# The shared preset store's client and the config it connected with. Pinging
+# it reuses a pooled connection instead of opening a new client per probe.
+PooledPing = tuple[MongoConfig, Callable[[], object]]
+
+
+def mongo_health(
+    timeout_seconds: float = 1.0, *, pooled: Optional[PooledPing] = None
+) -> dict[str, object]:
+    if pooled is not None:
+        config, ping = pooled
+        start = time.monotonic()
+        try:
+            ping()
+            error = None
+        except Exception as exc:
+            error = _redacted_error(exc, config)
+        return _health_status(config, error is None, _elapsed_ms(start), error)
+
     try:
         configs = load_mongo_configs()
     except ValueError as exc:
@@ -164,33 +354,32 @@ def mongo_health(timeout_seconds: float = 1.0) -> dict[str, object]:
         }
 
     start = time.monotonic()
-    error: Optional[str] = None
-    ok = False
-    config = configs[0]
-    first_error: Optional[str] = None
-    first_error_config = configs[0]
-    for candidate in configs:
+
+    def probe(candidate: MongoConfig) -> None:
         remaining_seconds = timeout_seconds - (time.monotonic() - start)
-        if remaining_seconds <= 0:
-            break
-        config = candidate
-        try:
-            _driver_ping(candidate, remaining_seconds)
-            ok = True
-            error = None
-            break
-        except Exception as exc:
-            ok = False
-            error = str(exc)
-            if candidate.url and error:
-                error = error.replace(candidate.url, candidate.redacted_url)
-            if first_error is None:
-                first_error = error
-                first_error_config = candidate
-    if not ok and first_error is not None:
-        error = first_error
-        config = first_error_config
-    latency_ms = int((time.monotonic() - start) * 1000)
+        _driver_ping(candidate, max(remaining_seconds, 0.001))
+
+    try:
+        config, _ = connect_first(configs, probe, timeout_seconds=timeout_seconds)
+    except MongoUnreachableError as exc:
+        return _health_status(exc.config, False, _elapsed_ms(start), str(exc))
+    return _health_status(config, True, _elapsed_ms(start), None)
+
+
+def _redacted_error(exc: Exception, config: MongoConfig) -> str:
+    error = str(exc)
+    if config.url and error:
+        error = error.replace(config.url, config.redacted_url)
+    return error
+
+
+def _elapsed_ms(start: float) -> int:
+    return int((time.monotonic() - start) * 1000)
+
+
+def _health_status(
+    config: MongoConfig, ok: bool, latency_ms: int, error: Optional[str]
+) -> dict[str, object]:
     database = config.database or (DEFAULT_DB if config.source == "default:local" else None)
     return {
         "configured": True,
@@ -205,4 +394,122 @@ def mongo_health(timeout_seconds: float = 1.0) -> dict[str, object]:
     }
 
 
-__all__ = ["MongoConfig", "load_mongo_config", "load_mongo_configs", "mongo_health"]
+class MongoHealthMonitor:
+    """Answers health checks from the last probe instead of pinging per request.
+
+    ``status`` returns the last result of ``probe`` while it is younger than
+    ``ttl_seconds`` and probes again otherwise; concurrent callers share one
+    probe. ``start`` runs a daemon thread that probes every
+    ``interval_seconds``, so with an interval below the TTL every check is
+    served from memory. ``latency_ms`` stays the latency of the real ping;
+    ``checked_at`` and ``age_ms`` say how old that ping is.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], dict[str, object]],
+        *,
+        ttl_seconds: float = DEFAULT_HEALTH_TTL_SECONDS,
+        interval_seconds: float = DEFAULT_HEALTH_INTERVAL_SECONDS,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.interval_seconds = interval_seconds
+        self._probe = probe
+        self._lock = threading.Lock()
+        self._probe_lock = threading.Lock()
+        self._status: Optional[dict[str, object]] = None
+        self._checked = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_env(cls, probe: Callable[[], dict[str, object]]) -> "MongoHealthMonitor":
+        """Read ``MONGO_HEALTH_TTL_SECONDS`` and ``MONGO_HEALTH_INTERVAL_SECONDS``; ``0`` disables each."""
+        return cls(
+            probe,
+            ttl_seconds=_float_from_env("MONGO_HEALTH_TTL_SECONDS", DEFAULT_HEALTH_TTL_SECONDS),
+            interval_seconds=_float_from_env(
+                "MONGO_HEALTH_INTERVAL_SECONDS", DEFAULT_HEALTH_INTERVAL_SECONDS
+            ),
+        )
+
+    def status(self) -> dict[str, object]:
+        cached = self._fresh()
+        if cached is not None:
+            return cached
+        with self._probe_lock:
+            # Another caller may have probed while this one waited for the lock.
+            cached = self._fresh()
+            if cached is not None:
+                return cached
+            return self.refresh()
+
+    def refresh(self) -> dict[str, object]:
+        """Probe now and remember the result."""
+        status = dict(self._probe())
+        checked = time.monotonic()
+        status["checked_at"] = datetime.now(timezone.utc).isoformat()
+        with self._lock:
+            self._status, self._checked = status, checked
+        return {**status, "age_ms": 0}
+
+    def start(self) -> None:
+        """Start the background prober unless it is running or disabled."""
+        if self.interval_seconds <= 0:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="mongo-health-prober", daemon=True
+            )
+            self._thread.start()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout)
+
+    def _fresh(self) -> Optional[dict[str, object]]:
+        with self._lock:
+            status, checked = self._status, self._checked
+        if status is None:
+            return None
+        age = time.monotonic() - checked
+        if age >= self.ttl_seconds:
+            return None
+        return {**status, "age_ms": int(age * 1000)}
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                with self._probe_lock:
+                    self.refresh()
+            except Exception:
+                # The next status() call probes again and surfaces the error.
+                pass
+
+
+def _float_from_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+__all__ = [
+    "MongoConfig",
+    "MongoHealthMonitor",
+    "MongoUnreachableError",
+    "PooledPing",
+    "connect_first",
+    "load_mongo_config",
+    "load_mongo_configs",
+    "mongo_health",
+]
@@ -4,16 +4,21 @@ import base64
 import hashlib
 import json
 import os
+import sqlite3
 import threading
 import time
-from collections.abc import Mapping, Sequence
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import TYPE_CHECKING, Optional
+from functools import wraps
+from typing import TYPE_CHECKING, Callable, Optional, ParamSpec, TypeVar
 from urllib.parse import urlencode
 
 from .label_templates import TemplateFormValue
-from .mongo import DEFAULT_DB, MongoConfig, load_mongo_configs
+from .metrics import MONGO_ERRORS, MONGO_OPERATION_SECONDS
+from .mongo import DEFAULT_DB, MongoConfig, PooledPing, connect_first, load_mongo_configs
 
 if TYPE_CHECKING:
     from pymongo import MongoClient
@@ -22,6 +27,30 @@ if TYPE_CHECKING:
 
 _CONTROL_PARAM_KEYS = {"tpl", "template", "template_slug"}
 
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+
+def _mongo_operation(name: str) -> Callable[[Callable[_P, _T]], Callable[_P, _T]]:
+    """Record latency and errors of a store method under ``operation=name``."""
+
+    def decorate(method: Callable[_P, _T]) -> Callable[_P, _T]:
+        @wraps(method)
+        def timed(*args: _P.args, **kwargs: _P.kwargs) -> _T:
+            try:
+                with MONGO_OPERATION_SECONDS.labels(name).time():
+                    return method(*args, **kwargs)
+            except ValueError:
+                # Rejected input, not a database failure.
+                raise
+            except Exception:
+                MONGO_ERRORS.labels(name).inc()
+                raise
+
+        return timed
+
+    return decorate
+
 
 @dataclass(frozen=True)
 class Preset:
@@ -53,10 +82,429 @@ class Preset:
         )
 
 
-class PresetStore:
+PRESET_FIELDS = (
+    "slug",
+    "name",
+    "template",
+    "query",
+    "params",
+    "created_at",
+    "updated_at",
+    "print_count",
+)
+DEFAULT_PRESET_PAGE_SIZE = 200
+
+_SORT_FIELDS = {
+    "name": "name",
+    "slug": "slug",
+    "template": "template",
+    "created": "created_at",
+    "created_at": "created_at",
+    "updated": "updated_at",
+    "updated_at": "updated_at",
+    "prints": "print_count",
+    "print_count": "print_count",
+}
+_DESCENDING_BY_DEFAULT = {"created_at", "updated_at", "print_count"}
+
+
+@dataclass(frozen=True)
+class PresetPage:
+    presets: list[Preset]
+    # Pass as ``after`` to fetch the next page; ``None`` on the last page.
+    next_cursor: Optional[str] = None
+
+
+DEFAULT_PRESET_CACHE_TTL_SECONDS = 30.0
+DEFAULT_PRESET_CACHE_MAX_ENTRIES = 5000
+DEFAULT_PRINT_FLUSH_SECONDS = 2.0
+DEFAULT_SQLITE_PATH = "presets.sqlite3"
+# Open SQLite connections per store and process; a query holds one only while it runs.
+DEFAULT_SQLITE_CONNECTIONS = 4
+DEFAULT_REPLICATION_SECONDS = 5.0
+# Bump when the index set below changes; stores at this version skip creation.
+PRESET_INDEX_VERSION = 2
+
+
+class PresetCache:
+    """In-memory snapshot of every preset document, keyed by slug.
+
+    Existence checks and ``/p/<slug>`` redirects read the snapshot instead of
+    issuing a ``find_one`` each; only slugs missing from it are looked up in the
+    store. The snapshot is reloaded with one ``find`` once it is ``ttl_seconds``
+    old, and local upserts and deletes update it in place, so only updates and
+    deletes from other processes can be up to ``ttl_seconds`` stale.
+    While one thread reloads, others keep reading the previous snapshot.
+    Collections larger than ``max_entries`` are not cached at all.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = DEFAULT_PRESET_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_PRESET_CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._docs: Optional[dict[str, Mapping[str, object]]] = None
+        self._loaded_at = 0.0
+        self._oversized_at: Optional[float] = None
+        # Local writes made while a reload is in flight, replayed onto its result.
+        self._pending_writes: Optional[dict[str, Optional[Mapping[str, object]]]] = None
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["PresetCache"]:
+        """Return a cache configured by ``PRESET_CACHE_TTL_SECONDS``; ``0`` disables it."""
+        ttl_seconds = _float_from_env("PRESET_CACHE_TTL_SECONDS", DEFAULT_PRESET_CACHE_TTL_SECONDS)
+        if ttl_seconds <= 0:
+            return None
+        return cls(ttl_seconds=ttl_seconds)
+
+    def documents(
+        self, load: Callable[[], Iterable[Mapping[str, object]]]
+    ) -> Optional[Mapping[str, Mapping[str, object]]]:
+        """Return the snapshot, reloading it with ``load`` when it has expired.
+
+        Returns ``None`` when the collection is too large to cache; callers then
+        query Mongo directly.
+        """
+        with self._lock:
+            if self._oversized_at is not None:
+                if self._clock() - self._oversized_at < self.ttl_seconds:
+                    return None
+                self._oversized_at = None
+            stale = self._docs
+            if stale is not None and self._clock() - self._loaded_at < self.ttl_seconds:
+                self._hits += 1
+                return stale
+        if stale is not None and not self._refresh_lock.acquire(blocking=False):
+            # Another thread is already reloading; the old snapshot stays valid meanwhile.
+            with self._lock:
+                self._hits += 1
+            return stale
+        if stale is None:
+            self._refresh_lock.acquire()
+        try:
+            with self._lock:
+                current = self._docs
+                if current is not None and self._clock() - self._loaded_at < self.ttl_seconds:
+                    self._hits += 1
+                    return current
+                self._misses += 1
+                self._pending_writes = {}
+            loaded: dict[str, Mapping[str, object]] = {}
+            for doc in load():
+                slug = str(doc.get("slug") or "")
+                if slug:
+                    loaded[slug] = doc
+            with self._lock:
+                for slug, written in (self._pending_writes or {}).items():
+                    if written is None:
+                        loaded.pop(slug, None)
+                    else:
+                        loaded[slug] = written
+                self._pending_writes = None
+                if len(loaded) > self.max_entries:
+                    self._docs = None
+                    self._oversized_at = self._clock()
+                    return None
+                self._docs = loaded
+                self._loaded_at = self._clock()
+                return loaded
+        finally:
+            with self._lock:
+                self._pending_writes = None
+            self._refresh_lock.release()
+
+    def put(self, doc: Mapping[str, object]) -> None:
+        slug = str(doc.get("slug") or "")
+        if not slug:
+            return
+        with self._lock:
+            if self._docs is not None:
+                self._docs[slug] = doc
+            if self._pending_writes is not None:
+                self._pending_writes[slug] = doc
+
+    def discard(self, slug: str) -> None:
+        with self._lock:
+            if self._docs is not None:
+                self._docs.pop(slug, None)
+            if self._pending_writes is not None:
+                self._pending_writes[slug] = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs = None
+            self._oversized_at = None
+
+    def stats(self) -> dict[str, int | float | None]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            age = self._clock() - self._loaded_at if self._docs is not None else None
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "entries": len(self._docs) if self._docs is not None else 0,
+                "age_seconds": round(age, 3) if age is not None else None,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_ratio": round(self._hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+class CoalescingBuffer:
+    """Sums ``{key: count}`` increments and hands them to ``flush`` behind the caller.
+
+    ``add`` only bumps an in-memory counter. A daemon thread, started on first
+    use, passes everything buffered to ``flush`` every ``interval_seconds`` as
+    one mapping, so many increments of the same keys become a single write.
+    Increments from a failed flush are kept for the next one. ``close`` stops
+    the thread and flushes what is left; call it on shutdown.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[Mapping[str, int]], object],
+        *,
+        interval_seconds: float,
+        thread_name: str,
+    ) -> None:
+        self.interval_seconds = interval_seconds
+        self._flush = flush
+        self._thread_name = thread_name
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._pending: dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._flushes = 0
+        self._flushed = 0
+        self._errors = 0
+
+    def add(self, slug: str, count: int = 1) -> None:
+        if count <= 0:
+            return
+        with self._lock:
+            self._pending[slug] = self._pending.get(slug, 0) + count
+            if self._thread is None and not self._stop.is_set():
+                self._thread = threading.Thread(
+                    target=self._run, name=self._thread_name, daemon=True
+                )
+                self._thread.start()
+
+    def flush(self) -> int:
+        """Write everything buffered now; return the sum of the increments written."""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+            try:
+                self._flush(pending)
+            except Exception:
+                with self._lock:
+                    self._errors += 1
+                    for slug, count in pending.items():
+                        self._pending[slug] = self._pending.get(slug, 0) + count
+                raise
+            flushed = sum(pending.values())
+            with self._lock:
+                self._flushes += 1
+                self._flushed += flushed
+            return flushed
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "pending": sum(self._pending.values()),
+                "flushes": self._flushes,
+                "flushed": self._flushed,
+                "errors": self._errors,
+            }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.flush()
+            except Exception:
+                # Kept for the next attempt; the error count shows up in stats().
+                pass
+
+
+class PrintCountBuffer(CoalescingBuffer):
+    """Preset print increments, written with one ``bulk_write`` per flush.
+
+    A batch of fifty labels becomes a single update instead of fifty.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[Mapping[str, int]], object],
+        *,
+        interval_seconds: float = DEFAULT_PRINT_FLUSH_SECONDS,
+    ) -> None:
+        super().__init__(
+            flush, interval_seconds=interval_seconds, thread_name="preset-print-counts"
+        )
+
+    @classmethod
+    def from_env(cls, flush: Callable[[Mapping[str, int]], object]) -> Optional["PrintCountBuffer"]:
+        """Return a buffer flushed every ``PRESET_PRINT_FLUSH_SECONDS``; ``0`` disables it."""
+        interval = _float_from_env("PRESET_PRINT_FLUSH_SECONDS", DEFAULT_PRINT_FLUSH_SECONDS)
+        if interval <= 0:
+            return None
+        return cls(flush, interval_seconds=interval)
+
+    def stats(self) -> dict[str, int]:
+        stats = super().stats()
+        stats["flushed_prints"] = stats.pop("flushed")
+        return stats
+
+
+class PresetBackend(ABC):
+    """Storage interface of the preset stores.
+
+    Slug hashing, normalisation and cursors live outside the stores. Each backend
+    implements the abstract storage methods; lookups through the snapshot cache
+    and buffered print counts are shared here.
+    """
+
+    # Local stores answer from disk, so the shared store skips the snapshot
+    # cache and the print count buffer for them.
+    is_local = False
+    # Set on the shared store by ``get_cached_store``; standalone stores hit storage.
+    _cache: Optional[PresetCache] = None
+    _print_counts: Optional[PrintCountBuffer] = None
+    _cached = False
+
+    @abstractmethod
+    def close(self, *, force: bool = False) -> None:
+        """Release the store; the shared store only closes with ``force``."""
+
+    @abstractmethod
+    def ensure_indexes(self) -> None: ...
+
+    @abstractmethod
+    def list_presets(
+        self,
+        *,
+        sort_by: str = "created",
+        direction: Optional[str] = None,
+        limit: int = DEFAULT_PRESET_PAGE_SIZE,
+        after: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> PresetPage: ...
+
+    @abstractmethod
+    def presets_version(self) -> str:
+        """Return a token that changes whenever a preset is saved, deleted or printed."""
+
+    @abstractmethod
+    def upsert_preset(
+        self,
+        name: str,
+        template_slug: str,
+        params: Mapping[str, TemplateFormValue],
+    ) -> Preset: ...
+
+    @abstractmethod
+    def record_print(self, slug: str) -> Optional[Preset]: ...
+
+    @abstractmethod
+    def record_prints(self, counts: Mapping[str, int]) -> None:
+        """Apply ``{slug: count}`` increments in one write."""
+
+    @abstractmethod
+    def delete_preset(self, slug: str) -> bool: ...
+
+    @abstractmethod
+    def _find_by_slug(self, slug: str) -> Optional[Preset]: ...
+
+    @abstractmethod
+    def _find_slug(self, slug: str) -> Optional[str]: ...
+
+    @abstractmethod
+    def _load_documents(self) -> list[Mapping[str, object]]: ...
+
+    def pooled_ping(self) -> Optional[PooledPing]:
+        """Return the MongoDB config and a ping over this store's client, if it has one."""
+        return None
+
+    def cache_stats(self) -> dict[str, object]:
+        return {
+            "presets": self._cache.stats() if self._cache is not None else None,
+            "print_counts": self._print_counts.stats() if self._print_counts is not None else None,
+        }
+
+    def background_writers(self) -> list[CoalescingBuffer | MongoReplicator]:
+        """Writers holding changes not yet stored; ``flush_cached_store`` closes them."""
+        return [self._print_counts] if self._print_counts is not None else []
+
+    def find_by_slug(self, slug: str) -> Optional[Preset]:
+        normalized = str(slug or "").strip()
+        if not normalized:
+            return None
+        documents = self._cached_documents()
+        if documents is not None:
+            doc = documents.get(normalized)
+            if doc:
+                return Preset.from_document(doc)
+        # A miss may be a preset another process saved since the snapshot loaded.
+        return self._find_by_slug(normalized)
+
+    def find_slug_for_params(
+        self, template_slug: str, params: Mapping[str, TemplateFormValue]
+    ) -> Optional[str]:
+        canonical_query = canonical_query_string(template_slug, params)
+        slug = slug_from_query(canonical_query)
+        documents = self._cached_documents()
+        if documents is not None and slug in documents:
+            return slug
+        return self._find_slug(slug)
+
+    def _cached_documents(self) -> Optional[Mapping[str, Mapping[str, object]]]:
+        if self._cache is None:
+            return None
+        return self._cache.documents(self._load_documents)
+
+    def record_print_later(self, slug: str, count: int = 1) -> None:
+        """Count ``count`` prints of ``slug`` without waiting on storage when buffered."""
+        normalized = str(slug or "").strip()
+        if not normalized or count <= 0:
+            return
+        if self._print_counts is not None:
+            self._print_counts.add(normalized, count)
+            return
+        self.record_prints({normalized: count})
+
+    def flush_prints(self) -> None:
+        if self._print_counts is not None:
+            self._print_counts.flush()
+
+
+class PresetStore(PresetBackend):
+    """Preset storage in the MongoDB ``presets`` collection."""
+
+    # The candidate ``from_env`` connected to, reported by health checks.
+    _config: Optional[MongoConfig] = None
+
     def __init__(self, client: "MongoClient", database: str) -> None:
         self._client = client
         self._collection: Collection = client[database]["presets"]
+        self._meta_collection: Collection = client[database]["preset_store_meta"]
         self._cached = False
 
     @classmethod
@@ -65,9 +513,9 @@ class PresetStore:
         if not configs:
             return None
         MongoClient = _require_pymongo()
-        last_error: Optional[Exception] = None
         timeout_ms = _mongo_timeout_ms()
-        for config in configs:
+
+        def connect(config: MongoConfig) -> "PresetStore":
             client = MongoClient(
                 config.url,
                 connectTimeoutMS=timeout_ms,
@@ -75,15 +523,16 @@ class PresetStore:
                 socketTimeoutMS=timeout_ms,
             )
             store = cls(client, _resolve_database(config))
+            store._config = config
             try:
                 store.ensure_indexes()
-                return store
-            except Exception as exc:
-                last_error = exc
+            except Exception:
                 client.close()
-        if last_error is not None:
-            raise last_error
-        return None
+                raise
+            return store
+
+        _, store = connect_first(configs, connect, discard=lambda late: late._client.close())
+        return store
 
     @property
     def collection(self) -> Collection:
@@ -92,81 +541,123 @@ class PresetStore:
     def close(self, *, force: bool = False) -> None:
         if self._cached and not force:
             return
+        if self._print_counts is not None:
+            self._print_counts.close(timeout=5)
         self._client.close()
 
+    def pooled_ping(self) -> Optional[PooledPing]:
+        if self._config is None:
+            return None
+        return self._config, self.ping
+
+    @_mongo_operation("ping")
+    def ping(self) -> None:
+        self._client.admin.command("ping")
+
+    @_mongo_operation("ensure_indexes")
     def ensure_indexes(self) -> None:
-        self._collection.create_index("slug", unique=True)
-        self._collection.create_index("name")
-        self._collection.create_index("template")
-        self._collection.create_index("created_at")
-        self._collection.create_index("updated_at")
-        self._collection.create_index("print_count")
+        """Create the preset indexes once per ``PRESET_INDEX_VERSION``.
+
+        The version lives in the ``indexes`` document of ``preset_store_meta``,
+        so a store that is already current costs one ``find_one``.
+        """
+        from pymongo import IndexModel
 
+        recorded = self._meta_collection.find_one({"_id": "indexes"})
+        if recorded is not None and int(recorded.get("version") or 0) >= PRESET_INDEX_VERSION:
+            return
+        self._collection.create_indexes(
+            [
+                IndexModel("slug", unique=True),
+                # Every list sort breaks ties on slug, so keyset pages need both keys.
+                *(
+                    IndexModel([(field, 1), ("slug", 1)])
+                    for field in ("name", "template", "created_at", "updated_at", "print_count")
+                ),
+                # Most printed presets of one template.
+                IndexModel([("template", 1), ("print_count", -1)]),
+                IndexModel("last_printed_at"),
+            ]
+        )
+        self._meta_collection.update_one(
+            {"_id": "indexes"},
+            {"$set": {"version": PRESET_INDEX_VERSION, "updated_at": _utc_now_iso()}},
+            upsert=True,
+        )
+
+    @_mongo_operation("list_presets")
     def list_presets(
         self,
         *,
         sort_by: str = "created",
         direction: Optional[str] = None,
-        limit: int = 200,
-    ) -> list[Preset]:
-        normalized_sort = str(sort_by or "").strip().lower()
-        sort_fields = {
-            "name": "name",
-            "slug": "slug",
-            "template": "template",
-            "created": "created_at",
-            "created_at": "created_at",
-            "updated": "updated_at",
-            "updated_at": "updated_at",
-            "prints": "print_count",
-            "print_count": "print_count",
-        }
-        sort_key = sort_fields.get(normalized_sort, "created_at")
-        normalized_direction = str(direction or "").strip().lower()
-        if normalized_direction not in {"asc", "desc"}:
-            normalized_direction = (
-                "desc" if sort_key in {"created_at", "updated_at", "print_count"} else "asc"
-            )
-        sort_dir = -1 if normalized_direction == "desc" else 1
-        cursor = self._collection.find({}).sort(sort_key, sort_dir).limit(limit)
-        return [Preset.from_document(doc) for doc in cursor]
+        limit: int = DEFAULT_PRESET_PAGE_SIZE,
+        after: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> PresetPage:
+        """Return one page of presets ordered by ``sort_by``, then by slug.
 
-    def find_by_slug(self, slug: str) -> Optional[Preset]:
-        normalized = str(slug or "").strip()
-        if not normalized:
-            return None
-        doc = self._collection.find_one({"slug": normalized})
+        ``after`` is the ``next_cursor`` of the previous page. Pages continue
+        from the last key seen instead of skipping rows, so every page is a
+        range scan on the ``(field, slug)`` index. ``fields`` limits the
+        returned document fields; ``slug`` is always included.
+        """
+        sort_key, descending = _list_order(sort_by, direction)
+        query = _cursor_filter(after, sort_key, descending) if after else {}
+        projection: Optional[dict[str, int]] = None
+        if fields is not None:
+            projection = {field: 1 for field in fields if field in PRESET_FIELDS}
+            projection.update({"_id": 0, "slug": 1, sort_key: 1})
+        sort_dir = -1 if descending else 1
+        page_size = max(1, limit)
+        docs = list(
+            self._collection.find(query, projection)
+            .sort([(sort_key, sort_dir), ("slug", sort_dir)])
+            .limit(page_size + 1)
+        )
+        next_cursor = None
+        if len(docs) > page_size:
+            docs = docs[:page_size]
+            next_cursor = _encode_cursor(sort_key, descending, docs[-1])
+        return PresetPage([Preset.from_document(doc) for doc in docs], next_cursor)
+
+    @_mongo_operation("presets_version")
+    def presets_version(self) -> str:
+        count = self._collection.count_documents({})
+        latest = [self._latest_value(field) for field in ("updated_at", "last_printed_at")]
+        return json.dumps([count, *latest])
+
+    def _latest_value(self, field: str) -> Optional[str]:
+        cursor = self._collection.find({}, {"_id": 0, field: 1}).sort(field, -1).limit(1)
+        for doc in cursor:
+            value = doc.get(field)
+            return str(value) if value is not None else None
+        return None
+
+    @_mongo_operation("find_by_slug")
+    def _find_by_slug(self, slug: str) -> Optional[Preset]:
+        doc = self._collection.find_one({"slug": slug})
         return Preset.from_document(doc) if doc else None
 
-    def find_slug_for_params(
-        self, template_slug: str, params: Mapping[str, TemplateFormValue]
-    ) -> Optional[str]:
-        canonical_query = canonical_query_string(template_slug, params)
-        slug = slug_from_query(canonical_query)
+    @_mongo_operation("find_slug_for_params")
+    def _find_slug(self, slug: str) -> Optional[str]:
         doc = self._collection.find_one({"slug": slug}, {"slug": 1})
         return slug if doc else None
 
+    @_mongo_operation("load_presets")
+    def _load_documents(self) -> list[Mapping[str, object]]:
+        return list(self._collection.find({}))
+
+    @_mongo_operation("upsert_preset")
     def upsert_preset(
         self,
         name: str,
         template_slug: str,
         params: Mapping[str, TemplateFormValue],
     ) -> Preset:
-        normalized_name = str(name or "").strip()
-        if not normalized_name:
-            raise ValueError("Preset name is required.")
-        normalized_template = normalize_template_slug(template_slug)
-        canonical_query = canonical_query_string(normalized_template, params)
-        slug = slug_from_query(canonical_query)
         now = _utc_now_iso()
-        payload = {
-            "slug": slug,
-            "name": normalized_name,
-            "template": normalized_template,
-            "query": canonical_query,
-            "params": canonical_params(params),
-            "updated_at": now,
-        }
+        payload = _preset_document(name, template_slug, params, now)
+        slug = str(payload["slug"])
         from pymongo import ReturnDocument
 
         doc = self._collection.find_one_and_update(
@@ -179,8 +670,11 @@ class PresetStore:
             doc = self._collection.find_one({"slug": slug})
         if doc is None:
             raise RuntimeError("Failed to save preset.")
+        if self._cache is not None:
+            self._cache.put(doc)
         return Preset.from_document(doc)
 
+    @_mongo_operation("record_print")
     def record_print(self, slug: str) -> Optional[Preset]:
         normalized = str(slug or "").strip()
         if not normalized:
@@ -189,29 +683,554 @@ class PresetStore:
 
         doc = self._collection.find_one_and_update(
             {"slug": normalized},
-            {"$inc": {"print_count": 1}},
+            {"$inc": {"print_count": 1}, "$max": {"last_printed_at": _utc_now_iso()}},
             upsert=False,
             return_document=ReturnDocument.AFTER,
         )
         return Preset.from_document(doc) if doc else None
 
+    @_mongo_operation("record_prints")
+    def record_prints(self, counts: Mapping[str, int]) -> None:
+        """Apply ``{slug: count}`` increments with one unordered ``bulk_write``."""
+        from pymongo import UpdateOne
+
+        now = _utc_now_iso()
+        operations = [
+            UpdateOne(
+                {"slug": slug},
+                {"$inc": {"print_count": count}, "$max": {"last_printed_at": now}},
+                upsert=False,
+            )
+            for slug, count in counts.items()
+            if count > 0
+        ]
+        if operations:
+            self._collection.bulk_write(operations, ordered=False)
+
+    @_mongo_operation("replicate_presets")
+    def replicate(self, documents: Iterable[Mapping[str, object]], deleted: Iterable[str]) -> None:
+        """Overwrite ``documents`` by slug and delete ``deleted`` in one ``bulk_write``."""
+        from pymongo import DeleteOne, ReplaceOne
+
+        replaced = [dict(doc) for doc in documents]
+        removed = list(deleted)
+        operations: list[ReplaceOne[dict[str, object]] | DeleteOne] = [
+            ReplaceOne({"slug": doc["slug"]}, doc, upsert=True) for doc in replaced
+        ]
+        operations.extend(DeleteOne({"slug": slug}) for slug in removed)
+        if not operations:
+            return
+        self._collection.bulk_write(operations, ordered=False)
+        if self._cache is not None:
+            for doc in replaced:
+                self._cache.put(doc)
+            for slug in removed:
+                self._cache.discard(slug)
+
+    @_mongo_operation("delete_preset")
     def delete_preset(self, slug: str) -> bool:
         normalized = str(slug or "").strip()
         if not normalized:
             return False
         result = self._collection.delete_one({"slug": normalized})
+        if self._cache is not None:
+            self._cache.discard(normalized)
         return result.deleted_count > 0
 
 
+_SQLITE_INDEXED_FIELDS = ("name", "template", "created_at", "updated_at", "print_count")
+_SQLITE_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS presets (
+        slug TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        template TEXT NOT NULL,
+        query TEXT NOT NULL,
+        params TEXT,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL,
+        print_count INTEGER NOT NULL DEFAULT 0,
+        last_printed_at TEXT
+    )
+    """,
+    *(
+        f"CREATE INDEX IF NOT EXISTS presets_{field}_slug ON presets ({field}, slug)"
+        for field in _SQLITE_INDEXED_FIELDS
+    ),
+    "CREATE INDEX IF NOT EXISTS presets_template_print_count"
+    " ON presets (template, print_count DESC)",
+    "CREATE INDEX IF NOT EXISTS presets_last_printed_at ON presets (last_printed_at)",
+    "CREATE TABLE IF NOT EXISTS preset_store_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+)
+
+
+class MongoReplicator:
+    """Copies local preset changes to MongoDB behind the request.
+
+    ``mark`` records that a slug changed; a ``CoalescingBuffer`` collects the
+    marks and hands them to a background flush, which reads the current local
+    documents and applies them to MongoDB with one ``PresetStore.replicate``
+    call. Slugs missing locally are deleted remotely. Every flush writes whole
+    documents, so replaying one after a failure is harmless, and the local
+    store stays the source of truth. The MongoDB store is connected on first
+    use and reconnected on the next flush if that fails.
+    """
+
+    def __init__(
+        self,
+        load_local: Callable[[Sequence[str]], Mapping[str, Mapping[str, object]]],
+        connect: Callable[[], Optional[PresetStore]],
+        *,
+        interval_seconds: float = DEFAULT_REPLICATION_SECONDS,
+    ) -> None:
+        self._load_local = load_local
+        self._connect = connect
+        self._target: Optional[PresetStore] = None
+        self._changes = CoalescingBuffer(
+            self._push, interval_seconds=interval_seconds, thread_name="preset-replicator"
+        )
+
+    @classmethod
+    def from_env(
+        cls, load_local: Callable[[Sequence[str]], Mapping[str, Mapping[str, object]]]
+    ) -> Optional["MongoReplicator"]:
+        """Return a replicator if ``PRESET_SQLITE_REPLICATE`` is set and MongoDB is configured."""
+        if not _is_truthy(os.getenv("PRESET_SQLITE_REPLICATE")) or not load_mongo_configs():
+            return None
+        interval = _float_from_env("PRESET_REPLICATION_SECONDS", DEFAULT_REPLICATION_SECONDS)
+        return cls(
+            load_local,
+            PresetStore.from_env,
+            interval_seconds=interval if interval > 0 else DEFAULT_REPLICATION_SECONDS,
+        )
+
+    def mark(self, slug: str) -> None:
+        self._changes.add(slug)
+
+    def flush(self) -> int:
+        """Replicate every pending change now; return the number of changes written."""
+        return self._changes.flush()
+
+    def documents(self) -> list[Mapping[str, object]]:
+        """Return every preset document in MongoDB."""
+        return self._target_store()._load_documents()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        try:
+            self._changes.close(timeout)
+        finally:
+            target, self._target = self._target, None
+            if target is not None:
+                target.close(force=True)
+
+    def stats(self) -> dict[str, object]:
+        changes = self._changes.stats()
+        return {
+            "pending": changes["pending"],
+            "flushes": changes["flushes"],
+            "replicated": changes["flushed"],
+            "errors": changes["errors"],
+            "connected": self._target is not None,
+        }
+
+    def _target_store(self) -> PresetStore:
+        target = self._target
+        if target is None:
+            target = self._connect()
+            if target is None:
+                raise RuntimeError("Preset replication requires MONGODB_URL.")
+            self._target = target
+        return target
+
+    def _push(self, changes: Mapping[str, int]) -> None:
+        slugs = sorted(changes)
+        documents = self._load_local(slugs)
+        self._target_store().replicate(
+            [documents[slug] for slug in slugs if slug in documents],
+            [slug for slug in slugs if slug not in documents],
+        )
+
+
+class SqlitePresetStore(PresetBackend):
+    """Preset storage in an embedded SQLite database.
+
+    Slugs, documents, sort orders and cursors match the MongoDB store, and
+    every sort field has a ``(field, slug)`` index. The database runs in WAL
+    mode, so reads never wait for a write and each pre-fork worker can open the
+    same file. Operations check a connection out of a small pool and return it
+    when they finish, so the short-lived threads of the threaded server do not
+    each keep one open; at most ``max_connections`` exist. Writes run in short
+    ``BEGIN IMMEDIATE`` transactions, and print counts are incremented in SQL,
+    so concurrent prints from several workers are never lost. With a
+    ``MongoReplicator`` attached, every change is also copied to MongoDB in the
+    background.
+    """
+
+    is_local = True
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        replicator: Optional[MongoReplicator] = None,
+        max_connections: int = DEFAULT_SQLITE_CONNECTIONS,
+    ) -> None:
+        self.path = path
+        self.max_connections = max(1, max_connections)
+        self._replicator = replicator
+        self._pool = threading.Condition()
+        self._connections: list[sqlite3.Connection] = []
+        self._idle: list[sqlite3.Connection] = []
+        self._opening = 0
+        self._pool_pid = os.getpid()
+
+    @classmethod
+    def from_env(cls) -> "SqlitePresetStore":
+        """Open ``PRESET_SQLITE_PATH``, replicating to MongoDB if ``PRESET_SQLITE_REPLICATE`` is set.
+
+        With replication on, presets already in MongoDB are imported once, on the
+        first start that can reach it; local presets win over imported ones.
+        """
+        path = os.getenv("PRESET_SQLITE_PATH", "").strip() or DEFAULT_SQLITE_PATH
+        store = cls(path)
+        store.ensure_indexes()
+        replicator = MongoReplicator.from_env(store.documents_by_slug)
+        if replicator is not None:
+            store._replicator = replicator
+            if store._meta("imported_from_mongo") is None:
+                try:
+                    store.import_documents(replicator.documents())
+                    store._set_meta("imported_from_mongo", _utc_now_iso())
+                except Exception:
+                    # MongoDB unreachable; the import is retried on the next start.
+                    pass
+        return store
+
+    def close(self, *, force: bool = False) -> None:
+        if self._cached and not force:
+            return
+        if self._replicator is not None:
+            self._replicator.close(timeout=5)
+        with self._pool:
+            connections, self._connections, self._idle = self._connections, [], []
+            self._pool.notify_all()
+        for connection in connections:
+            connection.close()
+
+    def cache_stats(self) -> dict[str, object]:
+        stats = super().cache_stats()
+        stats["replication"] = self._replicator.stats() if self._replicator is not None else None
+        return stats
+
+    def pooled_ping(self) -> Optional[PooledPing]:
+        # Health checks ping the MongoDB replica once the replicator has connected.
+        replicator = self._replicator
+        target = replicator._target if replicator is not None else None
+        return target.pooled_ping() if target is not None else None
+
+    def background_writers(self) -> list[CoalescingBuffer | MongoReplicator]:
+        writers = super().background_writers()
+        if self._replicator is not None:
+            writers.append(self._replicator)
+        return writers
+
+    def ensure_indexes(self) -> None:
+        with self._write() as connection:
+            for statement in _SQLITE_SCHEMA:
+                connection.execute(statement)
+
+    def list_presets(
+        self,
+        *,
+        sort_by: str = "created",
+        direction: Optional[str] = None,
+        limit: int = DEFAULT_PRESET_PAGE_SIZE,
+        after: Optional[str] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> PresetPage:
+        sort_key, descending = _list_order(sort_by, direction)
+        selected = set(PRESET_FIELDS if fields is None else fields) | {"slug", sort_key}
+        columns = ", ".join(field for field in PRESET_FIELDS if field in selected)
+        # ``sort_key`` always comes from ``_SORT_FIELDS``, never from the request.
+        sql = f"SELECT {columns} FROM presets"
+        args: list[object] = []
+        if after:
+            value, slug = _decode_cursor(after, sort_key, descending)
+            beyond = "<" if descending else ">"
+            if sort_key == "slug":
+                sql += f" WHERE slug {beyond} ?"
+                args.append(slug)
+            else:
+                sql += f" WHERE ({sort_key}, slug) {beyond} (?, ?)"
+                args.extend([value, slug])
+        order = "DESC" if descending else "ASC"
+        page_size = max(1, limit)
+        sql += f" ORDER BY {sort_key} {order}, slug {order} LIMIT ?"
+        args.append(page_size + 1)
+        with self._connection() as connection:
+            docs = [_row_document(row) for row in connection.execute(sql, args)]
+        next_cursor = None
+        if len(docs) > page_size:
+            docs = docs[:page_size]
+            next_cursor = _encode_cursor(sort_key, descending, docs[-1])
+        return PresetPage([Preset.from_document(doc) for doc in docs], next_cursor)
+
+    def presets_version(self) -> str:
+        # Separate subqueries let SQLite answer each max() from its index.
+        with self._connection() as connection:
+            count, updated_at, printed_at = connection.execute(
+                "SELECT (SELECT count(*) FROM presets),"
+                " (SELECT max(updated_at) FROM presets),"
+                " (SELECT max(last_printed_at) FROM presets)"
+            ).fetchone()
+        return json.dumps([count, updated_at, printed_at])
+
+    def documents_by_slug(self, slugs: Sequence[str]) -> dict[str, Mapping[str, object]]:
+        """Return the stored documents for ``slugs``, keyed by slug; missing slugs are absent."""
+        if not slugs:
+            return {}
+        placeholders = ", ".join("?" for _ in slugs)
+        with self._connection() as connection:
+            rows = connection.execute(
+                f"SELECT * FROM presets WHERE slug IN ({placeholders})", list(slugs)
+            )
+            return {row["slug"]: _row_document(row) for row in rows}
+
+    def import_documents(self, documents: Iterable[Mapping[str, object]]) -> int:
+        """Insert ``documents`` whose slug is not stored yet; return how many were added."""
+        rows = []
+        for doc in documents:
+            preset = Preset.from_document(doc)
+            if not preset.slug:
+                continue
+            printed_at = doc.get("last_printed_at")
+            row = _sqlite_row(preset)
+            row["last_printed_at"] = str(printed_at) if printed_at is not None else None
+            rows.append(row)
+        with self._write() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                """
+                INSERT INTO presets (slug, name, template, query, params, created_at,
+                                     updated_at, print_count, last_printed_at)
+                VALUES (:slug, :name, :template, :query, :params, :created_at,
+                        :updated_at, :print_count, :last_printed_at)
+                ON CONFLICT (slug) DO NOTHING
+                """,
+                rows,
+            )
+            return connection.total_changes - before
+
+    def _find_by_slug(self, slug: str) -> Optional[Preset]:
+        doc = self.documents_by_slug([slug]).get(slug)
+        return Preset.from_document(doc) if doc else None
+
+    def _find_slug(self, slug: str) -> Optional[str]:
+        with self._connection() as connection:
+            row = connection.execute("SELECT 1 FROM presets WHERE slug = ?", (slug,)).fetchone()
+        return slug if row else None
+
+    def _load_documents(self) -> list[Mapping[str, object]]:
+        with self._connection() as connection:
+            return [_row_document(row) for row in connection.execute("SELECT * FROM presets")]
+
+    def upsert_preset(
+        self,
+        name: str,
+        template_slug: str,
+        params: Mapping[str, TemplateFormValue],
+    ) -> Preset:
+        now = _utc_now_iso()
+        payload = _preset_document(name, template_slug, params, now)
+        slug = str(payload["slug"])
+        row = _sqlite_row(Preset.from_document({**payload, "created_at": now}))
+        with self._write() as connection:
+            connection.execute(
+                """
+                INSERT INTO presets (slug, name, template, query, params, created_at,
+                                     updated_at, print_count)
+                VALUES (:slug, :name, :template, :query, :params, :created_at, :updated_at, 0)
+                ON CONFLICT (slug) DO UPDATE SET
+                    name = excluded.name,
+                    template = excluded.template,
+                    query = excluded.query,
+                    params = excluded.params,
+                    updated_at = excluded.updated_at
+                """,
+                row,
+            )
+            saved = connection.execute("SELECT * FROM presets WHERE slug = ?", (slug,)).fetchone()
+        self._replicate(slug)
+        return Preset.from_document(_row_document(saved))
+
+    def record_print(self, slug: str) -> Optional[Preset]:
+        normalized = str(slug or "").strip()
+        if not normalized:
+            return None
+        with self._write() as connection:
+            _increment_prints(connection, {normalized: 1}, _utc_now_iso())
+            saved = connection.execute(
+                "SELECT * FROM presets WHERE slug = ?", (normalized,)
+            ).fetchone()
+        if saved is None:
+            return None
+        self._replicate(normalized)
+        return Preset.from_document(_row_document(saved))
+
+    def record_prints(self, counts: Mapping[str, int]) -> None:
+        increments = {slug: count for slug, count in counts.items() if count > 0}
+        if not increments:
+            return
+        with self._write() as connection:
+            _increment_prints(connection, increments, _utc_now_iso())
+        for slug in increments:
+            self._replicate(slug)
+
+    def delete_preset(self, slug: str) -> bool:
+        normalized = str(slug or "").strip()
+        if not normalized:
+            return False
+        with self._write() as connection:
+            deleted = connection.execute("DELETE FROM presets WHERE slug = ?", (normalized,))
+        if deleted.rowcount > 0:
+            self._replicate(normalized)
+        return deleted.rowcount > 0
+
+    def _replicate(self, slug: str) -> None:
+        if self._replicator is not None:
+            self._replicator.mark(slug)
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT value FROM preset_store_meta WHERE key = ?", (key,)
+            ).fetchone()
+        return str(row["value"]) if row else None
+
+    def _set_meta(self, key: str, value: str) -> None:
+        with self._write() as connection:
+            connection.execute(
+                "INSERT INTO preset_store_meta (key, value) VALUES (?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                (key, value),
+            )
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Check a pooled connection out for the duration of the ``with`` block."""
+        connection = self._checkout()
+        try:
+            yield connection
+        finally:
+            self._checkin(connection)
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        with self._connection() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                yield connection
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+
+    def _checkout(self) -> sqlite3.Connection:
+        with self._pool:
+            self._forget_parent_connections()
+            while not self._idle and len(self._connections) + self._opening >= self.max_connections:
+                self._pool.wait()
+            if self._idle:
+                return self._idle.pop()
+            self._opening += 1
+        try:
+            connection = _open_sqlite(self.path)
+        except BaseException:
+            with self._pool:
+                self._opening -= 1
+                self._pool.notify()
+            raise
+        with self._pool:
+            self._opening -= 1
+            self._connections.append(connection)
+        return connection
+
+    def _checkin(self, connection: sqlite3.Connection) -> None:
+        with self._pool:
+            if connection in self._connections:
+                self._idle.append(connection)
+                self._pool.notify()
+                return
+        # The store was closed while this connection was checked out.
+        connection.close()
+
+    def _forget_parent_connections(self) -> None:
+        # A connection must never be used on both sides of a fork; a forked
+        # worker drops the parent's without closing them and opens its own.
+        pid = os.getpid()
+        if pid != self._pool_pid:
+            self._pool_pid = pid
+            self._connections, self._idle, self._opening = [], [], 0
+
+
+def _open_sqlite(path: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def _increment_prints(connection: sqlite3.Connection, counts: Mapping[str, int], now: str) -> None:
+    connection.executemany(
+        """
+        UPDATE presets
+        SET print_count = print_count + ?,
+            last_printed_at = max(coalesce(last_printed_at, ''), ?)
+        WHERE slug = ?
+        """,
+        [(count, now, slug) for slug, count in counts.items()],
+    )
+
+
+def _sqlite_row(preset: Preset) -> dict[str, object]:
+    return {
+        "slug": preset.slug,
+        "name": preset.name,
+        "template": preset.template,
+        "query": preset.query,
+        "params": _dump_json(preset.params) if preset.params is not None else None,
+        "created_at": preset.created_at,
+        "updated_at": preset.updated_at,
+        "print_count": preset.print_count,
+    }
+
+
+def _row_document(row: sqlite3.Row) -> dict[str, object]:
+    doc: dict[str, object] = {key: row[key] for key in row.keys()}
+    params = doc.get("params")
+    if isinstance(params, str):
+        doc["params"] = json.loads(params)
+    if "last_printed_at" in doc and doc["last_printed_at"] is None:
+        del doc["last_printed_at"]
+    return doc
+
+
 _STORE_LOCK = threading.Lock()
-_STORE: Optional[PresetStore] = None
+_STORE: Optional[PresetBackend] = None
 _STORE_INITIALIZED = False
 _STORE_ERROR_UNTIL = 0.0
 _STORE_ERROR_TTL_SECONDS = 30.0
 
 
+_BOOTSTRAP: Optional[threading.Thread] = None
+_BOOTSTRAP_ERROR: Optional[Exception] = None
+
+
 def reset_cached_store() -> None:
-    global _STORE, _STORE_INITIALIZED, _STORE_ERROR_UNTIL
+    global _STORE, _STORE_INITIALIZED, _STORE_ERROR_UNTIL, _BOOTSTRAP, _BOOTSTRAP_ERROR
+    _BOOTSTRAP = None
+    _BOOTSTRAP_ERROR = None
     with _STORE_LOCK:
         if _STORE is not None:
             try:
@@ -223,7 +1242,80 @@ def reset_cached_store() -> None:
         _STORE_ERROR_UNTIL = 0.0
 
 
-def get_cached_store() -> Optional[PresetStore]:
+def start_store_bootstrap() -> None:
+    """Connect the shared store and prepare its indexes on a background thread.
+
+    Startup calls this before its warm-up so the connection overlaps template
+    rendering. Requests that need the store meanwhile wait in
+    ``get_cached_store`` for the same connection rather than opening another.
+    """
+    global _BOOTSTRAP
+    if _BOOTSTRAP is not None:
+        return
+    _BOOTSTRAP = threading.Thread(
+        target=_bootstrap_store, name="preset-store-bootstrap", daemon=True
+    )
+    _BOOTSTRAP.start()
+
+
+def wait_for_store_bootstrap(timeout: Optional[float] = None) -> Optional[PresetBackend]:
+    """Wait for ``start_store_bootstrap`` and re-raise its error; bootstrap now if never started.
+
+    Raises :class:`TimeoutError` when the bootstrap is still connecting after
+    ``timeout`` seconds; it carries on in the background.
+    """
+    thread = _BOOTSTRAP
+    if thread is None:
+        return _open_store()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"Preset store still connecting after {timeout:g} seconds.")
+    if _BOOTSTRAP_ERROR is not None:
+        raise _BOOTSTRAP_ERROR
+    return _STORE
+
+
+def _bootstrap_store() -> None:
+    global _BOOTSTRAP_ERROR
+    try:
+        _open_store()
+    except Exception as exc:
+        _BOOTSTRAP_ERROR = exc
+
+
+def _open_store() -> Optional[PresetBackend]:
+    store = get_cached_store()
+    if store is not None:
+        # A first query leaves a warm connection in the pool for the first request.
+        store.list_presets(limit=1)
+    return store
+
+
+def flush_cached_store() -> None:
+    """Write buffered print counts and replicate pending changes; call before exiting."""
+    store = _STORE
+    if not isinstance(store, PresetBackend):
+        return
+    for writer in store.background_writers():
+        try:
+            writer.close(timeout=5)
+        except Exception:
+            pass
+
+
+def preset_cache_stats() -> Optional[dict[str, object]]:
+    """Counters of the shared store's caches, or ``None`` before it has connected."""
+    store = _STORE
+    return store.cache_stats() if isinstance(store, PresetBackend) else None
+
+
+def pooled_mongo_ping() -> Optional[PooledPing]:
+    """Ping through the shared store's MongoDB client, or ``None`` before it has connected."""
+    store = _STORE
+    return store.pooled_ping() if isinstance(store, PresetBackend) else None
+
+
+def get_cached_store() -> Optional[PresetBackend]:
     # Cache the store state to avoid reconnecting and reindexing on each request.
     global _STORE, _STORE_INITIALIZED, _STORE_ERROR_UNTIL
     if _STORE_INITIALIZED:
@@ -236,17 +1328,28 @@ def get_cached_store() -> Optional[PresetStore]:
         if time.monotonic() < _STORE_ERROR_UNTIL:
             return None
         try:
-            store = PresetStore.from_env()
+            store = _store_from_env()
         except Exception:
             _STORE_ERROR_UNTIL = time.monotonic() + _STORE_ERROR_TTL_SECONDS
             raise
-        if store is not None and isinstance(store, PresetStore):
+        if store is not None and isinstance(store, PresetBackend):
             store._cached = True
+            if not store.is_local:
+                store._cache = PresetCache.from_env()
+                store._print_counts = PrintCountBuffer.from_env(store.record_prints)
         _STORE = store
         _STORE_INITIALIZED = True
         return _STORE
 
 
+def _store_from_env() -> Optional[PresetBackend]:
+    """Open the backend named by ``PRESET_STORE_BACKEND``: ``mongo`` (default) or ``sqlite``."""
+    backend = os.getenv("PRESET_STORE_BACKEND", "").strip().lower()
+    if backend == "sqlite":
+        return SqlitePresetStore.from_env()
+    return PresetStore.from_env()
+
+
 def normalize_template_slug(raw: object) -> str:
     slug = str(raw or "").strip().lower()
     if not slug:
@@ -381,10 +1484,46 @@ def _dump_json(value: object) -> str:
     return json.dumps(value, sort_keys=True, separators=(",", ":"), ensure_ascii=True)
 
 
+def _preset_document(
+    name: str, template_slug: str, params: Mapping[str, TemplateFormValue], now: str
+) -> dict[str, object]:
+    """Return the fields an upsert writes; the slug hashes the canonical query."""
+    normalized_name = str(name or "").strip()
+    if not normalized_name:
+        raise ValueError("Preset name is required.")
+    normalized_template = normalize_template_slug(template_slug)
+    canonical_query = canonical_query_string(normalized_template, params)
+    return {
+        "slug": slug_from_query(canonical_query),
+        "name": normalized_name,
+        "template": normalized_template,
+        "query": canonical_query,
+        "params": canonical_params(params),
+        "updated_at": now,
+    }
+
+
 def _resolve_database(config: MongoConfig) -> str:
     return config.database or DEFAULT_DB
 
 
+def _is_truthy(raw: Optional[str]) -> bool:
+    if raw is None:
+        return False
+    normalized = raw.strip().lower()
+    return normalized in {"1", "true", "yes", "on"}
+
+
+def _float_from_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
 def _mongo_timeout_ms() -> int:
     raw = os.getenv("MONGODB_TIMEOUT_MS", "350")
     try:
@@ -394,6 +1533,61 @@ def _mongo_timeout_ms() -> int:
     return max(value, 1)
 
 
+def _list_order(sort_by: str, direction: Optional[str]) -> tuple[str, bool]:
+    sort_key = _SORT_FIELDS.get(str(sort_by or "").strip().lower(), "created_at")
+    normalized_direction = str(direction or "").strip().lower()
+    if normalized_direction not in {"asc", "desc"}:
+        return sort_key, sort_key in _DESCENDING_BY_DEFAULT
+    return sort_key, normalized_direction == "desc"
+
+
+def _encode_cursor(sort_key: str, descending: bool, doc: Mapping[str, object]) -> str:
+    position = [sort_key, "desc" if descending else "asc", doc.get(sort_key), doc.get("slug")]
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort_key: str, descending: bool) -> tuple[str | int | None, str]:
+    """Return the ``(value, slug)`` position stored in a ``next_cursor``."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        cursor_key, order, value, slug = json.loads(raw)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid preset cursor.") from exc
+    if cursor_key != sort_key or order != ("desc" if descending else "asc"):
+        raise ValueError("Preset cursor does not match the requested sort.")
+    if not isinstance(slug, str) or not (value is None or isinstance(value, (str, int))):
+        raise ValueError("Invalid preset cursor.")
+    return value, slug
+
+
+def _cursor_filter(cursor: str, sort_key: str, descending: bool) -> dict[str, object]:
+    value, slug = _decode_cursor(cursor, sort_key, descending)
+    return _keyset_filter(sort_key, value, slug, descending)
+
+
+def _keyset_filter(
+    key: str, value: str | int | None, slug: str, descending: bool
+) -> dict[str, object]:
+    """Match documents that sort after ``(value, slug)`` in ``key, slug`` order.
+
+    MongoDB sorts missing and null values before any other value, so legacy
+    documents without ``key`` come first ascending and last descending.
+    """
+    beyond = "$lt" if descending else "$gt"
+    if key == "slug":
+        return {"slug": {beyond: slug}}
+    if value is None:
+        clauses: list[dict[str, object]] = [{key: None, "slug": {beyond: slug}}]
+        if not descending:
+            clauses.append({key: {"$ne": None}})
+        return {"$or": clauses}
+    clauses = [{key: {beyond: value}}, {key: value, "slug": {beyond: slug}}]
+    if descending:
+        clauses.append({key: None})
+    return {"$or": clauses}
+
+
 def _utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
@@ -410,14 +1604,29 @@ def _require_pymongo():
 
 
 __all__ = [
+    "flush_cached_store",
     "get_cached_store",
     "reset_cached_store",
+    "DEFAULT_PRESET_PAGE_SIZE",
+    "PRESET_FIELDS",
+    "PRESET_INDEX_VERSION",
+    "CoalescingBuffer",
+    "MongoReplicator",
     "Preset",
+    "PresetBackend",
+    "PresetCache",
+    "PresetPage",
     "PresetStore",
+    "PrintCountBuffer",
+    "SqlitePresetStore",
     "canonical_params",
     "canonical_query_items",
     "canonical_query_string",
     "normalize_template_slug",
+    "pooled_mongo_ping",
+    "preset_cache_stats",
     "slug_for_params",
     "slug_from_query",
+    "start_store_bootstrap",
+    "wait_for_store_bootstrap",
 ]
@@ -1,24 +1,35 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor, Future
 from dataclasses import dataclass
 from datetime import date
-from typing import Callable, Optional
+from typing import Callable, Optional, TypeVar
 
 from PIL import Image
 
 from .label import LabelMetrics
 from .label_specs import BrotherLabelSpec
-from .label_templates import LabelTemplate, TemplateFormData
+from .label_templates import LabelTemplate, TemplateFormData, TemplateFormValue
+from .timings import phase, submit_in_context
+
+_T = TypeVar("_T")
 
 
 class PreviewPayloadError(Exception):
     pass
 
 
+@dataclass(frozen=True)
+class _RenderedImage:
+    image: Image.Image
+    metrics: LabelMetrics
+    url: str
+
+
 @dataclass(frozen=True)
 class PreviewPayloadBuilder:
     analyze_label_image: Callable[..., LabelMetrics]
-    data_url_for_image: Callable[[Image.Image], str]
+    image_url_for_image: Callable[[Image.Image], str]
     best_by_template: Callable[[], LabelTemplate]
     print_url_for_template: Callable[..., str]
     qr_caption_for_template: Callable[[LabelTemplate, TemplateFormData], str]
@@ -33,25 +44,29 @@ class PreviewPayloadBuilder:
         [TemplateFormData],
         tuple[Optional[date], Optional[date], str, str],
     ]
+    # Optional bounded pool used to render and encode the label, QR and jar images
+    # concurrently. URL and caption resolution stay on the calling (request) thread.
+    # Previews with a single unit of render work skip the pool and render inline.
+    executor: Optional[Executor] = None
 
     def build(self, template: LabelTemplate, form_data: TemplateFormData) -> dict:
+        if self.executor is not None and self._render_units(template, form_data) > 1:
+            return self._build_concurrently(template, form_data, self.executor)
         try:
-            label_image = template.render(form_data)
+            with phase("render"):
+                label_image = template.render(form_data)
         except ValueError as exc:
             raise PreviewPayloadError(str(exc)) from exc
-        label_metrics = self.analyze_label_image(
-            label_image, target_spec=template.preferred_label_spec()
-        )
+        label_metrics = self._analyze(label_image, template.preferred_label_spec())
         print_url = self.print_url_for_template(template, form_data, prefer_preset=True)
         qr_caption = self.qr_caption_for_template(template, form_data)
         try:
-            qr_image = self.render_qr_label_image(template, form_data, print_url, qr_caption)
+            with phase("qr_render"):
+                qr_image = self.render_qr_label_image(template, form_data, print_url, qr_caption)
         except ValueError as exc:
             raise PreviewPayloadError(str(exc)) from exc
         qr_template = self.best_by_template()
-        qr_metrics = self.analyze_label_image(
-            qr_image, target_spec=qr_template.preferred_label_spec()
-        )
+        qr_metrics = self._analyze(qr_image, qr_template.preferred_label_spec())
 
         jar_image = None
         jar_metrics = None
@@ -60,15 +75,142 @@ class PreviewPayloadBuilder:
         if supplier or percentage:
             try:
                 jar_qr_url = self.jar_qr_url_for_template(template, form_data)
-                jar_form_data = dict(form_data)
-                jar_form_data["jar_qr_url"] = jar_qr_url
-                jar_form_data["jar_label_request"] = "true"
-                jar_image = template.render(jar_form_data)
-                jar_spec = self.label_spec_from_metadata(jar_image)
-                jar_metrics = self.analyze_label_image(jar_image, target_spec=jar_spec)
+                with phase("jar_render"):
+                    jar_image = template.render(_jar_form_data(form_data, jar_qr_url))
+                jar_metrics = self._analyze(jar_image, self.label_spec_from_metadata(jar_image))
             except ValueError:
                 pass
 
+        label = _RenderedImage(label_image, label_metrics, self._encode(label_image))
+        qr = _RenderedImage(qr_image, qr_metrics, self._encode(qr_image))
+        jar = None
+        if jar_image and jar_metrics:
+            jar = _RenderedImage(jar_image, jar_metrics, self._encode(jar_image))
+        return self._assemble(template, form_data, print_url, qr_caption, label, qr, jar)
+
+    def _render_units(self, template: LabelTemplate, form_data: TemplateFormData) -> int:
+        """Count the renders ``_build_concurrently`` would run on separate workers."""
+        # Best By label and QR renders share a worker (see ``_build_concurrently``).
+        units = 1 if template.slug == self.best_by_template().slug else 2
+        if form_data.get_str("Supplier", "supplier") or form_data.get_str(
+            "Percentage", "percentage"
+        ):
+            units += 1
+        return units
+
+    def _build_concurrently(
+        self, template: LabelTemplate, form_data: TemplateFormData, executor: Executor
+    ) -> dict:
+        qr_template = self.best_by_template()
+        # Best By records its label spec on the template instance while rendering, so
+        # the main and QR renders share a worker whenever they use the same template.
+        shares_qr_template = template.slug == qr_template.slug
+        label_future: Optional[Future[_RenderedImage]] = None
+        if not shares_qr_template:
+            label_future = submit_in_context(executor, self._render_label, template, form_data)
+
+        try:
+            print_url = self.print_url_for_template(template, form_data, prefer_preset=True)
+            qr_caption = self.qr_caption_for_template(template, form_data)
+        except Exception:
+            # Keep the sequential error precedence: a render failure wins.
+            if label_future is not None:
+                _resolve(label_future)
+            raise
+
+        pair_future: Optional[Future[tuple[_RenderedImage, _RenderedImage]]] = None
+        qr_future: Optional[Future[_RenderedImage]] = None
+        if label_future is None:
+            pair_future = submit_in_context(
+                executor, self._render_label_and_qr, template, form_data, print_url, qr_caption
+            )
+        else:
+            qr_future = submit_in_context(
+                executor, self._render_qr, qr_template, template, form_data, print_url, qr_caption
+            )
+
+        jar_future: Optional[Future[Optional[_RenderedImage]]] = None
+        supplier = form_data.get_str("Supplier", "supplier")
+        percentage = form_data.get_str("Percentage", "percentage")
+        if supplier or percentage:
+            try:
+                jar_qr_url: Optional[str] = self.jar_qr_url_for_template(template, form_data)
+            except ValueError:
+                jar_qr_url = None
+            if jar_qr_url is not None:
+                jar_future = submit_in_context(
+                    executor, self._render_jar, template, form_data, jar_qr_url
+                )
+
+        if label_future is not None and qr_future is not None:
+            label = _resolve(label_future)
+            qr = _resolve(qr_future)
+        else:
+            assert pair_future is not None
+            label, qr = _resolve(pair_future)
+        jar = jar_future.result() if jar_future is not None else None
+        return self._assemble(template, form_data, print_url, qr_caption, label, qr, jar)
+
+    def _render_label(self, template: LabelTemplate, form_data: TemplateFormData) -> _RenderedImage:
+        with phase("render"):
+            image = template.render(form_data)
+        metrics = self._analyze(image, template.preferred_label_spec())
+        return _RenderedImage(image, metrics, self._encode(image))
+
+    def _render_qr(
+        self,
+        qr_template: LabelTemplate,
+        template: LabelTemplate,
+        form_data: TemplateFormData,
+        print_url: str,
+        qr_caption: str,
+    ) -> _RenderedImage:
+        with phase("qr_render"):
+            image = self.render_qr_label_image(template, form_data, print_url, qr_caption)
+        metrics = self._analyze(image, qr_template.preferred_label_spec())
+        return _RenderedImage(image, metrics, self._encode(image))
+
+    def _render_label_and_qr(
+        self,
+        template: LabelTemplate,
+        form_data: TemplateFormData,
+        print_url: str,
+        qr_caption: str,
+    ) -> tuple[_RenderedImage, _RenderedImage]:
+        label = self._render_label(template, form_data)
+        qr = self._render_qr(template, template, form_data, print_url, qr_caption)
+        return label, qr
+
+    def _render_jar(
+        self, template: LabelTemplate, form_data: TemplateFormData, jar_qr_url: str
+    ) -> Optional[_RenderedImage]:
+        try:
+            with phase("jar_render"):
+                image = template.render(_jar_form_data(form_data, jar_qr_url))
+            metrics = self._analyze(image, self.label_spec_from_metadata(image))
+        except ValueError:
+            return None
+        return _RenderedImage(image, metrics, self._encode(image))
+
+    def _analyze(self, image: Image.Image, target_spec: Optional[BrotherLabelSpec]) -> LabelMetrics:
+        with phase("analyze"):
+            return self.analyze_label_image(image, target_spec=target_spec)
+
+    def _encode(self, image: Image.Image) -> str:
+        with phase("encode"):
+            return self.image_url_for_image(image)
+
+    def _assemble(
+        self,
+        template: LabelTemplate,
+        form_data: TemplateFormData,
+        print_url: str,
+        qr_caption: str,
+        label: _RenderedImage,
+        qr: _RenderedImage,
+        jar: Optional[_RenderedImage],
+    ) -> dict:
+        qr_template = self.best_by_template()
         payload: dict[str, object] = {
             "status": "preview",
             "template": template.slug,
@@ -76,27 +218,27 @@ class PreviewPayloadBuilder:
             "qr_print_url": self.print_url_for_template(template, form_data, include_qr_label=True),
             "qr_caption": qr_caption,
             "label": {
-                "image": self.data_url_for_image(label_image),
-                "metrics": label_metrics.to_dict(),
-                "warnings": label_metrics.warnings,
+                "image": label.url,
+                "metrics": label.metrics.to_dict(),
+                "warnings": label.metrics.warnings,
             },
             "qr": {
-                "image": self.data_url_for_image(qr_image),
-                "metrics": qr_metrics.to_dict(),
-                "warnings": qr_metrics.warnings,
+                "image": qr.url,
+                "metrics": qr.metrics.to_dict(),
+                "warnings": qr.metrics.warnings,
             },
         }
 
-        if jar_image and jar_metrics:
+        if jar is not None:
             jar_print_url = self.print_url_for_template(template, form_data)
             jar_print_url = jar_print_url.replace("print=true", "jar=true")
             jar_qr_url = self.jar_qr_url_for_template(template, form_data)
             payload["jar_print_url"] = jar_print_url
             payload["jar_qr_url"] = jar_qr_url
             payload["jar"] = {
-                "image": self.data_url_for_image(jar_image),
-                "metrics": jar_metrics.to_dict(),
-                "warnings": jar_metrics.warnings,
+                "image": jar.url,
+                "metrics": jar.metrics.to_dict(),
+                "warnings": jar.metrics.warnings,
             }
         if template.slug == qr_template.slug:
             try:
@@ -114,3 +256,18 @@ class PreviewPayloadBuilder:
             except ValueError:
                 pass
         return payload
+
+
+def _jar_form_data(form_data: TemplateFormData, jar_qr_url: str) -> dict[str, TemplateFormValue]:
+    jar_form_data: dict[str, TemplateFormValue] = dict(form_data)
+    jar_form_data["jar_qr_url"] = jar_qr_url
+    jar_form_data["jar_label_request"] = "true"
+    return jar_form_data
+
+
+def _resolve(future: Future[_T]) -> _T:
+    """Return ``future``'s result, mapping template validation errors to payload errors."""
+    try:
+        return future.result()
+    except ValueError as exc:
+        raise PreviewPayloadError(str(exc)) from exc
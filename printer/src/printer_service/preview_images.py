@@ -0,0 +1,255 @@
+"""Short-lived, content-addressed store for encoded preview images.
+
+``/bb/preview`` used to inline every rendered PNG as a base64 data URL, which
+inflates the JSON by a third and can never be cached by the browser or the
+Home Assistant ingress proxy. Previews now reference
+``/bb/preview/img/<digest>.png`` instead; the digest is derived from the PNG
+bytes, so it doubles as a strong ETag and unchanged images are not downloaded
+again.
+
+Pre-fork workers do not share memory, so a preview rendered by one worker may
+have its image requested from another. :meth:`PreviewImageStore.share_directory`
+makes every worker also write images to a common directory and fall back to it
+on a miss.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Callable, Optional
+
+from PIL import Image
+
+DEFAULT_TTL_SECONDS = 600.0
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+_DIGEST_LENGTH = 32
+# Pruning lists the shared directory, so do it at most this often per process.
+_PRUNE_INTERVAL_SECONDS = 1.0
+
+
+@dataclass(frozen=True)
+class _StoredImage:
+    png: bytes
+    expires_at: float
+
+
+def encode_png(image: Image.Image) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def png_digest(png: bytes) -> str:
+    """Return the content hash used in preview image URLs and ETags."""
+    return hashlib.sha256(png).hexdigest()[:_DIGEST_LENGTH]
+
+
+def is_valid_digest(candidate: str) -> bool:
+    return len(candidate) == _DIGEST_LENGTH and all(
+        char in "0123456789abcdef" for char in candidate
+    )
+
+
+class PreviewImageStore:
+    """Thread-safe map of digest -> PNG bytes with a TTL and a byte budget."""
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.ttl_seconds = max(0.0, ttl_seconds)
+        self._max_bytes = max(0, max_bytes)
+        self._clock = clock
+        self._entries: OrderedDict[str, _StoredImage] = OrderedDict()
+        self._lock = threading.Lock()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._directory: Optional[str] = None
+        self._pruned_at: Optional[float] = None
+
+    @classmethod
+    def from_env(cls) -> "PreviewImageStore":
+        return cls(
+            ttl_seconds=_float_from_env("PREVIEW_IMAGE_TTL_SECONDS", DEFAULT_TTL_SECONDS),
+            max_bytes=int(_float_from_env("PREVIEW_IMAGE_STORE_BYTES", DEFAULT_MAX_BYTES)),
+        )
+
+    def share_directory(self, path: str) -> None:
+        """Also keep images in ``path`` so other processes using it can serve them.
+
+        Call before forking; the in-memory entries stay per process and the
+        directory is only read on a miss. Files expire by modification time and
+        the directory as a whole is held to the same byte budget.
+        """
+        os.makedirs(path, exist_ok=True)
+        self._directory = path
+
+    def put_image(self, image: Image.Image) -> str:
+        return self.put(encode_png(image))
+
+    def put(self, png: bytes) -> str:
+        """Store ``png`` (refreshing its TTL if already present) and return its digest."""
+        digest = png_digest(png)
+        now = self._clock()
+        with self._lock:
+            self._expire(now)
+            previous = self._entries.pop(digest, None)
+            if previous is not None:
+                self._size_bytes -= len(previous.png)
+            self._entries[digest] = _StoredImage(png=png, expires_at=now + self.ttl_seconds)
+            self._size_bytes += len(png)
+            # Keep the newest image even if it alone exceeds the budget; the
+            # preview that references it is about to be fetched.
+            while self._size_bytes > self._max_bytes and len(self._entries) > 1:
+                _digest, evicted = self._entries.popitem(last=False)
+                self._size_bytes -= len(evicted.png)
+            prune = self._directory is not None and (
+                self._pruned_at is None or now - self._pruned_at >= _PRUNE_INTERVAL_SECONDS
+            )
+            if prune:
+                self._pruned_at = now
+        if self._directory is not None:
+            _write_shared(self._directory, digest, png)
+            if prune:
+                _prune_shared(self._directory, self.ttl_seconds, self._max_bytes, keep=digest)
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        with self._lock:
+            self._expire(self._clock())
+            entry = self._entries.get(digest)
+            if entry is not None:
+                self._hits += 1
+                return entry.png
+        png = None
+        if self._directory is not None:
+            png = _read_shared(self._directory, digest, self.ttl_seconds)
+        with self._lock:
+            if png is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return png
+
+    def stats(self) -> dict[str, int | float]:
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "entries": len(self._entries),
+                "size_bytes": self._size_bytes,
+                "max_bytes": self._max_bytes,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+    def _expire(self, now: float) -> None:
+        # Entries are kept in insertion order and share one TTL, so the oldest
+        # expire first.
+        while self._entries:
+            digest, entry = next(iter(self._entries.items()))
+            if entry.expires_at > now:
+                break
+            del self._entries[digest]
+            self._size_bytes -= len(entry.png)
+
+
+def _shared_path(directory: str, digest: str) -> str:
+    return os.path.join(directory, f"{digest}.png")
+
+
+def _write_shared(directory: str, digest: str, png: bytes) -> None:
+    path = _shared_path(directory, digest)
+    try:
+        # Same digest, same bytes: refreshing the modification time restarts its TTL.
+        os.utime(path)
+        return
+    except FileNotFoundError:
+        pass
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temporary, "wb") as handle:
+            handle.write(png)
+        os.replace(temporary, path)
+    except OSError:
+        # The in-memory copy still serves this worker's requests.
+        try:
+            os.unlink(temporary)
+        except OSError:
+            pass
+
+
+def _read_shared(directory: str, digest: str, ttl_seconds: float) -> Optional[bytes]:
+    path = _shared_path(directory, digest)
+    try:
+        if os.stat(path).st_mtime + ttl_seconds <= time.time():
+            return None
+        with open(path, "rb") as handle:
+            return handle.read()
+    except OSError:
+        return None
+
+
+def _prune_shared(directory: str, ttl_seconds: float, max_bytes: int, *, keep: str) -> None:
+    now = time.time()
+    files: list[tuple[float, int, str]] = []
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return
+    for name in names:
+        if not name.endswith(".png"):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            status = os.stat(path)
+        except OSError:
+            continue
+        if status.st_mtime + ttl_seconds <= now:
+            _remove(path)
+        else:
+            files.append((status.st_mtime, status.st_size, path))
+    total = sum(size for _mtime, size, _path in files)
+    kept = _shared_path(directory, keep)
+    for _mtime, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        if path != kept:
+            _remove(path)
+            total -= size
+
+
+def _remove(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _float_from_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return default
+
+
+__all__ = [
+    "DEFAULT_MAX_BYTES",
+    "DEFAULT_TTL_SECONDS",
+    "PreviewImageStore",
+    "encode_png",
+    "is_valid_digest",
+    "png_digest",
+]
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+from concurrent.futures import Executor
 from dataclasses import dataclass
 from datetime import date
-from typing import Callable, Optional, Protocol
+from typing import Callable, Optional, Protocol, Sequence
 
 from PIL import Image
 
 from .label import LabelMetrics, PrinterConfig
 from .label_specs import BrotherLabelSpec
 from .label_templates import LabelTemplate, TemplateFormData
+from .timings import phase, submit_in_context
+
+
+RenderedPrint = tuple[Image.Image, LabelMetrics, Optional[BrotherLabelSpec]]
 
 
 class SuccessPayloadBuilder(Protocol):
@@ -21,6 +26,15 @@ class SuccessPayloadBuilder(Protocol):
     ) -> dict: ...
 
 
+@dataclass(frozen=True)
+class BatchPrintItem:
+    template: LabelTemplate
+    form_data: TemplateFormData
+    copies: int = 1
+    include_qr_label: bool = False
+    include_jar_label: bool = False
+
+
 @dataclass(frozen=True)
 class PrintDispatchService:
     analyze_label_image: Callable[..., LabelMetrics]
@@ -36,6 +50,10 @@ class PrintDispatchService:
     compute_best_by: Callable[[TemplateFormData], tuple[Optional[date], Optional[date], str, str]]
     success_payload: SuccessPayloadBuilder
     payload_error: Callable[[str], Exception]
+    raster_cache_stats: Callable[[], dict[str, int]]
+    dispatch_images: Callable[..., Sequence[Optional[object]]]
+    # Optional pool used to render batch items concurrently.
+    executor: Optional[Executor] = None
 
     def dispatch(
         self,
@@ -44,6 +62,7 @@ class PrintDispatchService:
         *,
         include_qr_label: bool,
         include_jar_label: bool = False,
+        progress: Optional[Callable[[str], None]] = None,
     ) -> dict:
         config = self.config_from_env()
         image, metrics, target_spec = self._render_print_image(
@@ -52,12 +71,16 @@ class PrintDispatchService:
             include_qr_label=include_qr_label,
             include_jar_label=include_jar_label,
         )
+        if progress is not None:
+            progress("sending")
         result = self.dispatch_image(image, config, target_spec=target_spec)
         response_payload = self.success_payload(
             result,
             warnings=metrics.warnings if metrics else None,
             metrics=metrics,
         )
+        if config.backend == "brother-network" and "metrics" in response_payload:
+            response_payload["metrics"]["raster_cache"] = self.raster_cache_stats()
         response_payload["template"] = template.slug
         if include_qr_label:
             response_payload["qr_label"] = True
@@ -77,6 +100,78 @@ class PrintDispatchService:
                     pass
         return response_payload
 
+    def dispatch_batch(
+        self,
+        items: Sequence[BatchPrintItem],
+        *,
+        progress: Optional[Callable[[str], None]] = None,
+    ) -> dict:
+        """Render every item (in parallel when possible) and print them as one job."""
+        config = self.config_from_env()
+        renderers = [
+            self._print_renderer(
+                item.template,
+                item.form_data,
+                include_qr_label=item.include_qr_label,
+                include_jar_label=item.include_jar_label,
+            )
+            for item in items
+        ]
+        rendered = self._render_all(items, renderers)
+
+        pages: list[Image.Image] = []
+        specs: list[Optional[BrotherLabelSpec]] = []
+        item_payloads: list[dict[str, object]] = []
+        for item, (image, metrics, target_spec) in zip(items, rendered):
+            pages.extend([image] * item.copies)
+            specs.extend([target_spec] * item.copies)
+            item_payloads.append(
+                {
+                    "template": item.template.slug,
+                    "copies": item.copies,
+                    "metrics": metrics.to_dict(),
+                    "warnings": list(metrics.warnings),
+                }
+            )
+        if progress is not None:
+            progress("sending")
+        self.dispatch_images(pages, config, target_specs=specs)
+        response_payload: dict[str, object] = {
+            "status": "sent",
+            "labels": len(pages),
+            "items": item_payloads,
+        }
+        if config.backend == "brother-network":
+            response_payload["metrics"] = {"raster_cache": self.raster_cache_stats()}
+        return response_payload
+
+    def _render_all(
+        self, items: Sequence[BatchPrintItem], renderers: Sequence[Callable[[], RenderedPrint]]
+    ) -> list[RenderedPrint]:
+        if self.executor is None or len(renderers) < 2:
+            return [render() for render in renderers]
+        # Best By records its label spec on the shared template instance while
+        # rendering, so every item that renders it (directly or as a QR label)
+        # stays on one worker; all other items render independently.
+        qr_slug = self.best_by_template().slug
+        groups: dict[object, list[int]] = {}
+        for index, item in enumerate(items):
+            uses_best_by = item.include_qr_label or item.template.slug == qr_slug
+            groups.setdefault("best_by" if uses_best_by else index, []).append(index)
+
+        def render_group(indexes: list[int]) -> list[RenderedPrint]:
+            return [renderers[index]() for index in indexes]
+
+        futures = [
+            (indexes, submit_in_context(self.executor, render_group, indexes))
+            for indexes in groups.values()
+        ]
+        results: list[Optional[RenderedPrint]] = [None] * len(renderers)
+        for indexes, future in futures:
+            for index, result in zip(indexes, future.result()):
+                results[index] = result
+        return [result for result in results if result is not None]
+
     def _render_print_image(
         self,
         template: LabelTemplate,
@@ -84,34 +179,73 @@ class PrintDispatchService:
         *,
         include_qr_label: bool,
         include_jar_label: bool = False,
-    ) -> tuple[Image.Image, LabelMetrics, Optional[BrotherLabelSpec]]:
+    ) -> RenderedPrint:
+        return self._print_renderer(
+            template,
+            form_data,
+            include_qr_label=include_qr_label,
+            include_jar_label=include_jar_label,
+        )()
+
+    def _print_renderer(
+        self,
+        template: LabelTemplate,
+        form_data: TemplateFormData,
+        *,
+        include_qr_label: bool,
+        include_jar_label: bool = False,
+    ) -> Callable[[], RenderedPrint]:
+        """Resolve URLs and captions now and return a callable that only renders.
+
+        The URL helpers read the current request, so they must run on the calling
+        thread; the returned renderer is safe to run on a worker.
+        """
         if include_qr_label:
             print_url = self.print_url_for_template(template, form_data, prefer_preset=True)
             qr_caption = self.qr_caption_for_template(template, form_data)
-            try:
-                qr_image = self.render_qr_label_image(template, form_data, print_url, qr_caption)
-            except ValueError as exc:
-                raise self.payload_error(str(exc)) from exc
-            qr_template = self.best_by_template()
-            metrics = self.analyze_label_image(
-                qr_image, target_spec=qr_template.preferred_label_spec()
-            )
-            return qr_image, metrics, qr_template.preferred_label_spec()
+
+            def render_qr() -> RenderedPrint:
+                try:
+                    with phase("qr_render"):
+                        qr_image = self.render_qr_label_image(
+                            template, form_data, print_url, qr_caption
+                        )
+                except ValueError as exc:
+                    raise self.payload_error(str(exc)) from exc
+                qr_template = self.best_by_template()
+                metrics = self._analyze(qr_image, qr_template.preferred_label_spec())
+                return qr_image, metrics, qr_template.preferred_label_spec()
+
+            return render_qr
         if include_jar_label:
             jar_qr_url = self.jar_qr_url_for_template(template, form_data)
             jar_form_data = dict(form_data)
             jar_form_data["jar_qr_url"] = jar_qr_url
             jar_form_data["jar_label_request"] = "true"
+
+            def render_jar() -> RenderedPrint:
+                try:
+                    with phase("jar_render"):
+                        image = template.render(jar_form_data)
+                except ValueError as exc:
+                    raise self.payload_error(str(exc)) from exc
+                jar_spec = self.label_spec_from_metadata(image)
+                metrics = self._analyze(image, jar_spec)
+                return image, metrics, jar_spec
+
+            return render_jar
+
+        def render_label() -> RenderedPrint:
             try:
-                image = template.render(jar_form_data)
+                with phase("render"):
+                    image = template.render(form_data)
             except ValueError as exc:
                 raise self.payload_error(str(exc)) from exc
-            jar_spec = self.label_spec_from_metadata(image)
-            metrics = self.analyze_label_image(image, target_spec=jar_spec)
-            return image, metrics, jar_spec
-        try:
-            image = template.render(form_data)
-        except ValueError as exc:
-            raise self.payload_error(str(exc)) from exc
-        metrics = self.analyze_label_image(image, target_spec=template.preferred_label_spec())
-        return image, metrics, template.preferred_label_spec()
+            metrics = self._analyze(image, template.preferred_label_spec())
+            return image, metrics, template.preferred_label_spec()
+
+        return render_label
+
+    def _analyze(self, image: Image.Image, target_spec: Optional[BrotherLabelSpec]) -> LabelMetrics:
+        with phase("analyze"):
+            return self.analyze_label_image(image, target_spec=target_spec)
@@ -0,0 +1,222 @@
+"""In-process print spooler: one worker per printer backend, priority lanes.
+
+Every print runs on the worker for its backend, so concurrent requests from the
+dashboard and tablets no longer race on the same physical printer, and a slow
+printer does not tie up more than one thread. Callers either wait for the job
+(the synchronous print routes) or return its id and let clients poll
+``GET /jobs/<id>``.
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import queue
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 10
+PRIORITIES = {"interactive": PRIORITY_INTERACTIVE, "bulk": PRIORITY_BULK}
+
+JOB_STATES = ("queued", "rendering", "sending", "done", "failed")
+DEFAULT_MAX_QUEUED = 32
+DEFAULT_RETENTION_SECONDS = 600.0
+
+# A job reports progress ("rendering" -> "sending") through the callable it is
+# handed and returns the response payload plus the HTTP status for it.
+PrintWork = Callable[[Callable[[str], None]], tuple[dict, int]]
+
+
+class SpoolerFull(Exception):
+    """Raised when a backend already has the maximum number of queued jobs."""
+
+
+@dataclass
+class PrintJob:
+    id: str
+    backend: str
+    priority: int
+    work: PrintWork = field(repr=False)
+    state: str = "queued"
+    created_at: float = field(default_factory=time.time)
+    result: Optional[dict] = None
+    status_code: Optional[int] = None
+    error: Optional[str] = None
+    _marks: dict[str, float] = field(default_factory=dict, repr=False)
+    _finished: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def __post_init__(self) -> None:
+        self._marks["queued"] = time.monotonic()
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def mark(self, state: str) -> None:
+        if state not in JOB_STATES:
+            raise ValueError(f"Unknown print job state '{state}'.")
+        self.state = state
+        self._marks.setdefault(state, time.monotonic())
+
+    def finish(self, payload: dict, status_code: int) -> None:
+        self.result = payload
+        self.status_code = status_code
+        if status_code >= 400:
+            self.error = str(payload.get("error") or "Print failed.")
+            self.mark("failed")
+        else:
+            self.mark("done")
+        self._finished.set()
+
+    def timings(self) -> dict[str, float]:
+        """Return per-phase durations in milliseconds for the phases reached so far."""
+        marks = self._marks
+        end = marks.get("done", marks.get("failed"))
+        phases = [
+            ("queue_ms", marks["queued"], marks.get("rendering", end)),
+            ("render_ms", marks.get("rendering"), marks.get("sending", end)),
+            ("send_ms", marks.get("sending"), end),
+            ("total_ms", marks["queued"], end),
+        ]
+        return {
+            name: round((stop - start) * 1000, 1)
+            for name, start, stop in phases
+            if start is not None and stop is not None
+        }
+
+    def to_dict(self) -> dict[str, object]:
+        payload: dict[str, object] = {
+            "id": self.id,
+            "state": self.state,
+            "backend": self.backend,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "timings": self.timings(),
+        }
+        if self.finished:
+            payload["status_code"] = self.status_code
+            payload["result"] = self.result
+        if self.error:
+            payload["error"] = self.error
+        return payload
+
+
+class PrintSpooler:
+    """Bounded per-backend job queues, each drained by a single daemon worker."""
+
+    def __init__(
+        self,
+        *,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        retention_seconds: float = DEFAULT_RETENTION_SECONDS,
+    ) -> None:
+        self.max_queued = max(1, max_queued)
+        self.retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._queues: dict[str, queue.PriorityQueue[tuple[int, int, Optional[PrintJob]]]] = {}
+        self._workers: dict[str, threading.Thread] = {}
+        self._pending: dict[str, int] = {}
+        self._jobs: dict[str, PrintJob] = {}
+
+    @classmethod
+    def from_env(cls) -> "PrintSpooler":
+        return cls(max_queued=_int_from_env("PRINT_QUEUE_MAX", DEFAULT_MAX_QUEUED))
+
+    def submit(self, backend: str, work: PrintWork, *, priority: int) -> PrintJob:
+        """Queue ``work`` on ``backend``'s worker; raise SpoolerFull when saturated."""
+        job = PrintJob(id=uuid.uuid4().hex, backend=backend, priority=priority, work=work)
+        with self._lock:
+            self._prune()
+            if self._pending.get(backend, 0) >= self.max_queued:
+                raise SpoolerFull(f"Print queue for '{backend}' is full.")
+            self._pending[backend] = self._pending.get(backend, 0) + 1
+            self._jobs[job.id] = job
+            lane = self._queues.get(backend)
+            if lane is None:
+                lane = queue.PriorityQueue()
+                self._queues[backend] = lane
+                worker = threading.Thread(
+                    target=self._run,
+                    args=(backend, lane),
+                    name=f"print-spooler-{backend}",
+                    daemon=True,
+                )
+                self._workers[backend] = worker
+                worker.start()
+            lane.put((priority, next(self._sequence), job))
+        return job
+
+    def queue_depths(self) -> dict[str, int]:
+        """Return queued plus running jobs per backend."""
+        with self._lock:
+            return dict(self._pending)
+
+    def get(self, job_id: str) -> Optional[PrintJob]:
+        with self._lock:
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def shutdown(self, timeout: Optional[float] = None) -> None:
+        """Let queued jobs finish, then stop every worker."""
+        with self._lock:
+            workers = list(self._workers.values())
+            for lane in self._queues.values():
+                # Sorts after every real job because no priority is this large.
+                lane.put((2**31, next(self._sequence), None))
+            self._queues.clear()
+            self._workers.clear()
+        for worker in workers:
+            worker.join(timeout)
+
+    def _run(self, backend: str, lane: queue.PriorityQueue) -> None:
+        while True:
+            _priority, _sequence, job = lane.get()
+            if job is None:
+                return
+            try:
+                job.mark("rendering")
+                payload, status_code = job.work(job.mark)
+            except Exception as exc:
+                payload, status_code = {"error": f"Print failed: {exc}"}, 500
+            finally:
+                with self._lock:
+                    self._pending[backend] -= 1
+            job.finish(payload, status_code)
+
+    def _prune(self) -> None:
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, job in self._jobs.items() if job.finished and job.created_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+def _int_from_env(name: str, default: int) -> int:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return int(raw)
+    except ValueError:
+        return default
+
+
+__all__ = [
+    "JOB_STATES",
+    "PRIORITIES",
+    "PRIORITY_BULK",
+    "PRIORITY_INTERACTIVE",
+    "PrintJob",
+    "PrintSpooler",
+    "PrintWork",
+    "SpoolerFull",
+]
@@ -0,0 +1,428 @@
+"""Production serving helpers: HTTP/1.1 keep-alive and a pre-fork worker pool.
+
+``_serve_production`` binds the listening socket once. With ``PRINTER_WORKERS``
+above 1 it forks that many workers, which all accept on the inherited socket, so
+Pillow renders in one worker do not hold the GIL of another. Each worker runs its
+own warm-up after the fork; fonts, symbol rasters, render caches and the Mongo
+client are therefore per worker and never shared across a fork. The parent only
+supervises: it restarts workers that die and, on SIGTERM/SIGINT, forwards the
+signal and waits for every worker to finish its graceful shutdown.
+
+State that must be single-owner lives in worker 0, the primary: the print
+spooler, the printer connection, job status and ``/metrics``. The parent binds
+a loopback socket for it before forking (:class:`WorkerGroup`), and the other
+workers relay those routes to it with :class:`PrimaryForwarder`. The group's
+scratch directory holds what every worker shares on disk: preview images and
+the metrics snapshots the primary merges into its scrape.
+"""
+
+from __future__ import annotations
+
+import http.client
+import io
+import json
+import os
+import shutil
+import signal
+import tempfile
+import time
+import traceback
+from email.message import Message
+from typing import IO, TYPE_CHECKING, Any, Callable, Iterable, Mapping, Optional, Sequence, cast
+from urllib.parse import quote
+
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler, make_server
+from werkzeug.wsgi import LimitedStream
+
+if TYPE_CHECKING:
+    from _typeshed.wsgi import StartResponse, WSGIApplication, WSGIEnvironment
+
+DEFAULT_KEEPALIVE_SECONDS = 15.0
+DEFAULT_SHUTDOWN_TIMEOUT_SECONDS = 40.0
+# Wait this long before restarting a worker that exited on its own, so a worker
+# that crashes during start-up does not spin the CPU.
+RESPAWN_DELAY_SECONDS = 1.0
+_SHUTDOWN_SIGNALS = (signal.SIGTERM, signal.SIGINT)
+# A forwarded print waits for the label to come out of the printer.
+FORWARD_TIMEOUT_SECONDS = 300.0
+# Hop-by-hop headers, plus those the relaying worker's server sets itself.
+_UNFORWARDED_HEADERS = frozenset(
+    {
+        "connection",
+        "content-length",
+        "date",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "server",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    }
+)
+
+LifecycleEmitter = Callable[[dict[str, object]], None]
+
+
+def keepalive_seconds_from_env() -> float:
+    """Idle seconds before a keep-alive connection is closed; ``0`` disables keep-alive."""
+    raw = os.getenv("PRINTER_KEEPALIVE_SECONDS")
+    if raw is None or not raw.strip():
+        return DEFAULT_KEEPALIVE_SECONDS
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return DEFAULT_KEEPALIVE_SECONDS
+
+
+def workers_from_env() -> int:
+    """Number of serving processes; ``1`` serves in-process without forking."""
+    raw = os.getenv("PRINTER_WORKERS")
+    if raw is None or not raw.strip():
+        return 1
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return 1
+
+
+def request_handler(keepalive_seconds: float) -> type[WSGIRequestHandler]:
+    """Return a request handler that keeps HTTP/1.1 connections open while idle.
+
+    Werkzeug's handler sends ``Connection: close`` on every response and then
+    reads the socket until EOF to discard any unread body, which would swallow
+    the next request on a persistent connection. This handler gives the
+    application a body limited to ``Content-Length``, points Werkzeug's discard
+    loop at an empty stream, and drains the unread part of the body itself.
+    Chunked uploads still close the connection. With ``keepalive_seconds`` of
+    ``0`` Werkzeug's handler is returned unchanged.
+    """
+    if keepalive_seconds <= 0:
+        return WSGIRequestHandler
+
+    class KeepAliveRequestHandler(WSGIRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Applied to the connection socket; an idle client is dropped after this.
+        timeout = keepalive_seconds
+        _body: Optional[LimitedStream] = None
+
+        def run_wsgi(self) -> None:
+            length = _content_length(self.headers)
+            if length is None:
+                # Chunked or malformed body: keep Werkzeug's read-to-EOF close path.
+                super().run_wsgi()
+                return
+            body = LimitedStream(cast("IO[bytes]", self.rfile), length)
+            connection_stream, self.rfile = self.rfile, io.BytesIO()
+            self._body = body
+            try:
+                # Werkzeug's post-response discard loop reads ``self.rfile``; it
+                # now sees EOF instead of the next request on this connection.
+                super().run_wsgi()
+            finally:
+                self.rfile = connection_stream
+                self._body = None
+            if not self.close_connection:
+                body.exhaust()
+
+        def make_environ(self) -> WSGIEnvironment:
+            environ = super().make_environ()
+            if self._body is not None:
+                environ["wsgi.input"] = self._body
+            return environ
+
+        def send_header(self, keyword: str, value: str) -> None:
+            if self._body is not None and keyword.lower() == "connection" and value == "close":
+                return
+            super().send_header(keyword, value)
+
+    return KeepAliveRequestHandler
+
+
+def serve_prefork(
+    workers: int,
+    run_worker: Callable[[int], None],
+    emit_lifecycle_event: LifecycleEmitter,
+    *,
+    shutdown_timeout: float = DEFAULT_SHUTDOWN_TIMEOUT_SECONDS,
+) -> None:
+    """Fork ``workers`` processes running ``run_worker(index)`` and supervise them.
+
+    Returns once every worker has exited after SIGTERM/SIGINT. Workers still
+    running ``shutdown_timeout`` seconds after the signal are killed.
+    """
+    children: dict[int, int] = {}
+    shutdown_started: Optional[float] = None
+
+    def spawn(index: int) -> None:
+        # Hold shutdown signals across the fork so neither process can run the
+        # supervisor's handler before the child has installed its own.
+        signal.pthread_sigmask(signal.SIG_BLOCK, _SHUTDOWN_SIGNALS)
+        pid = os.fork()
+        if pid == 0:
+            status = 0
+            try:
+                for shutdown_signal in _SHUTDOWN_SIGNALS:
+                    signal.signal(shutdown_signal, signal.SIG_DFL)
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, _SHUTDOWN_SIGNALS)
+                run_worker(index)
+            except BaseException:
+                status = 1
+                traceback.print_exc()
+            finally:
+                os._exit(status)
+        children[pid] = index
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, _SHUTDOWN_SIGNALS)
+
+    def handle_shutdown(received_signal: int, _frame: object) -> None:
+        nonlocal shutdown_started
+        if shutdown_started is not None:
+            return
+        shutdown_started = time.monotonic()
+        emit_lifecycle_event(
+            {
+                "event": "service.shutdown.started",
+                "service": "printer-service",
+                "signal": signal.Signals(received_signal).name,
+                "pid": os.getpid(),
+                "workers": len(children),
+            }
+        )
+        for pid in list(children):
+            _signal_child(pid, signal.SIGTERM)
+
+    previous_handlers = {
+        shutdown_signal: signal.signal(shutdown_signal, handle_shutdown)
+        for shutdown_signal in _SHUTDOWN_SIGNALS
+    }
+    try:
+        for index in range(workers):
+            spawn(index)
+        emit_lifecycle_event(
+            {
+                "event": "service.supervisor.started",
+                "service": "printer-service",
+                "pid": os.getpid(),
+                "workers": sorted(children),
+            }
+        )
+        while children:
+            pid, status = os.waitpid(-1, os.WNOHANG)
+            if pid == 0:
+                if (
+                    shutdown_started is not None
+                    and time.monotonic() - shutdown_started > shutdown_timeout
+                ):
+                    for straggler in list(children):
+                        _signal_child(straggler, signal.SIGKILL)
+                time.sleep(0.1)
+                continue
+            if pid not in children:
+                continue
+            index = children.pop(pid)
+            if shutdown_started is not None:
+                continue
+            emit_lifecycle_event(
+                {
+                    "event": "service.worker.exited",
+                    "service": "printer-service",
+                    "pid": pid,
+                    "worker": index,
+                    "exit_code": os.waitstatus_to_exitcode(status),
+                }
+            )
+            time.sleep(RESPAWN_DELAY_SECONDS)
+            if shutdown_started is None:
+                spawn(index)
+    finally:
+        for shutdown_signal, previous_handler in previous_handlers.items():
+            signal.signal(shutdown_signal, previous_handler)
+    if shutdown_started is not None:
+        emit_lifecycle_event(
+            {
+                "event": "service.shutdown.completed",
+                "service": "printer-service",
+                "elapsedMs": round((time.monotonic() - shutdown_started) * 1000),
+                "status": "ok",
+            }
+        )
+
+
+class WorkerGroup:
+    """What pre-fork workers share: a scratch directory and the primary's socket.
+
+    Create it in the parent before forking. ``worker`` is set by each worker
+    after the fork; the copy in every process is its own.
+    """
+
+    PRIMARY = 0
+
+    def __init__(self, directory: str, primary_server: BaseWSGIServer) -> None:
+        self.directory = directory
+        self.primary_server = primary_server
+        self.worker = self.PRIMARY
+
+    @classmethod
+    def create(
+        cls, app: WSGIApplication, handler: type[WSGIRequestHandler] = WSGIRequestHandler
+    ) -> WorkerGroup:
+        directory = tempfile.mkdtemp(prefix="printer-service-")
+        try:
+            server = make_server("127.0.0.1", 0, app, threaded=True, request_handler=handler)
+        except BaseException:
+            shutil.rmtree(directory, ignore_errors=True)
+            raise
+        return cls(directory, server)
+
+    @property
+    def is_primary(self) -> bool:
+        return self.worker == self.PRIMARY
+
+    @property
+    def primary_address(self) -> tuple[str, int]:
+        return "127.0.0.1", self.primary_server.server_port
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def write_snapshot(self, snapshot: Mapping[str, object]) -> None:
+        """Publish this worker's metrics snapshot for the primary to merge."""
+        path = self.path(f"metrics-{self.worker}.json")
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as handle:
+            json.dump(snapshot, handle)
+        os.replace(temporary, path)
+
+    def peer_snapshots(self) -> list[dict[str, Any]]:
+        """Return the latest snapshot of every other worker that has written one."""
+        snapshots: list[dict[str, Any]] = []
+        for name in sorted(os.listdir(self.directory)):
+            if not (name.startswith("metrics-") and name.endswith(".json")):
+                continue
+            if name == f"metrics-{self.worker}.json":
+                continue
+            try:
+                with open(self.path(name), encoding="utf-8") as handle:
+                    snapshot = json.load(handle)
+            except OSError, ValueError:
+                continue
+            if isinstance(snapshot, dict):
+                snapshots.append(snapshot)
+        return snapshots
+
+    def close(self) -> None:
+        self.primary_server.server_close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class PrimaryForwarder:
+    """WSGI middleware relaying requests under ``prefixes`` to the primary worker.
+
+    Paths are matched after removing the ``X-Ingress-Path`` prefix; the request
+    is forwarded unchanged, so the primary sees the same path, headers and body.
+    """
+
+    def __init__(
+        self,
+        app: WSGIApplication,
+        address: tuple[str, int],
+        prefixes: Sequence[str],
+        *,
+        timeout: float = FORWARD_TIMEOUT_SECONDS,
+    ) -> None:
+        self.app = app
+        self.address = address
+        self.prefixes = tuple(prefixes)
+        self.timeout = timeout
+
+    def __call__(self, environ: WSGIEnvironment, start_response: StartResponse) -> Iterable[bytes]:
+        if not self._pinned(environ):
+            return self.app(environ, start_response)
+        try:
+            status, headers, body = self._forward(environ)
+        except OSError as exc:
+            body = json.dumps({"error": f"Print worker unavailable: {exc}"}).encode()
+            status = "503 Service Unavailable"
+            headers = [
+                ("Content-Type", "application/json"),
+                ("Retry-After", "1"),
+            ]
+        start_response(status, [*headers, ("Content-Length", str(len(body)))])
+        return [body]
+
+    def _pinned(self, environ: WSGIEnvironment) -> bool:
+        path = environ.get("PATH_INFO", "")
+        prefix = environ.get("HTTP_X_INGRESS_PATH", "").rstrip("/")
+        if prefix and path.startswith(prefix):
+            path = path[len(prefix) :] or "/"
+        return any(
+            path == pinned.rstrip("/") or path.startswith(pinned.rstrip("/") + "/")
+            for pinned in self.prefixes
+        )
+
+    def _forward(self, environ: WSGIEnvironment) -> tuple[str, list[tuple[str, str]], bytes]:
+        length = _content_length_from_environ(environ)
+        payload = environ["wsgi.input"].read(length) if length else b""
+        headers = {
+            key[5:].replace("_", "-").title(): value
+            for key, value in environ.items()
+            if key.startswith("HTTP_")
+            and key[5:].replace("_", "-").lower() not in _UNFORWARDED_HEADERS
+        }
+        if environ.get("CONTENT_TYPE"):
+            headers["Content-Type"] = environ["CONTENT_TYPE"]
+        target = environ.get("REQUEST_URI") or environ.get("RAW_URI") or _request_target(environ)
+        host, port = self.address
+        connection = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        try:
+            connection.request(environ["REQUEST_METHOD"], target, payload, headers)
+            response = connection.getresponse()
+            body = response.read()
+        finally:
+            connection.close()
+        forwarded = [
+            (name, value)
+            for name, value in response.getheaders()
+            if name.lower() not in _UNFORWARDED_HEADERS
+        ]
+        return f"{response.status} {response.reason}", forwarded, body
+
+
+def _request_target(environ: WSGIEnvironment) -> str:
+    path = quote(environ.get("SCRIPT_NAME", "") + environ.get("PATH_INFO", "")) or "/"
+    query = environ.get("QUERY_STRING")
+    return f"{path}?{query}" if query else path
+
+
+def _content_length_from_environ(environ: WSGIEnvironment) -> int:
+    try:
+        return max(0, int(environ.get("CONTENT_LENGTH") or 0))
+    except ValueError:
+        return 0
+
+
+def _content_length(headers: Message) -> Optional[int]:
+    if "chunked" in headers.get("Transfer-Encoding", "").lower():
+        return None
+    try:
+        return max(0, int(headers.get("Content-Length") or 0))
+    except ValueError:
+        return None
+
+
+def _signal_child(pid: int, sent_signal: signal.Signals) -> None:
+    try:
+        os.kill(pid, sent_signal)
+    except ProcessLookupError:
+        pass
+
+
+__all__ = [
+    "PrimaryForwarder",
+    "WorkerGroup",
+    "keepalive_seconds_from_env",
+    "request_handler",
+    "serve_prefork",
+    "workers_from_env",
+]
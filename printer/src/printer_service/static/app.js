@@ -20,6 +20,7 @@ const savePresetButton = document.getElementById('savePresetButton');
 const presetStatus = document.getElementById('presetStatus');
 const presetListBody = document.getElementById('presetListBody');
 const presetEmpty = document.getElementById('presetEmpty');
+const presetMoreButton = document.getElementById('presetMoreButton');
 const presetSortButtons = Array.from(document.querySelectorAll('[data-preset-sort]'));
 const presetSortHeaders = Array.from(document.querySelectorAll('[data-preset-sort-header]'));
 const backButton = document.getElementById('backButton');
@@ -33,7 +34,11 @@ const THEME_STORAGE_KEY = 'printer-theme';
 const THEME_OPTIONS = ['light', 'dark', 'system'];
 const PRESET_EMPTY_MESSAGE = 'No presets saved yet.';
 const presetSortState = { key: 'created', direction: 'desc' };
+// The table never shows params, so the list request leaves them out.
+const PRESET_LIST_FIELDS = 'name,template,created_at,print_count';
+const PRESET_PAGE_SIZE = 50;
 let presetLoadSequence = 0;
+let presetNextCursor = null;
 
 // Countdown functionality
 let countdownTimer = null;
@@ -574,12 +579,17 @@ const BASE_PATH = (() => {
     return '';
 })();
 
+function resolveAppUrl(url) {
+    if (/^(https?:|data:)/.test(url)) {
+        return url;
+    }
+    const prefix = BASE_PATH || '';
+    return `${prefix}${url.startsWith('/') ? '' : '/'}${url}`;
+}
+
 async function requestJson(url, options) {
     const normalized = normalizeRequestOptions(options);
-    const prefix = BASE_PATH || '';
-    const requestUrl = url.startsWith('http')
-        ? url
-        : `${prefix}${url.startsWith('/') ? '' : '/'}${url}`;
+    const requestUrl = resolveAppUrl(url);
     let response;
     try {
         response = await fetch(requestUrl, normalized.fetchOptions);
@@ -805,16 +815,28 @@ function renderPresets(presets) {
     });
 }
 
-async function loadPresets() {
+function updatePresetMoreButton() {
+    if (presetMoreButton) {
+        presetMoreButton.hidden = !presetNextCursor;
+    }
+}
+
+async function loadPresets(options) {
     if (!presetPanel) {
         return;
     }
+    const append = Boolean(options && options.append && presetNextCursor);
     const loadSequence = ++presetLoadSequence;
     setPresetStatus('Loading presets...', false);
     const query = new URLSearchParams({
         sort: presetSortState.key,
         direction: presetSortState.direction,
+        limit: String(PRESET_PAGE_SIZE),
+        fields: PRESET_LIST_FIELDS,
     });
+    if (append) {
+        query.set('after', presetNextCursor);
+    }
     const result = await requestJson(`/presets?${query.toString()}`);
     if (loadSequence !== presetLoadSequence) {
         return;
@@ -822,15 +844,28 @@ async function loadPresets() {
     if (!result.ok) {
         const message = result.error || 'Presets unavailable.';
         setPresetStatus(message, true);
-        setPresetEmpty(message);
-        if (presetListBody) {
-            presetListBody.innerHTML = '';
+        if (!append) {
+            setPresetEmpty(message);
+            presetNextCursor = null;
+            if (presetListBody) {
+                presetListBody.innerHTML = '';
+            }
         }
+        updatePresetMoreButton();
         return;
     }
     setPresetStatus('', false);
     const payload = result.data || {};
-    renderPresets(payload.presets || []);
+    const presets = payload.presets || [];
+    if (append && presetListBody) {
+        presets.forEach((preset) => {
+            presetListBody.appendChild(renderPresetRow(preset));
+        });
+    } else {
+        renderPresets(presets);
+    }
+    presetNextCursor = payload.next_cursor || null;
+    updatePresetMoreButton();
 }
 
 async function handleSavePreset() {
@@ -896,6 +931,11 @@ function initPresets() {
             changePresetSort(button.dataset.presetSort);
         });
     });
+    if (presetMoreButton) {
+        presetMoreButton.addEventListener('click', () => {
+            loadPresets({ append: true });
+        });
+    }
     updatePresetSortHeaders();
     loadPresets();
 }
@@ -972,9 +1012,9 @@ function updatePreviewImage(target, payload) {
     if (!target) {
         return;
     }
-    const imageData = payload && payload.image;
-    if (imageData) {
-        target.src = imageData;
+    const imageUrl = payload && payload.image;
+    if (imageUrl) {
+        target.src = resolveAppUrl(imageUrl);
         target.hidden = false;
         target.dataset.hasPreview = 'true';
         target.classList.remove('preview-image--loading');
@@ -0,0 +1,93 @@
+"""Per-request phase timings for the preview and print hot paths.
+
+A route binds a :class:`PhaseTimings` with :func:`collecting`. Code anywhere
+below it wraps its work in ``with phase("render"):`` and the duration is added
+to that request's totals. Without a bound collector :func:`phase` only reads a
+context variable, so library code can be instrumented unconditionally. Work
+handed to an executor keeps recording into the same collector when submitted
+through :func:`submit_in_context`.
+
+Phases that run concurrently (the preview renders label, QR and jar images on a
+pool) are summed, so the totals can exceed the request's wall time.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future
+from contextlib import contextmanager
+from typing import Callable, Optional, ParamSpec, TypeVar
+
+_P = ParamSpec("_P")
+_T = TypeVar("_T")
+
+_ACTIVE: contextvars.ContextVar[Optional["PhaseTimings"]] = contextvars.ContextVar(
+    "printer_service_phase_timings", default=None
+)
+
+
+class PhaseTimings:
+    """Thread-safe millisecond totals per phase name, in first-seen order."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._totals: dict[str, float] = {}
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self._totals[name] = self._totals.get(name, 0.0) + elapsed_ms
+
+    def to_dict(self) -> dict[str, float]:
+        with self._lock:
+            return {f"{name}_ms": round(total, 2) for name, total in self._totals.items()}
+
+    def server_timing(self) -> str:
+        """Return the value for a ``Server-Timing`` response header."""
+        with self._lock:
+            return ", ".join(f"{name};dur={total:.2f}" for name, total in self._totals.items())
+
+
+@contextmanager
+def collecting(timings: PhaseTimings) -> Iterator[PhaseTimings]:
+    """Record every :func:`phase` in this context (and copies of it) into ``timings``."""
+    token = _ACTIVE.set(timings)
+    try:
+        yield timings
+    finally:
+        _ACTIVE.reset(token)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    timings = _ACTIVE.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.record(name, (time.perf_counter() - started) * 1000)
+
+
+def submit_in_context(
+    executor: Executor, fn: Callable[_P, _T], *args: _P.args, **kwargs: _P.kwargs
+) -> Future[_T]:
+    """``executor.submit`` that keeps the caller's phase collector on the worker."""
+    context = contextvars.copy_context()
+
+    def run() -> _T:
+        return context.run(fn, *args, **kwargs)
+
+    return executor.submit(run)
+
+
+__all__ = [
+    "PhaseTimings",
+    "collecting",
+    "phase",
+    "submit_in_context",
+]
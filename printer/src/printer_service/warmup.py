@@ -0,0 +1,152 @@
+"""Startup warm-up run while the production server starts accepting traffic.
+
+Fonts, SVG rasters, QR generation and the Mongo preset store are all
+initialised lazily, so without a warm-up the first preview after a deploy pays
+for every one of them. ``_serve_worker`` runs the steps below on a background
+thread next to ``serve_forever`` and ``GET /health/ready`` answers ``503``
+until they finish.
+The preset store connects on a background bootstrap started just before the
+steps, so the ``presets`` step only waits for whatever is left of it, and for
+at most ``PRESET_BOOTSTRAP_WAIT_SECONDS``.
+A failing step is recorded in the report but never keeps the service down.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import Callable, Optional, Sequence
+
+from . import label_templates
+from .label_templates import LabelTemplate, TemplateFormData
+from .presets import wait_for_store_bootstrap
+
+DEFAULT_STORE_WAIT_SECONDS = 10.0
+
+
+@dataclass(frozen=True)
+class WarmupStep:
+    name: str
+    run: Callable[[], object]
+
+
+@dataclass(frozen=True)
+class WarmupReport:
+    total_ms: float
+    steps_ms: dict[str, float]
+    errors: dict[str, str]
+    # Non-``None`` step return values, e.g. the font report.
+    results: dict[str, object]
+
+    def to_dict(self) -> dict[str, object]:
+        return {"total_ms": self.total_ms, "steps_ms": self.steps_ms, "errors": self.errors}
+
+
+class WarmupState:
+    """Readiness flag shared between the warm-up and ``/health/ready``.
+
+    Apps that never run a warm-up (tests, ``flask run``) stay ``idle`` and
+    count as ready.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._status = "idle"
+        self._report: Optional[WarmupReport] = None
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return self._status != "warming"
+
+    def begin(self) -> None:
+        with self._lock:
+            self._status = "warming"
+            self._report = None
+
+    def finish(self, report: WarmupReport) -> None:
+        with self._lock:
+            self._status = "ready"
+            self._report = report
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "ready": self._status != "warming",
+                "status": self._status,
+                "warmup": self._report.to_dict() if self._report is not None else None,
+            }
+
+
+def default_steps() -> list[WarmupStep]:
+    """Import templates, load fonts, render every template and open the preset store."""
+    steps = [
+        WarmupStep("templates", label_templates.preload),
+        WarmupStep("fonts", label_templates.preload_fonts),
+    ]
+    for template in label_templates.all_templates():
+        steps.append(WarmupStep(f"render.{template.slug}", partial(_render_template, template)))
+    steps.append(WarmupStep("presets", _touch_preset_store))
+    return steps
+
+
+def run_warmup(state: WarmupState, steps: Sequence[WarmupStep]) -> WarmupReport:
+    """Run ``steps`` in order; ``state`` reports not-ready for the whole run."""
+    state.begin()
+    started = time.perf_counter()
+    timings: dict[str, float] = {}
+    results: dict[str, object] = {}
+    errors: dict[str, str] = {}
+    try:
+        for step in steps:
+            step_started = time.perf_counter()
+            try:
+                result = step.run()
+            except Exception as exc:
+                errors[step.name] = f"{type(exc).__name__}: {exc}"
+            else:
+                if result is not None:
+                    results[step.name] = result
+            timings[step.name] = _elapsed_ms(step_started)
+    finally:
+        report = WarmupReport(
+            total_ms=_elapsed_ms(started),
+            steps_ms=timings,
+            errors=errors,
+            results=results,
+        )
+        state.finish(report)
+    return report
+
+
+def _render_template(template: LabelTemplate) -> None:
+    # Render outside the shared render cache so warm-up payloads never occupy it.
+    for form_data in template.warmup_form_data():
+        template.implementation.render(TemplateFormData(form_data))
+
+
+def _touch_preset_store() -> None:
+    # An unreachable store must not hold readiness for the whole connect timeout.
+    timeout = _float_from_env("PRESET_BOOTSTRAP_WAIT_SECONDS", DEFAULT_STORE_WAIT_SECONDS)
+    if timeout > 0:
+        wait_for_store_bootstrap(timeout)
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _float_from_env(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        return float(raw)
+    except ValueError:
+        return default
+
+
+__all__ = ["WarmupReport", "WarmupState", "WarmupStep", "default_steps", "run_warmup"]
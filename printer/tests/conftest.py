@@ -5,6 +5,7 @@ import sys
 import types
 from typing import Optional
 
+import pytest
 from PIL import Image
 
 
@@ -60,3 +61,31 @@ def pytest_addoption(parser):
         default=False,
         help="Regenerate all baseline images for visual regression tests",
     )
+    parser.addoption(
+        "--benchmark",
+        action="store_true",
+        default=False,
+        help="Run the render benchmarks and compare them against their baseline",
+    )
+    parser.addoption(
+        "--regenerate-benchmarks",
+        action="store_true",
+        default=False,
+        help="Run the render benchmarks and rewrite their baseline",
+    )
+    parser.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=0.25,
+        help="Fractional slowdown or allocation growth that fails a benchmark",
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmarks unless they were asked for; they are slow and host-dependent."""
+    if config.getoption("--benchmark") or config.getoption("--regenerate-benchmarks"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="pass --benchmark to run render benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
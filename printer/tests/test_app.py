@@ -2,8 +2,12 @@ from __future__ import annotations
 
 import importlib
 import io
+import os
 import sys
+import threading
+import time
 import types
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Tuple
@@ -17,12 +21,15 @@ from printer_service.label_specs import BrotherLabelSpec, resolve_brother_label_
 from printer_service.label_templates import bluey_label as bluey_module
 from printer_service.label_templates.base import TemplateFormData
 import printer_service.presets as presets
+from printer_service.preview_images import PreviewImageStore
 from printer_service.presets import (
     Preset,
+    PresetPage,
     canonical_query_string,
     normalize_template_slug,
     slug_for_params,
 )
+from printer_service.serving import WorkerGroup
 
 TEST_LABEL_CODE = "29x90"
 TEST_LABEL_SPEC = resolve_brother_label_spec(TEST_LABEL_CODE)
@@ -40,8 +47,14 @@ class FakePresetStore:
         self._presets: dict[str, Preset] = {}
 
     def list_presets(
-        self, *, sort_by: str = "created", direction: str = "desc", limit: int = 200
-    ) -> list[Preset]:
+        self,
+        *,
+        sort_by: str = "created",
+        direction: str = "desc",
+        limit: int = 200,
+        after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> PresetPage:
         presets = list(self._presets.values())
         sort_attributes = {
             "name": "name",
@@ -54,7 +67,15 @@ class FakePresetStore:
         attribute = sort_attributes.get(sort_by, "created_at")
         reverse = direction != "asc"
         presets.sort(key=lambda preset: getattr(preset, attribute), reverse=reverse)
-        return presets[:limit]
+        if after is not None and not after.isdigit():
+            raise ValueError("Invalid preset cursor.")
+        start = int(after or 0)
+        end = start + limit
+        next_cursor = str(end) if end < len(presets) else None
+        return PresetPage(presets[start:end], next_cursor)
+
+    def presets_version(self) -> str:
+        return repr(sorted((p.slug, p.updated_at, p.print_count) for p in self._presets.values()))
 
     def find_by_slug(self, slug: str) -> Preset | None:
         return self._presets.get(slug)
@@ -103,6 +124,10 @@ class FakePresetStore:
         self._presets[slug] = preset
         return preset
 
+    def record_print_later(self, slug: str, count: int = 1) -> None:
+        for _ in range(count):
+            self.record_print(slug)
+
     def seed_preset(
         self,
         *,
@@ -200,7 +225,7 @@ def _use_fake_preset_store(
 ) -> None:
     presets.reset_cached_store()
     monkeypatch.setattr(
-        app_module.PresetStore,
+        presets.PresetStore,
         "from_env",
         classmethod(lambda cls: store),
     )
@@ -210,7 +235,7 @@ def test_mongo_health_route_checks_mongo_once(tmp_path, monkeypatch):
     app_module, _, flask_app, _, _ = _build_test_environment(tmp_path, monkeypatch)
     checks = []
 
-    def fake_mongo_health():
+    def fake_mongo_health(**_kwargs):
         checks.append(True)
         return {"configured": True, "ok": True, "host": "local-mongodb"}
 
@@ -269,8 +294,8 @@ def test_bb_preview_returns_dual_images(test_environment: Tuple) -> None:
     payload = response.json
     assert payload["status"] == "preview"
     assert payload["template"] == template_slug
-    assert payload["label"]["image"].startswith("data:image/png;base64,")
-    assert payload["qr"]["image"].startswith("data:image/png;base64,")
+    assert payload["label"]["image"].startswith("/bb/preview/img/")
+    assert payload["qr"]["image"].startswith("/bb/preview/img/")
     metrics = payload["label"]["metrics"]
     assert metrics["width_px"] == BLUEY_EXPECTED_CANVAS[0]
     assert metrics["height_px"] == BLUEY_EXPECTED_CANVAS[1]
@@ -278,6 +303,221 @@ def test_bb_preview_returns_dual_images(test_environment: Tuple) -> None:
     assert metrics["height_in"] == pytest.approx(BLUEY_EXPECTED_HEIGHT_IN, rel=0, abs=0.01)
 
 
+def test_repeated_preview_is_served_from_render_cache(test_environment: Tuple) -> None:
+    _, templates_module, flask_app, _labels_dir, _ = test_environment
+    client = flask_app.test_client()
+    request_payload = {"template": "bluey_label", "data": {"Line1": "Alpha"}}
+
+    first = client.post("/bb/preview", json=request_payload)
+    before = templates_module.render_cache_stats()
+    second = client.post("/bb/preview", json=request_payload)
+    after = templates_module.render_cache_stats()
+
+    assert first.status_code == second.status_code == 200
+    assert first.get_json()["label"] == second.get_json()["label"]
+    assert after["hits"] > before["hits"]
+    stats = client.get("/health/caches").get_json()
+    assert stats["render"]["hits"] == after["hits"]
+
+
+def test_preview_reports_phase_timings(test_environment: Tuple) -> None:
+    _, _templates_module, flask_app, _labels_dir, _ = test_environment
+    client = flask_app.test_client()
+    request_payload = {"template": "bluey_label", "data": {"Line1": "Alpha"}}
+
+    plain = client.post("/bb/preview", json=request_payload)
+    timed = client.post("/bb/preview", json={**request_payload, "timings": True})
+
+    assert "timings" not in plain.get_json()
+    for name in ("render", "qr_render", "encode", "preset_lookup"):
+        assert f"{name};dur=" in plain.headers["Server-Timing"]
+    assert {"render_ms", "qr_render_ms", "analyze_ms", "encode_ms"} <= set(
+        timed.get_json()["timings"]
+    )
+
+
+def test_print_reports_send_and_record_print_timings(test_environment: Tuple) -> None:
+    _, _templates_module, flask_app, _labels_dir, _ = test_environment
+    client = flask_app.test_client()
+
+    response = client.post(
+        "/bb/print",
+        json={"template": "bluey_label", "data": {"Line1": "Alpha"}, "timings": True},
+    )
+
+    assert response.status_code == 200
+    assert {"render_ms", "send_ms", "record_print_ms"} <= set(response.get_json()["timings"])
+    assert "send;dur=" in response.headers["Server-Timing"]
+
+
+def test_metrics_endpoint_reports_latency_renders_and_caches(test_environment: Tuple) -> None:
+    _, _templates_module, flask_app, _labels_dir, _ = test_environment
+    client = flask_app.test_client()
+    request_payload = {"template": "bluey_label", "data": {"Line1": "Metrics"}}
+    client.post("/bb/preview", json=request_payload)
+    client.post("/bb/print", json=request_payload)
+
+    response = client.get("/metrics")
+    text = response.get_data(as_text=True)
+
+    assert response.status_code == 200
+    assert response.content_type.startswith("text/plain; version=0.0.4")
+    assert (
+        'printer_http_request_duration_seconds_count{route="/bb/preview",method="POST",status="200"}'
+        in text
+    )
+    assert 'printer_label_render_seconds_count{template="bluey_label"}' in text
+    assert 'printer_dispatch_duration_seconds_count{backend="file"}' in text
+    assert 'printer_print_queue_depth{backend="file"} 0' in text
+    for cache in ("font", "qr", "render", "svg_pack", "svg_raster"):
+        assert f'printer_cache_hit_ratio{{cache="{cache}"}}' in text
+
+
+def test_metrics_endpoint_adds_other_workers_snapshots(test_environment: Tuple) -> None:
+    app_module, _templates_module, flask_app, _labels_dir, _ = test_environment
+    group = WorkerGroup.create(flask_app)
+    try:
+        flask_app.extensions["worker_group"] = group
+        group.worker = 1
+        group.write_snapshot(
+            {
+                "registry": {"printer_mongo_operation_errors_total": [[["peer_find"], 4]]},
+                "caches": {"qr": [7, 0], "unknown": [1, 1]},
+            }
+        )
+        group.worker = WorkerGroup.PRIMARY
+        qr_hits = app_module._cache_counts()["qr"][0]
+
+        text = flask_app.test_client().get("/metrics").get_data(as_text=True)
+    finally:
+        flask_app.extensions.pop("worker_group", None)
+        group.close()
+
+    assert 'printer_mongo_operation_errors_total{operation="peer_find"} 4' in text
+    assert f'printer_cache_hits_total{{cache="qr"}} {qr_hits + 7}' in text
+    assert 'cache="unknown"' not in text
+
+
+def test_font_health_reports_preloaded_sizes(test_environment: Tuple) -> None:
+    _, templates_module, flask_app, _labels_dir, _ = test_environment
+    declared = {
+        size for template in templates_module.all_templates() for size in template.font_sizes()
+    }
+
+    templates_module.preload_fonts()
+    report = flask_app.test_client().get("/health/fonts").get_json()
+
+    assert declared
+    assert declared <= set(report["sizes"])
+    assert report["path"] or report["fallback"]
+
+
+def test_preview_images_are_served_with_strong_etags(test_environment: Tuple) -> None:
+    _, _templates_module, flask_app, _labels_dir, _ = test_environment
+    client = flask_app.test_client()
+
+    preview = client.post(
+        "/bb/preview", json={"template": "bluey_label", "data": {"Line1": "Alpha"}}
+    ).get_json()
+    image_url = preview["label"]["image"]
+    digest = image_url.removeprefix("/bb/preview/img/").removesuffix(".png")
+
+    response = client.get(image_url)
+    assert response.status_code == 200
+    assert response.mimetype == "image/png"
+    assert response.headers["ETag"] == f'"{digest}"'
+    assert Image.open(io.BytesIO(response.data)).size == BLUEY_EXPECTED_CANVAS
+
+    cached = client.get(image_url, headers={"If-None-Match": f'"{digest}"'})
+    assert cached.status_code == 304
+    assert cached.data == b""
+
+    assert client.get("/bb/preview/img/" + "0" * len(digest) + ".png").status_code == 404
+    assert client.get("/bb/preview/img/not-a-digest.png").status_code == 404
+
+
+def test_preview_images_are_shared_through_a_directory(tmp_path: Path) -> None:
+    shared = tmp_path / "preview-images"
+    rendering, serving_worker = PreviewImageStore(), PreviewImageStore()
+    rendering.share_directory(str(shared))
+    serving_worker.share_directory(str(shared))
+
+    digest = rendering.put(b"png-bytes")
+
+    assert serving_worker.get(digest) == b"png-bytes"
+    assert serving_worker.stats()["hits"] == 1
+    expired = time.time() - rendering.ttl_seconds - 1
+    os.utime(shared / f"{digest}.png", (expired, expired))
+    assert serving_worker.get(digest) is None
+
+
+def test_shared_preview_directory_keeps_the_byte_budget(tmp_path: Path) -> None:
+    store = PreviewImageStore(max_bytes=10, clock=iter(range(0, 100, 5)).__next__)
+    store.share_directory(str(tmp_path))
+
+    first = store.put(b"a" * 6)
+    os.utime(tmp_path / f"{first}.png", (time.time() - 5, time.time() - 5))
+    second = store.put(b"b" * 6)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [f"{second}.png"]
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"Line1": "Alpha", "Supplier": "Local Farm", "Percentage": "50%"},
+        {"Line1": "Alpha", "Side": "=METER", "Percentage": "30:Low"},
+    ],
+)
+def test_concurrent_preview_matches_sequential_preview(
+    test_environment: Tuple, monkeypatch: pytest.MonkeyPatch, data: dict[str, str]
+) -> None:
+    app_module, _templates_module, _flask_app, _labels_dir, _ = test_environment
+    monkeypatch.setenv("PREVIEW_RENDER_WORKERS", "3")
+    concurrent_app = app_module.create_app()
+    monkeypatch.setenv("PREVIEW_RENDER_WORKERS", "0")
+    sequential_app = app_module.create_app()
+    request_payload = {"template": "bluey_label", "data": data}
+
+    concurrent = concurrent_app.test_client().post("/bb/preview", json=request_payload)
+    sequential = sequential_app.test_client().post("/bb/preview", json=request_payload)
+
+    assert concurrent.status_code == sequential.status_code
+    assert concurrent.get_json() == sequential.get_json()
+    best_by_payload = {"template": "best_by", "data": {"BaseDate": "not-a-date"}}
+    concurrent = concurrent_app.test_client().post("/bb/preview", json=best_by_payload)
+    sequential = sequential_app.test_client().post("/bb/preview", json=best_by_payload)
+    assert concurrent.status_code == sequential.status_code == 400
+    assert concurrent.get_json() == sequential.get_json()
+
+
+def test_preview_renders_single_unit_of_work_inline(
+    test_environment: Tuple, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app_module, _templates_module, _flask_app, _labels_dir, _ = test_environment
+    submitted: list[str] = []
+
+    class RecordingExecutor(ThreadPoolExecutor):
+        def submit(self, fn, /, *args, **kwargs):
+            submitted.append(getattr(fn, "__name__", repr(fn)))
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(app_module, "_render_executor", lambda: RecordingExecutor(max_workers=3))
+    client = app_module.create_app().test_client()
+
+    best_by = client.post("/bb/preview", json={"template": "best_by", "data": {}})
+    assert best_by.status_code == 200
+    # Best By renders label and QR on one worker, so the pool would only add overhead.
+    assert submitted == []
+
+    jar = client.post(
+        "/bb/preview",
+        json={"template": "bluey_label", "data": {"Line1": "Alpha", "Supplier": "Local Farm"}},
+    )
+    assert jar.status_code == 200
+    assert len(submitted) == 3
+
+
 def test_bb_preview_uses_preset_slug_for_qr_url(
     test_environment: Tuple, monkeypatch: pytest.MonkeyPatch
 ) -> None:
@@ -401,7 +641,7 @@ def test_bb_preview_jar_qr_url_uses_preset_slug(
     parsed = urlparse(payload["jar_qr_url"])
     assert parsed.path.endswith(f"/p/{preset.slug}")
     assert parsed.query == ""
-    assert payload["jar"]["image"].startswith("data:image/png;base64,")
+    assert payload["jar"]["image"].startswith("/bb/preview/img/")
     jar_parsed = urlparse(payload["jar_print_url"])
     jar_query = parse_qs(jar_parsed.query)
     assert jar_query.get("jar") == ["true"]
@@ -435,7 +675,7 @@ def test_bb_preview_jar_qr_url_falls_back_without_preset(
     assert "jar" not in query
     assert query.get("tpl") == [template_slug]
     assert query.get("Supplier") == ["Local Farm"]
-    assert payload["jar"]["image"].startswith("data:image/png;base64,")
+    assert payload["jar"]["image"].startswith("/bb/preview/img/")
     jar_parsed = urlparse(payload["jar_print_url"])
     jar_query = parse_qs(jar_parsed.query)
     assert jar_query.get("jar") == ["true"]
@@ -485,6 +725,121 @@ def test_bb_print_dispatches_label(
     assert data is not None
 
 
+def test_async_print_returns_job_that_can_be_polled(
+    test_environment: Tuple, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    app_module, _templates_module, flask_app, _labels_dir, _ = test_environment
+    client = flask_app.test_client()
+    monkeypatch.setattr(
+        app_module, "dispatch_image", lambda *_args, **_kwargs: tmp_path / "printed.png"
+    )
+
+    response = client.post(
+        "/bb/print",
+        json={"template": "bluey_label", "data": {"Line1": "Alpha"}},
+        headers={"Prefer": "respond-async"},
+    )
+
+    assert response.status_code == 202
+    queued = response.get_json()
+    assert response.headers["Location"] == queued["job_url"]
+    flask_app.extensions["print_spooler"].get(queued["job_id"]).wait(5)
+
+    job = client.get(queued["job_url"]).get_json()
+    assert job["state"] == "done"
+    assert job["status_code"] == 200
+    assert job["result"]["status"] == "sent"
+    assert set(job["timings"]) == {"queue_ms", "render_ms", "send_ms", "total_ms"}
+    assert client.get("/jobs/unknown").status_code == 404
+
+
+def test_print_queue_applies_backpressure(
+    test_environment: Tuple, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    app_module, _templates_module, _flask_app, _labels_dir, _ = test_environment
+    monkeypatch.setenv("PRINT_QUEUE_MAX", "1")
+    flask_app = app_module.create_app()
+    client = flask_app.test_client()
+    release = threading.Event()
+
+    def slow_dispatch(*_args, **_kwargs):
+        release.wait(5)
+        return tmp_path / "printed.png"
+
+    monkeypatch.setattr(app_module, "dispatch_image", slow_dispatch)
+    payload = {"template": "bluey_label", "data": {"Line1": "Alpha"}, "async": True}
+
+    first = client.post("/bb/print", json=payload)
+    second = client.post("/bb/print", json=payload)
+    release.set()
+
+    assert first.status_code == 202
+    assert second.status_code == 503
+    assert second.headers["Retry-After"] == "1"
+    flask_app.extensions["print_spooler"].get(first.get_json()["job_id"]).wait(5)
+
+
+def test_batch_print_sends_all_copies_as_one_job(
+    test_environment: Tuple, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app_module, _templates_module, flask_app, _labels_dir, _ = test_environment
+    client = flask_app.test_client()
+    jobs: list[tuple[list[tuple[int, int]], list[object]]] = []
+
+    def fake_dispatch_images(images, config, *, target_specs=None):
+        jobs.append(([image.size for image in images], list(target_specs or [])))
+        return [None] * len(images)
+
+    monkeypatch.setattr(app_module, "dispatch_images", fake_dispatch_images)
+
+    response = client.post(
+        "/bb/print/batch",
+        json={
+            "items": [
+                {"template": "bluey_label", "data": {"Line1": "Peas"}, "copies": 3},
+                {"template": "best_by", "data": {"Delta": "2 weeks"}},
+                {"template": "bluey_label", "data": {"Line1": "Carrot"}, "qr_label": True},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    payload = response.get_json()
+    assert payload["status"] == "sent"
+    assert payload["labels"] == 5
+    assert [item["copies"] for item in payload["items"]] == [3, 1, 1]
+    assert [item["template"] for item in payload["items"]] == [
+        "bluey_label",
+        "best_by",
+        "bluey_label",
+    ]
+    assert payload["items"][0]["metrics"]["width_px"] == BLUEY_EXPECTED_CANVAS[0]
+    assert len(jobs) == 1
+    sizes, specs = jobs[0]
+    assert sizes[:3] == [BLUEY_EXPECTED_CANVAS] * 3
+    assert len(specs) == 5
+
+
+@pytest.mark.parametrize(
+    ("payload", "message"),
+    [
+        ({}, "non-empty 'items'"),
+        ({"items": [{"template": "bluey_label", "data": {}, "copies": 0}]}, "Item 1: copies"),
+        ({"items": [{"template": "missing"}]}, "Item 1: Unknown template."),
+        ({"items": [{"template": "bluey_label", "data": {}, "copies": 101}]}, "at most 100 labels"),
+    ],
+)
+def test_batch_print_validates_items(
+    test_environment: Tuple, payload: dict[str, object], message: str
+) -> None:
+    _, _templates_module, flask_app, _labels_dir, _ = test_environment
+
+    response = flask_app.test_client().post("/bb/print/batch", json=payload)
+
+    assert response.status_code == 400
+    assert message in response.get_json()["error"]
+
+
 def test_bb_print_can_send_qr_label(
     test_environment: Tuple, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
 ) -> None:
@@ -1003,6 +1358,63 @@ def test_presets_default_to_newest_created_and_sort_every_data_column(
         assert [preset["name"] for preset in descending["presets"]] == list(reversed(expected))
 
 
+def test_presets_page_with_cursor_and_field_selection(
+    test_environment: Tuple, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app_module, _templates_module, flask_app, _labels_dir, _ = test_environment
+    client = flask_app.test_client()
+    store = FakePresetStore()
+    _seed_sortable_presets(store)
+    _use_fake_preset_store(monkeypatch, app_module, store)
+
+    first = client.get(
+        "/presets", query_string={"sort": "name", "limit": 2, "fields": "name,print_count"}
+    ).get_json()
+    assert first is not None
+    assert [preset["name"] for preset in first["presets"]] == ["Alpha", "Bravo"]
+    assert set(first["presets"][0]) == {"slug", "name", "print_count"}
+    assert first["next_cursor"]
+
+    second = client.get(
+        "/presets",
+        query_string={"sort": "name", "limit": 2, "after": first["next_cursor"]},
+    ).get_json()
+    assert second is not None
+    assert [preset["name"] for preset in second["presets"]] == ["Charlie"]
+    assert "params" in second["presets"][0]
+    assert second["next_cursor"] is None
+
+    assert client.get("/presets", query_string={"fields": "name,secret"}).status_code == 400
+    assert client.get("/presets", query_string={"after": "bogus"}).status_code == 400
+
+
+def test_presets_list_revalidates_with_weak_etag(
+    test_environment: Tuple, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    app_module, _templates_module, flask_app, _labels_dir, _ = test_environment
+    client = flask_app.test_client()
+    store = FakePresetStore()
+    _seed_sortable_presets(store)
+    _use_fake_preset_store(monkeypatch, app_module, store)
+
+    response = client.get("/presets")
+    etag = response.headers["ETag"]
+    assert etag.startswith('W/"')
+    assert "no-cache" in response.headers["Cache-Control"]
+
+    unchanged = client.get("/presets", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.headers["ETag"] == etag
+
+    other_page = client.get("/presets", query_string={"sort": "name"})
+    assert other_page.headers["ETag"] != etag
+
+    store.record_print("zulu")
+    changed = client.get("/presets", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
 def test_presets_returns_503_when_store_init_fails(
     test_environment: Tuple, monkeypatch: pytest.MonkeyPatch
 ) -> None:
@@ -0,0 +1,258 @@
+from __future__ import annotations
+
+import errno
+import socket
+import threading
+from typing import Iterator
+
+import pytest
+
+from printer_service.label import BrotherConnectionManager
+
+
+class _FakePrinter:
+    """Raw TCP listener that records every connection and the bytes received."""
+
+    def __init__(self) -> None:
+        self._server = socket.create_server(("127.0.0.1", 0))
+        self.port = self._server.getsockname()[1]
+        self.connections: list[socket.socket] = []
+        self.received: list[bytes] = []
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                connection, _ = self._server.accept()
+            except OSError:
+                return
+            self.connections.append(connection)
+            threading.Thread(target=self._read_loop, args=(connection,), daemon=True).start()
+
+    def _read_loop(self, connection: socket.socket) -> None:
+        while True:
+            try:
+                data = connection.recv(4096)
+            except OSError:
+                return
+            if not data:
+                return
+            self.received.append(data)
+
+    def wait_for(self, expected: bytes) -> None:
+        for _ in range(200):
+            if b"".join(self.received) == expected:
+                return
+            threading.Event().wait(0.01)
+        raise AssertionError(f"printer received {b''.join(self.received)!r}")
+
+    def close(self) -> None:
+        self._server.close()
+        for connection in self.connections:
+            connection.close()
+
+
+@pytest.fixture
+def printer() -> Iterator[_FakePrinter]:
+    fake = _FakePrinter()
+    yield fake
+    fake.close()
+
+
+def _fail_fallback(_instructions: bytes, _uri: str) -> None:
+    raise AssertionError("fallback should not be used")
+
+
+def test_connection_is_reused_across_jobs(printer: _FakePrinter) -> None:
+    manager = BrotherConnectionManager(f"tcp://127.0.0.1:{printer.port}")
+    try:
+        manager.send(b"job-1", fallback=_fail_fallback)
+        manager.send(b"job-2", fallback=_fail_fallback)
+        printer.wait_for(b"job-1job-2")
+    finally:
+        manager.close()
+
+    assert len(printer.connections) == 1
+
+
+def test_dropped_connection_is_replaced(printer: _FakePrinter) -> None:
+    manager = BrotherConnectionManager(f"tcp://127.0.0.1:{printer.port}")
+    try:
+        manager.send(b"job-1", fallback=_fail_fallback)
+        printer.wait_for(b"job-1")
+        printer.connections[0].shutdown(socket.SHUT_RDWR)
+        threading.Event().wait(0.05)
+        manager.send(b"job-2", fallback=_fail_fallback)
+        printer.wait_for(b"job-1job-2")
+    finally:
+        manager.close()
+
+    assert len(printer.connections) == 2
+
+
+def test_idle_connection_is_not_reused(printer: _FakePrinter) -> None:
+    now = [0.0]
+    manager = BrotherConnectionManager(
+        f"tcp://127.0.0.1:{printer.port}", idle_timeout=5, clock=lambda: now[0]
+    )
+    try:
+        manager.send(b"job-1", fallback=_fail_fallback)
+        now[0] = 6.0
+        manager.send(b"job-2", fallback=_fail_fallback)
+        printer.wait_for(b"job-1job-2")
+    finally:
+        manager.close()
+
+    assert len(printer.connections) == 2
+
+
+def test_failed_write_falls_back_to_connect_per_job() -> None:
+    class _BrokenSocket:
+        def setsockopt(self, *_args: object) -> None:
+            pass
+
+        def settimeout(self, _timeout: float) -> None:
+            pass
+
+        def send(self, _data: bytes) -> int:
+            raise BrokenPipeError("printer went away")
+
+        def close(self) -> None:
+            pass
+
+    fallback_calls: list[tuple[bytes, str]] = []
+    manager = BrotherConnectionManager(
+        "tcp://printer.local:9100",
+        connect=lambda *_args, **_kwargs: _BrokenSocket(),  # type: ignore[arg-type]
+    )
+
+    manager.send(b"job", fallback=lambda data, uri: fallback_calls.append((data, uri)))
+
+    assert fallback_calls == [(b"job", "tcp://printer.local:9100")]
+
+
+class _PartialSocket:
+    """Accepts the first chunk of a job, then fails like a busy or vanished printer."""
+
+    def __init__(self, error: OSError) -> None:
+        self.error = error
+        self.accepted = b""
+        self.closed = False
+
+    def setsockopt(self, *_args: object) -> None:
+        pass
+
+    def settimeout(self, _timeout: float) -> None:
+        pass
+
+    def send(self, data: bytes) -> int:
+        if self.accepted:
+            raise self.error
+        self.accepted = bytes(data[:4])
+        return len(self.accepted)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.parametrize(
+    "error", [ConnectionResetError("printer reset"), socket.timeout("timed out")]
+)
+def test_partial_write_fails_without_resending(error: OSError) -> None:
+    connection = _PartialSocket(error)
+    manager = BrotherConnectionManager(
+        "tcp://printer.local:9100",
+        connect=lambda *_args, **_kwargs: connection,  # type: ignore[arg-type]
+    )
+
+    with pytest.raises(ConnectionError, match="4 of 12 bytes"):
+        manager.send(b"page-1page-2", fallback=_fail_fallback)
+
+    assert connection.accepted == b"page"
+    assert connection.closed
+
+
+def test_write_timeout_before_any_bytes_is_not_resent() -> None:
+    class _StalledSocket(_PartialSocket):
+        def send(self, data: bytes) -> int:
+            raise self.error
+
+    connection = _StalledSocket(socket.timeout("timed out"))
+    manager = BrotherConnectionManager(
+        "tcp://printer.local:9100",
+        connect=lambda *_args, **_kwargs: connection,  # type: ignore[arg-type]
+    )
+
+    with pytest.raises(ConnectionError, match="0 of 3 bytes"):
+        manager.send(b"job", fallback=_fail_fallback)
+
+
+def test_rejects_non_tcp_uri() -> None:
+    with pytest.raises(ValueError):
+        BrotherConnectionManager("usb://0x04f9:0x209c")
+
+
+class _RecordingSocket(_PartialSocket):
+    def __init__(self) -> None:
+        super().__init__(ConnectionResetError("unused"))
+        self.options: dict[tuple[int, int], int] = {}
+        self.pending_error = 0
+        self.sent = b""
+
+    def setsockopt(self, *args: object) -> None:
+        level, option, value = args
+        self.options[(int(level), int(option))] = int(value)  # type: ignore[call-overload]
+
+    def getsockopt(self, level: int, option: int) -> int:
+        assert (level, option) == (socket.SOL_SOCKET, socket.SO_ERROR)
+        return self.pending_error
+
+    def send(self, data: bytes) -> int:
+        self.sent += bytes(data)
+        return len(data)
+
+
+@pytest.mark.skipif(not hasattr(socket, "TCP_KEEPCNT"), reason="platform lacks keepalive tuning")
+def test_keepalive_detects_dead_printer_within_idle_window() -> None:
+    connection = _RecordingSocket()
+    manager = BrotherConnectionManager(
+        "tcp://printer.local:9100",
+        connect=lambda *_args, **_kwargs: connection,  # type: ignore[arg-type]
+    )
+    try:
+        manager.send(b"job", fallback=_fail_fallback)
+    finally:
+        manager.close()
+
+    options = connection.options
+    assert options[(socket.SOL_SOCKET, socket.SO_KEEPALIVE)] == 1
+    detection_seconds = (
+        options[(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE)]
+        + options[(socket.IPPROTO_TCP, socket.TCP_KEEPINTVL)]
+        * options[(socket.IPPROTO_TCP, socket.TCP_KEEPCNT)]
+    )
+    assert detection_seconds < manager.idle_timeout / 2
+
+
+def test_half_open_connection_is_replaced_before_reuse() -> None:
+    """A printer that lost power never sends FIN/RST; only keepalive notices."""
+    connections = [_RecordingSocket(), _RecordingSocket()]
+    opened: list[_RecordingSocket] = []
+
+    def connect(*_args: object, **_kwargs: object) -> _RecordingSocket:
+        opened.append(connections[len(opened)])
+        return opened[-1]
+
+    manager = BrotherConnectionManager("tcp://printer.local:9100", connect=connect)  # type: ignore[arg-type]
+    try:
+        manager.send(b"job-1", fallback=_fail_fallback)
+        # Unanswered keepalive probes leave ETIMEDOUT pending on the socket.
+        connections[0].pending_error = errno.ETIMEDOUT
+        manager.send(b"job-2", fallback=_fail_fallback)
+    finally:
+        manager.close()
+
+    assert opened == connections
+    assert connections[0].closed
+    assert connections[0].sent == b"job-1"
+    assert connections[1].sent == b"job-2"
@@ -60,10 +60,12 @@ class TestBrowserSimulation:
         assert "label" in data
         assert "image" in data["label"]
 
-        # Verify the image data is not empty (base64 encoded image)
-        image_data = data["label"]["image"]
-        assert image_data.startswith("data:image/")
-        assert len(image_data) > 1000  # Should be a substantial image
+        # Verify the preview references a served image
+        image_url = data["label"]["image"]
+        assert image_url.startswith("/bb/preview/img/")
+        image_response = client.get(image_url)
+        assert image_response.status_code == 200
+        assert len(image_response.data) > 1000  # Should be a substantial image
 
     def test_print_button_click_simulation(self, client):
         """Simulate clicking the print button after filling out form."""
@@ -126,6 +128,8 @@ class TestBrowserSimulation:
         assert "image" in data["label"]
 
         # Even empty form should generate a valid image
-        image_data = data["label"]["image"]
-        assert image_data.startswith("data:image/")
-        assert len(image_data) > 200  # Should be a valid image
+        image_url = data["label"]["image"]
+        assert image_url.startswith("/bb/preview/img/")
+        image_response = client.get(image_url)
+        assert image_response.status_code == 200
+        assert image_response.data.startswith(b"\x89PNG")  # Should be a valid image
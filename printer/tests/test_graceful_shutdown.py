@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import http.client
+import json
+import os
 import signal
 import threading
 import importlib
 
-from flask import Flask
+import pytest
+from flask import Flask, request
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+from printer_service import serving
+from printer_service.warmup import WarmupStep
 
 app_module = importlib.import_module("printer_service.app")
 
@@ -40,6 +48,7 @@ def test_production_server_handles_sigterm(monkeypatch, capsys) -> None:
         return previous
 
     monkeypatch.setattr(app_module.signal, "signal", fake_signal)
+    monkeypatch.setattr(app_module, "default_steps", lambda: [WarmupStep("noop", lambda: None)])
 
     app_module._serve_production(Flask("shutdown-test"), "127.0.0.1", 8099)
 
@@ -47,5 +56,249 @@ def test_production_server_handles_sigterm(monkeypatch, capsys) -> None:
     assert fake_server.closed
     output = capsys.readouterr().out
     assert '"event": "service.started"' in output
+    assert '"event": "service.warmed"' in output
+    assert '"steps_ms": {"noop"' in output
     assert '"event": "service.shutdown.started"' in output
     assert '"event": "service.shutdown.completed"' in output
+
+
+def test_production_server_speaks_http11_keepalive(monkeypatch) -> None:
+    captured: dict[str, object] = {}
+
+    def fake_make_server(*_args, **kwargs):
+        captured.update(kwargs)
+        raise SystemExit
+
+    monkeypatch.setattr(app_module, "make_server", fake_make_server)
+    monkeypatch.setenv("PRINTER_KEEPALIVE_SECONDS", "7")
+
+    with pytest.raises(SystemExit):
+        app_module._serve_production(Flask("keepalive-test"), "127.0.0.1", 8099)
+
+    handler = captured["request_handler"]
+    assert isinstance(handler, type) and issubclass(handler, WSGIRequestHandler)
+    assert handler.protocol_version == "HTTP/1.1"
+    assert handler.timeout == 7.0
+
+
+def test_keepalive_zero_keeps_werkzeug_default_handler() -> None:
+    assert serving.request_handler(0) is WSGIRequestHandler
+
+
+def test_keepalive_handler_reuses_connection_after_unread_body() -> None:
+    flask_app = Flask("keepalive-socket-test")
+
+    @flask_app.post("/echo")
+    def echo():
+        return request.get_json()
+
+    @flask_app.post("/ignore")
+    def ignore():
+        return "ignored"
+
+    server = make_server(
+        "127.0.0.1", 0, flask_app, threaded=True, request_handler=serving.request_handler(5)
+    )
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    try:
+        responses = []
+        sockets = []
+        for path, payload in [
+            ("/echo", {"a": 1}),
+            ("/ignore", {"b": "x" * 50_000}),
+            ("/echo", {"c": 3}),
+        ]:
+            connection.request(
+                "POST", path, body=json.dumps(payload), headers={"Content-Type": "application/json"}
+            )
+            response = connection.getresponse()
+            responses.append((response.status, response.getheader("Connection"), response.read()))
+            sockets.append(connection.sock)
+    finally:
+        connection.close()
+        server.shutdown()
+        server.server_close()
+
+    assert len({id(sock) for sock in sockets}) == 1
+    assert [status for status, _connection, _body in responses] == [200, 200, 200]
+    assert all(header is None for _status, header, _body in responses)
+    assert json.loads(responses[2][2]) == {"c": 3}
+
+
+@pytest.mark.parametrize(("raw", "expected"), [(None, 1), ("", 1), ("4", 4), ("0", 1), ("many", 1)])
+def test_workers_from_env(monkeypatch, raw: str | None, expected: int) -> None:
+    if raw is None:
+        monkeypatch.delenv("PRINTER_WORKERS", raising=False)
+    else:
+        monkeypatch.setenv("PRINTER_WORKERS", raw)
+    assert serving.workers_from_env() == expected
+
+
+def test_production_server_prefork_runs_tagged_workers(monkeypatch, capsys) -> None:
+    handlers: dict[int, object] = {}
+    fake_server = _FakeServer(handlers)
+    prefork_calls: list[int] = []
+
+    def fake_serve_prefork(workers, run_worker, _emit) -> None:
+        prefork_calls.append(workers)
+        # Run one worker inline; forking is covered by the serving tests below.
+        run_worker(0)
+
+    def fake_signal(received_signal: int, handler: object) -> object:
+        previous = handlers.get(received_signal, signal.SIG_DFL)
+        handlers[received_signal] = handler
+        return previous
+
+    monkeypatch.setenv("PRINTER_WORKERS", "3")
+    monkeypatch.setattr(app_module, "make_server", lambda *_args, **_kwargs: fake_server)
+    monkeypatch.setattr(app_module, "serve_prefork", fake_serve_prefork)
+    monkeypatch.setattr(app_module.signal, "signal", fake_signal)
+    monkeypatch.setattr(app_module, "default_steps", lambda: [WarmupStep("noop", lambda: None)])
+
+    app_module._serve_production(Flask("prefork-test"), "127.0.0.1", 8099)
+
+    assert prefork_calls == [3]
+    assert fake_server.closed
+    output = capsys.readouterr().out
+    assert '"event": "service.started"' in output
+    assert '"worker": 0' in output
+    assert '"event": "service.shutdown.completed"' in output
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="pre-fork serving needs os.fork")
+def test_serve_prefork_forwards_sigterm_and_waits_for_workers() -> None:
+    read_fd, write_fd = os.pipe()
+    events: list[dict[str, object]] = []
+
+    def run_worker(index: int) -> None:
+        stopped = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_args: stopped.set())
+        os.write(write_fd, bytes([index]))
+        while not stopped.wait(0.05):
+            pass
+
+    def terminate_once_started() -> None:
+        started = b""
+        while len(started) < 2:
+            started += os.read(read_fd, 2)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    watcher = threading.Thread(target=terminate_once_started, daemon=True)
+    watcher.start()
+    try:
+        serving.serve_prefork(2, run_worker, events.append, shutdown_timeout=5)
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+    names = [event["event"] for event in events]
+    assert names == [
+        "service.supervisor.started",
+        "service.shutdown.started",
+        "service.shutdown.completed",
+    ]
+    assert len(events[0]["workers"]) == 2  # type: ignore[arg-type]
+    assert events[1]["signal"] == "SIGTERM"
+
+
+def _forwarding_pair() -> tuple[Flask, Flask, list[str]]:
+    primary_calls: list[str] = []
+    primary = Flask("primary-worker")
+    primary.wsgi_app = app_module._IngressPrefixMiddleware(primary.wsgi_app)  # type: ignore[method-assign]
+    secondary = Flask("secondary-worker")
+
+    @primary.post("/bb/print")
+    def primary_print():
+        primary_calls.append(request.script_root + request.full_path)
+        return {"worker": 0, "body": request.get_json()}, 202, {"X-Job": "abc"}
+
+    @secondary.post("/bb/print")
+    def secondary_print():
+        return {"worker": 1}
+
+    @secondary.get("/bb/preview")
+    def secondary_preview():
+        return {"worker": 1}
+
+    return primary, secondary, primary_calls
+
+
+def test_primary_forwarder_relays_pinned_routes_to_worker_zero() -> None:
+    primary, secondary, primary_calls = _forwarding_pair()
+    group = serving.WorkerGroup.create(primary)
+    threading.Thread(target=group.primary_server.serve_forever, daemon=True).start()
+    secondary.wsgi_app = serving.PrimaryForwarder(  # type: ignore[method-assign]
+        secondary.wsgi_app, group.primary_address, ["/bb/print", "/jobs/"]
+    )
+    client = secondary.test_client()
+    try:
+        forwarded = client.post(
+            "/addon/bb/print?copies=2",
+            json={"template": "bluey_label"},
+            headers={"X-Ingress-Path": "/addon"},
+        )
+        local = client.get("/bb/preview")
+    finally:
+        group.primary_server.shutdown()
+        group.close()
+
+    assert forwarded.status_code == 202
+    assert forwarded.get_json() == {"worker": 0, "body": {"template": "bluey_label"}}
+    assert forwarded.headers["X-Job"] == "abc"
+    assert primary_calls == ["/addon/bb/print?copies=2"]
+    assert local.get_json() == {"worker": 1}
+    assert not os.path.exists(group.directory)
+
+
+def test_primary_forwarder_answers_503_while_worker_zero_is_down() -> None:
+    _primary, secondary, _calls = _forwarding_pair()
+    group = serving.WorkerGroup.create(Flask("unused"))
+    address = group.primary_address
+    group.close()
+    secondary.wsgi_app = serving.PrimaryForwarder(  # type: ignore[method-assign]
+        secondary.wsgi_app, address, ["/bb/print"]
+    )
+
+    response = secondary.test_client().post("/bb/print", json={})
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert "Print worker unavailable" in response.get_json()["error"]
+
+
+def test_prefork_workers_share_preview_images_and_pin_print_routes(monkeypatch) -> None:
+    handlers: dict[int, object] = {}
+    fake_server = _FakeServer(handlers)
+    flask_app = app_module.create_app()
+    seen: dict[str, object] = {}
+
+    def fake_serve_prefork(workers, run_worker, _emit) -> None:
+        preview_images = flask_app.extensions["preview_images"]
+        seen["shared"] = preview_images._directory
+        run_worker(1)
+        seen["wsgi_app"] = flask_app.wsgi_app
+        seen["group"] = flask_app.extensions["worker_group"]
+
+    def fake_signal(received_signal: int, handler: object) -> object:
+        previous = handlers.get(received_signal, signal.SIG_DFL)
+        handlers[received_signal] = handler
+        return previous
+
+    monkeypatch.setenv("PRINTER_WORKERS", "2")
+    monkeypatch.setattr(app_module, "make_server", lambda *_args, **_kwargs: fake_server)
+    monkeypatch.setattr(app_module, "serve_prefork", fake_serve_prefork)
+    monkeypatch.setattr(app_module.signal, "signal", fake_signal)
+    monkeypatch.setattr(app_module, "default_steps", lambda: [WarmupStep("noop", lambda: None)])
+
+    app_module._serve_production(flask_app, "127.0.0.1", 8099)
+
+    group = seen["group"]
+    assert isinstance(group, serving.WorkerGroup)
+    assert group.worker == 1
+    assert seen["shared"] == os.path.join(group.directory, "preview-images")
+    forwarder = seen["wsgi_app"]
+    assert isinstance(forwarder, serving.PrimaryForwarder)
+    assert forwarder.address == group.primary_address
+    assert "/bb/print" in forwarder.prefixes
+    assert not os.path.exists(group.directory)
@@ -55,3 +55,77 @@ def test_file_backend_keeps_stored_orientation(monkeypatch, tmp_path: Path) -> N
 
     assert written["size"] == (100, 200)
     assert result == output_path
+
+
+def test_brother_reprints_reuse_cached_raster_instructions(monkeypatch) -> None:
+    from brother_ql import conversion
+    from brother_ql.backends import helpers
+
+    conversions: list[tuple[str, bool]] = []
+    sent: list[bytes] = []
+
+    def fake_convert(qlr, images, label, *, rotate, hq, cut):
+        conversions.append((label, cut))
+        return f"raster:{label}:{cut}".encode("ascii")
+
+    monkeypatch.setattr(conversion, "convert", fake_convert)
+    monkeypatch.setattr(helpers, "send", lambda instructions, uri: sent.append(instructions))
+    monkeypatch.setattr(label_module, "_RASTER_CACHE", label_module.RasterInstructionCache())
+    monkeypatch.setenv("BROTHER_CONNECTION_IDLE_SECONDS", "0")
+
+    image = Image.new("RGB", (200, 100), color="white")
+    config = PrinterConfig(backend="brother-network", brother_uri="tcp://127.0.0.1:9100")
+
+    label_module._send_to_brother(image, config, label_override="62")
+    label_module._send_to_brother(image.copy(), config, label_override="62")
+    label_module._send_to_brother(image, PrinterConfig(**{**vars(config), "cut": False}))
+
+    assert conversions == [("62", True), (config.brother_label, False)]
+    assert sent[0] == sent[1] == b"raster:62:True"
+    stats = label_module.raster_cache_stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["entries"] == 2
+
+
+def test_dispatch_images_sends_one_multi_page_job_per_label_code(monkeypatch) -> None:
+    sent: list[tuple[list[tuple[int, int]], str | None]] = []
+
+    def fake_send_pages(images, cfg, *, label_override=None):
+        sent.append(([image.size for image in images], label_override))
+
+    monkeypatch.setattr(label_module, "_send_pages_to_brother", fake_send_pages)
+    config = PrinterConfig(backend="brother-network", brother_uri="tcp://127.0.0.1:9100")
+    portrait = Image.new("RGB", (100, 200), color="white")
+    other_spec = BrotherLabelSpec(code="other", printable_px=(300, 100))
+
+    results = label_module.dispatch_images(
+        [portrait, portrait, Image.new("RGB", (300, 100))],
+        config,
+        target_specs=[_dummy_spec(), _dummy_spec(), other_spec],
+    )
+
+    assert results == [None, None, None]
+    assert sent == [([(200, 100), (200, 100)], "test"), ([(300, 100)], "other")]
+
+
+def test_brother_batch_pages_are_converted_together(monkeypatch) -> None:
+    from brother_ql import conversion
+    from brother_ql.backends import helpers
+
+    converted: list[int] = []
+    sent: list[bytes] = []
+
+    def fake_convert(qlr, images, label, *, rotate, hq, cut):
+        converted.append(len(images))
+        return b"raster"
+
+    monkeypatch.setattr(conversion, "convert", fake_convert)
+    monkeypatch.setattr(helpers, "send", lambda instructions, uri: sent.append(instructions))
+    monkeypatch.setenv("BROTHER_CONNECTION_IDLE_SECONDS", "0")
+    config = PrinterConfig(backend="brother-network", brother_uri="tcp://127.0.0.1:9100")
+
+    label_module._send_pages_to_brother([Image.new("RGB", (200, 100))] * 4, config)
+
+    assert converted == [4]
+    assert sent == [b"raster"]
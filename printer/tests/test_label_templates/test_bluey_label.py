@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw, ImageFilter
+
+from printer_service.label_templates import bluey_label, helper
+
+
+def _reference_masks(
+    text: str, font: helper.FontType, position: tuple[int, int], halo_size: int
+) -> tuple[Image.Image, Image.Image]:
+    text_mask = Image.new("L", (bluey_label.CANVAS_WIDTH_PX, bluey_label.CANVAS_HEIGHT_PX), 0)
+    ImageDraw.Draw(text_mask).text(position, text, fill=255, font=font)
+    return text_mask, text_mask.filter(ImageFilter.MaxFilter(halo_size))
+
+
+def _same(first: Image.Image, second: Image.Image) -> bool:
+    return ImageChops.difference(first, second).getbbox() is None
+
+
+@pytest.mark.parametrize("size", [3, 7, 13])
+def test_expanded_mask_matches_max_filter(size: int) -> None:
+    mask = Image.new("L", (60, 40), 0)
+    draw = ImageDraw.Draw(mask)
+    draw.text((-3, 25), "Ag", fill=180, font=helper.load_font(size_points=20))
+    draw.point((59, 0), fill=255)
+    draw.point((30, 20), fill=90)
+
+    expected = mask.filter(ImageFilter.MaxFilter(size))
+
+    assert _same(bluey_label._expanded_mask(mask, size), expected)
+
+
+@pytest.mark.parametrize(
+    "position",
+    [(40, 120), (-25, 10), (300, bluey_label.CANVAS_HEIGHT_PX - 20)],
+    ids=["inside", "clipped-left", "clipped-bottom"],
+)
+def test_text_and_halo_masks_match_direct_rendering(position: tuple[int, int]) -> None:
+    font = helper.load_font(size_points=bluey_label.TITLE_FONT_POINTS)
+    halo_size = bluey_label.TITLE_TEXT_HALO_SIZE
+
+    text_mask, halo_mask = bluey_label._text_and_halo_masks("Soup", font, position, halo_size)
+    expected_text, expected_halo = _reference_masks("Soup", font, position, halo_size)
+
+    assert _same(text_mask, expected_text)
+    assert _same(halo_mask, expected_halo)
+
+
+def test_repeated_titles_reuse_the_halo_stamp() -> None:
+    font = helper.load_font(size_points=bluey_label.TITLE_FONT_POINTS)
+    bluey_label._halo_stamp.cache_clear()
+
+    for top in range(0, 4 * 60, 60):
+        bluey_label._text_and_halo_masks("Chili", font, (20, top), bluey_label.TITLE_TEXT_HALO_SIZE)
+
+    info = bluey_label._halo_stamp.cache_info()
+    assert (info.misses, info.hits) == (1, 3)
@@ -5,7 +5,7 @@ from pathlib import Path
 from typing import cast
 
 import pytest
-from PIL import Image, ImageFont
+from PIL import Image, ImageDraw, ImageFont
 from PIL.Image import Dither
 
 from printer_service.label_templates import helper
@@ -96,6 +96,43 @@ def test_label_helper_measure_text_returns_box():
     assert metrics[1] == metrics.height
 
 
+@pytest.mark.parametrize("mode", ["L", "1"])
+def test_text_metrics_matches_pillow_textbbox(mode: str) -> None:
+    font = helper.load_font(size_points=28)
+    draw = ImageDraw.Draw(Image.new(mode, (1, 1)))
+    metrics = helper.text_metrics(font, fontmode=draw.fontmode)
+    samples = ["", " ", "AV", "Tomato soup ", "Best By: 2024-05-01", "WAVE -- (j'y)", "x\ny"]
+
+    for text in samples:
+        bbox = draw.textbbox((0, 0), text, font=font)
+        assert metrics.bbox(text) == bbox
+        width = int(round(bbox[2] - bbox[0]))
+        for max_width in (width - 1, width, width + 1):
+            assert metrics.fits(text, max_width) == (width <= max_width)
+
+
+def test_text_metrics_is_shared_between_font_loads() -> None:
+    first = helper.text_metrics(helper.load_font(size_points=30))
+    second = helper.text_metrics(helper.load_font(size_points=30))
+
+    assert first is second
+    assert helper.text_metrics(helper.load_font(size_points=30), fontmode="1") is not first
+
+
+def test_text_metrics_wrap_and_trim_respect_width() -> None:
+    font = helper.load_font(size_points=24)
+    metrics = helper.text_metrics(font)
+    caption = "Roasted tomato and red pepper soup with basil, frozen in quart jars"
+
+    lines = metrics.wrap(caption, 160, 2)
+
+    assert len(lines) == 2
+    assert caption.startswith(" ".join(lines))
+    assert all(metrics.size(line).width <= 160 for line in lines)
+    assert metrics.trim("Supercalifragilistic", 60).endswith("...")
+    assert metrics.trim("Soup", 200) == "Soup"
+
+
 def test_label_helper_finalize_attaches_warnings():
     builder = helper.LabelDrawingHelper(width=60, height=20)
     font = helper.load_font(size_points=24)
@@ -268,3 +305,26 @@ def test_draw_repeating_side_text_supports_mask_dithering() -> None:
 
     # The images should be different (dithering should change the result)
     assert with_dither_black != without_dither_black
+
+
+def test_font_registry_resolves_path_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("LABEL_FONT_PATH", "/missing/label-font.ttf")
+    attempts: list[str] = []
+    real_truetype = ImageFont.truetype
+
+    def tracking_truetype(font: str, size: int) -> ImageFont.FreeTypeFont:
+        attempts.append(font)
+        return real_truetype(font, size=size)
+
+    monkeypatch.setattr(helper.ImageFont, "truetype", tracking_truetype)
+    registry = helper.FontRegistry()
+
+    registry.preload([20, 24, 20])
+    report = registry.report()
+
+    # The candidate list is walked for the first size only; 24pt loads the winner directly.
+    assert attempts.count("/missing/label-font.ttf") == 1
+    assert attempts[-1] == report["path"]
+    assert report["sizes"] == [20, 24]
+    assert report["label_font_path"] == "/missing/label-font.ttf"
+    assert registry.load(24) is registry.load(24)
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import subprocess
+import sys
 from typing import Mapping
 
 import pytest
 
+from printer_service import label_templates
 from printer_service.label_templates import TemplateFormData, get_template
 from printer_service.label_templates.base import TemplateDefinition
 
@@ -44,3 +47,36 @@ def test_template_definition_defaults_raise_without_slug():
     template.bind_slug("sample_template")
     assert template.default_display_name() == "Sample Template"
     assert template.default_form_template() == "sample_template.html"
+
+
+def test_declared_display_names_match_implementations():
+    for template in label_templates.all_templates():
+        declared = template._declared_display_name
+        assert declared == template.implementation.display_name
+
+
+def test_unknown_template_still_raises_key_error():
+    with pytest.raises(KeyError):
+        get_template("no_such_template")
+
+
+def test_preload_reports_each_template():
+    timings = label_templates.preload()
+
+    assert set(timings) == {template.slug for template in label_templates.all_templates()}
+    assert all(template.loaded for template in label_templates.all_templates())
+
+
+def test_importing_app_does_not_import_templates():
+    probe = (
+        "import sys, printer_service.app; "
+        "loaded = [name for name in ('printer_service.label_templates.bluey_label', "
+        "'printer_service.label_templates.best_by', 'printer_service.label_templates.qr_codes', "
+        "'cairosvg', 'qrcode') if name in sys.modules]; "
+        "print(','.join(loaded))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", probe], capture_output=True, text=True, check=True
+    )
+
+    assert result.stdout.strip() == ""
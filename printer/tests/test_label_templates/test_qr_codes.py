@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from PIL import ImageChops
+
+from printer_service.label_templates import qr_codes
+
+URL = "http://printer.local/bb?tpl=bluey_label&Line1=Soup"
+
+
+def test_matrix_is_shared_across_target_sizes() -> None:
+    qr_codes.clear_qr_cache()
+
+    label_qr = qr_codes.qr_image(URL, target_size=150)
+    jar_qr = qr_codes.qr_image(URL, target_size=200, rounding="down")
+    repeat = qr_codes.qr_image(URL, target_size=150)
+
+    stats = qr_codes.qr_cache_stats()
+    assert stats["matrix_misses"] == 1
+    assert stats["image_hits"] == 1
+    assert ImageChops.difference(label_qr, repeat).getbbox() is None
+    assert jar_qr.width <= 200
+
+
+def test_images_are_scaled_by_whole_modules() -> None:
+    base = qr_codes.qr_image(URL)
+    total_modules = base.info["modules_count"] + 2 * base.info["quiet_zone_modules"]
+    assert base.size == (total_modules, total_modules)
+
+    rounded_up = qr_codes.qr_image(URL, target_size=total_modules * 3 + 1)
+    rounded_down = qr_codes.qr_image(URL, target_size=total_modules * 3 + 1, rounding="down")
+
+    assert rounded_up.width == total_modules * 4
+    assert rounded_down.width == total_modules * 3
+    assert qr_codes.qr_image(URL, target_size=1).width == total_modules * qr_codes.QR_MIN_MODULE_PX
+
+
+def test_returned_images_are_private_copies() -> None:
+    first = qr_codes.qr_image(URL, target_size=120)
+    first.paste(0, (0, 0, first.width, first.height))
+
+    second = qr_codes.qr_image(URL, target_size=120)
+
+    assert second.getextrema() == (0, 255)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from datetime import date
+
+from PIL import Image
+
+from printer_service.label_specs import BrotherLabelSpec
+from printer_service.label_templates import TemplateFormData
+from printer_service.label_templates.render_cache import RenderCache, render_cache_key
+
+
+def test_render_cache_returns_copies_and_counts_hits() -> None:
+    cache = RenderCache(max_bytes=1024 * 1024, today=lambda: date(2025, 1, 1))
+    key = cache.key_for("bluey_label", {"Line1": "Oat"})
+    spec = BrotherLabelSpec(code="62", printable_px=(10, 10))
+
+    assert cache.get(key) is None
+    cache.put(key, Image.new("1", (10, 10), 1), spec)
+    first = cache.get(key)
+    second = cache.get(key)
+
+    assert first is not None and second is not None
+    assert first[1] == spec
+    first[0].putpixel((0, 0), 0)
+    assert second[0].getpixel((0, 0)) != 0
+    stats = cache.stats()
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["entries"] == 1
+
+
+def test_render_cache_key_includes_day_and_blank_values() -> None:
+    today = date(2025, 1, 1)
+    base = render_cache_key("best_by", {}, today=today)
+
+    assert base != render_cache_key("best_by", {}, today=date(2025, 1, 2))
+    assert base != render_cache_key("best_by", {"Prefix": ""}, today=today)
+    assert base != render_cache_key("best_by", {"BaseDate": None}, today=today)
+    assert render_cache_key("best_by", {"Prefix": "Use "}, today=today) != render_cache_key(
+        "best_by", {"Prefix": "Use"}, today=today
+    )
+    assert render_cache_key(
+        "bluey_label", TemplateFormData({"Line1": "A", "Line2": "B"}), today=today
+    ) == render_cache_key("bluey_label", {"Line2": "B", "Line1": "A"}, today=today)
+
+
+def test_render_cache_evicts_least_recently_used_within_byte_budget() -> None:
+    cache = RenderCache(max_bytes=250, today=lambda: date(2025, 1, 1))
+    keys = [cache.key_for("bluey_label", {"Line1": str(index)}) for index in range(3)]
+
+    cache.put(keys[0], Image.new("1", (10, 10)), None)
+    cache.put(keys[1], Image.new("1", (10, 10)), None)
+    assert cache.get(keys[0]) is not None
+    cache.put(keys[2], Image.new("1", (10, 10)), None)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] <= 250
+
+    cache.put(keys[1], Image.new("1", (100, 100)), None)
+    assert cache.get(keys[1]) is None
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+from PIL import Image, ImageChops, ImageDraw
+
+from printer_service.label_templates import helper, symbol_pack
+from printer_service.label_templates.base import SymbolLayout
+
+
+def _fake_svg2png(*, url=None, write_to=None, output_width=None, **_kwargs):
+    # Twice as tall as wide so background symbols take the rescale path.
+    width = output_width or 10
+    image = Image.new("LA", (width, width * 2), (255, 0))
+    draw = ImageDraw.Draw(image)
+    draw.ellipse((0, 0, width - 1, width * 2 - 1), fill=(40, 200))
+    image.save(write_to, format="PNG")
+
+
+@pytest.fixture
+def symbols(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    directory = tmp_path / "symbols"
+    directory.mkdir()
+    (directory / "moon.svg").write_text("<svg id='moon'/>", encoding="utf-8")
+    monkeypatch.setattr(helper.cairosvg, "svg2png", _fake_svg2png)
+    monkeypatch.setenv("LABEL_SYMBOL_PACK", str(tmp_path / "missing.pack"))
+    helper._render_svg_symbol_cached.cache_clear()
+    symbol_pack.reset_default_pack()
+    yield directory
+    symbol_pack.reset_default_pack()
+
+
+def _build(directory: Path, output: Path) -> None:
+    symbol_pack.build_pack(
+        directory=directory,
+        layouts=[SymbolLayout(60, 80, 25), SymbolLayout(60, 80, 45)],
+        output=output,
+        rasterize=lambda path, width: helper.render_svg_symbol(path=path, output_width=width),
+    )
+
+
+def test_background_symbol_from_pack_matches_cairosvg(
+    symbols: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    expected = Image.new("L", (60, 80), 255)
+    helper.draw_background_symbol(canvas=expected, slug="moon", directory=symbols, alpha_percent=45)
+
+    pack_path = tmp_path / "symbols.pack"
+    _build(symbols, pack_path)
+    monkeypatch.setenv("LABEL_SYMBOL_PACK", str(pack_path))
+    symbol_pack.reset_default_pack()
+
+    def fail_svg2png(**_kwargs):
+        raise AssertionError("packed symbols should not be rasterised again")
+
+    monkeypatch.setattr(helper.cairosvg, "svg2png", fail_svg2png)
+    helper._render_svg_symbol_cached.cache_clear()
+    actual = Image.new("L", (60, 80), 255)
+    helper.draw_background_symbol(canvas=actual, slug="moon", directory=symbols, alpha_percent=45)
+
+    assert ImageChops.difference(expected, actual).getbbox() is None
+    assert symbol_pack.pack_stats()["hits"] == 2
+
+
+def test_pack_falls_back_for_unknown_widths_and_edited_svgs(symbols: Path, tmp_path: Path) -> None:
+    pack_path = tmp_path / "symbols.pack"
+    _build(symbols, pack_path)
+    pack = symbol_pack.SymbolPack.open(pack_path)
+    assert pack is not None
+    svg_path = (symbols / "moon.svg").resolve()
+
+    assert pack.planes(svg_path, 60) is not None
+    assert pack.faded_alpha(svg_path, 40, 25) is not None
+    assert pack.planes(svg_path, 61) is None
+
+    svg_path.write_text("<svg id='moon-v2'/>", encoding="utf-8")
+    assert pack.planes(svg_path, 60) is None
+
+
+def test_open_rejects_files_that_are_not_packs(tmp_path: Path) -> None:
+    bogus = tmp_path / "bogus.pack"
+    bogus.write_bytes(b"not a symbol pack at all")
+
+    assert symbol_pack.SymbolPack.open(bogus) is None
+    assert symbol_pack.SymbolPack.open(tmp_path / "absent.pack") is None
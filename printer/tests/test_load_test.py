@@ -0,0 +1,41 @@
+"""Smoke test for ``scripts/load_test.py`` against its in-memory preset store."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "load_test.py"
+
+
+def test_load_test_harness_serves_preset_scenarios_from_memory(tmp_path: Path) -> None:
+    report_path = tmp_path / "load.json"
+
+    completed = subprocess.run(
+        [
+            sys.executable,
+            str(SCRIPT),
+            "--memory-presets",
+            # Previews are left out: bluey symbols need a native cairo.
+            "--mix",
+            "presets=1,redirect=1,print=1",
+            "--duration",
+            "1",
+            "--concurrency",
+            "2",
+            "--output",
+            str(report_path),
+        ],
+        capture_output=True,
+        timeout=120,
+    )
+
+    assert completed.returncode == 0, completed.stderr.decode()[-2000:]
+    report = json.loads(report_path.read_text())
+    assert report["presets"] == "memory"
+    for name in ("presets", "redirect", "print"):
+        scenario = report["scenarios"][name]
+        assert scenario["requests"] > 0
+        assert scenario["errors"] == 0, scenario["statuses"]
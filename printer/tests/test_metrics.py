@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+import threading
+
+import pytest
+
+from printer_service.metrics import Family, Registry, Sample, cache_families
+
+
+def test_histogram_renders_cumulative_buckets() -> None:
+    registry = Registry()
+    latency = registry.histogram("demo_seconds", "Demo latency.", ("route",), buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.5, 0.5, 5.0):
+        latency.labels("/bb").observe(value)
+
+    lines = registry.exposition().splitlines()
+    assert lines[:2] == ["# HELP demo_seconds Demo latency.", "# TYPE demo_seconds histogram"]
+    assert 'demo_seconds_bucket{route="/bb",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/bb",le="1"} 3' in lines
+    assert 'demo_seconds_bucket{route="/bb",le="+Inf"} 4' in lines
+    assert 'demo_seconds_sum{route="/bb"} 6.05' in lines
+    assert 'demo_seconds_count{route="/bb"} 4' in lines
+
+
+def test_counter_is_exact_under_concurrent_increments() -> None:
+    registry = Registry()
+    errors = registry.counter("demo_errors_total", "Demo errors.", ("operation",))
+
+    def hammer() -> None:
+        for _ in range(2_000):
+            errors.labels("find").inc()
+
+    threads = [threading.Thread(target=hammer) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert 'demo_errors_total{operation="find"} 16000' in registry.exposition()
+
+
+def test_registering_twice_returns_the_same_metric_unless_it_conflicts() -> None:
+    registry = Registry()
+    first = registry.counter("demo_total", "Demo.", ("cache",))
+
+    assert registry.counter("demo_total", "Demo.", ("cache",)) is first
+    with pytest.raises(ValueError):
+        registry.histogram("demo_total", "Demo.", ("cache",))
+    with pytest.raises(ValueError):
+        first.labels("font", "extra")
+
+
+def test_scrape_time_families_escape_label_values() -> None:
+    registry = Registry()
+    families = [
+        *cache_families({"qr": (3, 1), "font": (0, 0)}),
+        Family("demo_depth", "gauge", "Depth.", [Sample((("backend", 'a"b'),), 2)]),
+    ]
+
+    text = registry.exposition(extra=families)
+
+    assert 'printer_cache_hit_ratio{cache="qr"} 0.75' in text
+    assert 'printer_cache_hit_ratio{cache="font"} 0' in text
+    assert 'demo_depth{backend="a\\"b"} 2' in text
+
+
+def test_merged_registry_adds_snapshots_from_other_workers() -> None:
+    worker = Registry()
+    errors = worker.counter("demo_errors_total", "Demo errors.", ("operation",))
+    latency = worker.histogram("demo_seconds", "Demo latency.", ("route",), buckets=(0.1, 1.0))
+    errors.labels("find").inc(2)
+    latency.labels("/bb").observe(0.05)
+
+    peer = Registry()
+    peer.counter("demo_errors_total", "Demo errors.", ("operation",)).labels("find").inc(3)
+    peer.counter("demo_errors_total", "Demo errors.", ("operation",)).labels("save").inc()
+    peer.histogram("demo_seconds", "Demo latency.", ("route",), buckets=(0.1, 1.0)).labels(
+        "/bb"
+    ).observe(0.5)
+    # Snapshots travel between processes as JSON.
+    snapshot = json.loads(json.dumps(peer.snapshot()))
+
+    lines = worker.merged([snapshot]).exposition().splitlines()
+
+    assert 'demo_errors_total{operation="find"} 5' in lines
+    assert 'demo_errors_total{operation="save"} 1' in lines
+    assert 'demo_seconds_bucket{route="/bb",le="0.1"} 1' in lines
+    assert 'demo_seconds_bucket{route="/bb",le="1"} 2' in lines
+    assert 'demo_seconds_sum{route="/bb"} 0.55' in lines
+    assert 'demo_errors_total{operation="find"} 2' in worker.exposition()
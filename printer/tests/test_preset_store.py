@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import threading
 from typing import TYPE_CHECKING, Any, cast
 
 import pytest
+from pymongo import DeleteOne, ReplaceOne
 
 import printer_service.presets as presets
+from printer_service.mongo import MongoConfig
 from printer_service.label_templates import TemplateFormValue
 from printer_service.presets import (
     Preset,
+    PresetCache,
     PresetStore,
+    PrintCountBuffer,
     canonical_params,
     canonical_query_string,
     slug_for_params,
@@ -28,9 +33,14 @@ class FakeCursor:
     def __init__(self, docs: list[dict[str, Any]]) -> None:
         self._docs = docs
 
-    def sort(self, key: str, direction: int):
-        reverse = direction < 0
-        self._docs.sort(key=lambda doc: doc.get(key, ""), reverse=reverse)
+    def sort(self, key: str | list[tuple[str, int]], direction: int = 1):
+        keys = [(key, direction)] if isinstance(key, str) else key
+        # Stable sorts applied from the last key to the first; missing values sort first.
+        for field, field_direction in reversed(keys):
+            self._docs.sort(
+                key=lambda doc: (doc.get(field) is not None, doc.get(field)),
+                reverse=field_direction < 0,
+            )
         return self
 
     def limit(self, limit: int):
@@ -45,14 +55,46 @@ class FakeCollection:
     def __init__(self) -> None:
         self._docs: dict[str, dict[str, Any]] = {}
         self.find_one_and_update_calls: list[dict[str, Any]] = []
+        self.bulk_write_calls: list[list[Any]] = []
+        self.find_calls = 0
+        self.find_one_calls = 0
 
     def create_index(self, *_args, **_kwargs):
         return None
 
-    def find(self, _query):
-        return FakeCursor(list(self._docs.values()))
+    def find(self, query, projection=None):
+        self.find_calls += 1
+        docs = [doc for doc in self._docs.values() if _matches(doc, query)]
+        if projection:
+            docs = [
+                {key: doc[key] for key, enabled in projection.items() if enabled and key in doc}
+                for doc in docs
+            ]
+        return FakeCursor(docs)
+
+    def count_documents(self, query):
+        return sum(1 for doc in self._docs.values() if _matches(doc, query))
+
+    def bulk_write(self, operations, ordered=True):
+        self.bulk_write_calls.append(list(operations))
+        for operation in operations:
+            slug = operation._filter["slug"]
+            if isinstance(operation, DeleteOne):
+                self._docs.pop(slug, None)
+                continue
+            if isinstance(operation, ReplaceOne):
+                self._docs[slug] = dict(operation._doc)
+                continue
+            doc = self._docs.get(slug)
+            if doc is None:
+                continue
+            for key, value in operation._doc["$inc"].items():
+                doc[key] = doc.get(key, 0) + value
+            for key, value in operation._doc.get("$max", {}).items():
+                doc[key] = max(doc.get(key) or value, value)
 
     def find_one(self, query, projection=None):
+        self.find_one_calls += 1
         slug = query.get("slug")
         if not slug:
             return None
@@ -89,6 +131,8 @@ class FakeCollection:
         if "$inc" in update:
             for key, value in update["$inc"].items():
                 doc[key] = doc.get(key, 0) + value
+        for key, value in update.get("$max", {}).items():
+            doc[key] = max(doc.get(key) or value, value)
         self._docs[slug] = doc
         return doc
 
@@ -100,7 +144,41 @@ class FakeCollection:
         return FakeDeleteResult(0)
 
 
+def _matches(doc: dict[str, Any], query: dict[str, Any]) -> bool:
+    for key, condition in query.items():
+        if key == "$or":
+            if not any(_matches(doc, clause) for clause in condition):
+                return False
+            continue
+        value = doc.get(key)
+        if not isinstance(condition, dict):
+            if value != condition:
+                return False
+            continue
+        for operator, operand in condition.items():
+            if operator == "$ne":
+                matched = value != operand
+            else:
+                compare = {"$lt": lambda a, b: a < b, "$gt": lambda a, b: a > b}[operator]
+                matched = value is not None and compare(value, operand)
+            if not matched:
+                return False
+    return True
+
+
+class FakeAdmin:
+    def __init__(self) -> None:
+        self.commands: list[str] = []
+
+    def command(self, name: str) -> dict[str, object]:
+        self.commands.append(name)
+        return {"ok": 1}
+
+
 class FakeClient:
+    def __init__(self) -> None:
+        self.admin = FakeAdmin()
+
     def close(self) -> None:
         return None
 
@@ -180,7 +258,7 @@ def test_preset_store_list_presets_defaults_to_newest_created() -> None:
     store = _make_store(collection)
     collection._docs = _sortable_preset_documents()
 
-    assert [preset.name for preset in store.list_presets()] == ["Alpha", "Bravo", "Charlie"]
+    assert [preset.name for preset in store.list_presets().presets] == ["Alpha", "Bravo", "Charlie"]
 
 
 @pytest.mark.parametrize(
@@ -201,13 +279,87 @@ def test_preset_store_sorts_every_supported_column_in_both_directions(
     collection._docs = _sortable_preset_documents()
     store = _make_store(collection)
 
-    ascending = [preset.name for preset in store.list_presets(sort_by=sort_by, direction="asc")]
-    descending = [preset.name for preset in store.list_presets(sort_by=sort_by, direction="desc")]
+    ascending = [
+        preset.name for preset in store.list_presets(sort_by=sort_by, direction="asc").presets
+    ]
+    descending = [
+        preset.name for preset in store.list_presets(sort_by=sort_by, direction="desc").presets
+    ]
 
     assert ascending == expected_names
     assert descending == list(reversed(expected_names))
 
 
+@pytest.mark.parametrize("sort_by", ["name", "slug", "template", "created", "updated", "prints"])
+@pytest.mark.parametrize("direction", ["asc", "desc"])
+def test_preset_store_keyset_pages_cover_every_preset_once(sort_by: str, direction: str) -> None:
+    collection = FakeCollection()
+    collection._docs = _sortable_preset_documents()
+    # Ties on the sort key and a legacy document without print_count.
+    collection._docs["bravo"] = {**collection._docs["mike"], "slug": "bravo"}
+    legacy = {**collection._docs["zulu"], "slug": "legacy"}
+    del legacy["print_count"]
+    collection._docs["legacy"] = legacy
+    store = _make_store(collection)
+
+    expected = [
+        preset.slug for preset in store.list_presets(sort_by=sort_by, direction=direction).presets
+    ]
+    seen: list[str] = []
+    after = None
+    while True:
+        page = store.list_presets(sort_by=sort_by, direction=direction, limit=2, after=after)
+        seen.extend(preset.slug for preset in page.presets)
+        if page.next_cursor is None:
+            break
+        after = page.next_cursor
+
+    assert seen == expected
+    assert sorted(seen) == sorted(collection._docs)
+
+
+def test_preset_store_list_presets_projects_requested_fields() -> None:
+    collection = FakeCollection()
+    collection._docs = _sortable_preset_documents()
+    store = _make_store(collection)
+
+    page = store.list_presets(sort_by="name", fields=["name"])
+
+    assert [preset.name for preset in page.presets] == ["Alpha", "Bravo", "Charlie"]
+    assert all(preset.params is None and preset.query == "" for preset in page.presets)
+    assert page.next_cursor is None
+
+
+def test_preset_store_rejects_cursor_from_another_sort() -> None:
+    collection = FakeCollection()
+    collection._docs = _sortable_preset_documents()
+    store = _make_store(collection)
+    cursor = store.list_presets(sort_by="name", limit=1).next_cursor
+    assert cursor is not None
+
+    with pytest.raises(ValueError):
+        store.list_presets(sort_by="prints", limit=1, after=cursor)
+    with pytest.raises(ValueError):
+        store.list_presets(sort_by="name", limit=1, after="not-a-cursor")
+
+
+def test_preset_store_version_changes_on_save_delete_and_print() -> None:
+    collection = FakeCollection()
+    collection._docs = _sortable_preset_documents()
+    store = _make_store(collection)
+    versions = [store.presets_version()]
+
+    store.record_prints({"zulu": 1})
+    versions.append(store.presets_version())
+    store.upsert_preset("Delta", "best_by", {"Text": "Delta"})
+    versions.append(store.presets_version())
+    store.delete_preset("mike")
+    versions.append(store.presets_version())
+
+    assert len(set(versions)) == len(versions)
+    assert store.presets_version() == versions[-1]
+
+
 def _sortable_preset_documents() -> dict[str, dict[str, Any]]:
     return {
         "zulu": {
@@ -348,3 +500,302 @@ def test_cached_store_close_is_noop() -> None:
     store._cached = False
     store.close()
     assert store._client.closed is True
+
+
+def test_preset_store_records_mongo_operation_errors() -> None:
+    collection = FakeCollection()
+    store = _make_store(collection)
+
+    def fail(*_args, **_kwargs):
+        raise RuntimeError("server selection timeout")
+
+    collection.find_one = fail  # type: ignore[method-assign]
+    before = presets.MONGO_ERRORS.labels("find_by_slug").value
+    upsert_before = presets.MONGO_ERRORS.labels("upsert_preset").value
+
+    with pytest.raises(RuntimeError):
+        store.find_by_slug("abc")
+    with pytest.raises(ValueError):
+        store.upsert_preset("", "best_by", {})
+
+    assert presets.MONGO_ERRORS.labels("find_by_slug").value == before + 1
+    assert presets.MONGO_ERRORS.labels("upsert_preset").value == upsert_before
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_cached_store(collection: FakeCollection, clock: FakeClock) -> PresetStore:
+    store = _make_store(collection)
+    store._cache = PresetCache(ttl_seconds=30, clock=clock)
+    return store
+
+
+def test_preset_cache_serves_lookups_from_one_load() -> None:
+    collection = FakeCollection()
+    writer = _make_store(collection)
+    params: dict[str, TemplateFormValue] = {"Line1": "Oat"}
+    preset = writer.upsert_preset("Oat", "bluey_label", params)
+    store = _make_cached_store(collection, FakeClock())
+    find_one_calls = collection.find_one_calls
+
+    assert store.find_slug_for_params("bluey_label", params) == preset.slug
+    found = store.find_by_slug(preset.slug)
+
+    assert found is not None and found.name == "Oat"
+    assert collection.find_calls == 1
+    assert collection.find_one_calls == find_one_calls
+    assert store._cache is not None
+    assert store._cache.stats()["hits"] == 1
+    assert store._cache.stats()["misses"] == 1
+
+
+def test_preset_cache_applies_local_writes_without_reloading() -> None:
+    collection = FakeCollection()
+    store = _make_cached_store(collection, FakeClock())
+    assert store.find_by_slug("missing") is None
+
+    preset = store.upsert_preset("Oat", "bluey_label", {"Line1": "Oat"})
+    assert store.find_by_slug(preset.slug) is not None
+
+    assert store.delete_preset(preset.slug) is True
+    assert store.find_by_slug(preset.slug) is None
+    assert collection.find_calls == 1
+
+
+def test_preset_cache_looks_up_slugs_missing_from_the_snapshot() -> None:
+    collection = FakeCollection()
+    store = _make_cached_store(collection, FakeClock())
+    assert store.find_by_slug("missing") is None
+    assert store.find_slug_for_params("bluey_label", {"Line1": "Oat"}) is None
+    find_one_calls = collection.find_one_calls
+
+    # Written by another worker process, so this store's snapshot did not see it.
+    params: dict[str, TemplateFormValue] = {"Line1": "Oat"}
+    preset = _make_store(collection).upsert_preset("Oat", "bluey_label", params)
+
+    found = store.find_by_slug(preset.slug)
+    assert found is not None and found.name == "Oat"
+    assert store.find_slug_for_params("bluey_label", params) == preset.slug
+    assert collection.find_calls == 1
+    assert collection.find_one_calls > find_one_calls
+
+
+def test_preset_cache_reloads_other_writers_after_ttl() -> None:
+    collection = FakeCollection()
+    clock = FakeClock()
+    writer = _make_store(collection)
+    preset = writer.upsert_preset("Oat", "bluey_label", {"Line1": "Oat"})
+    store = _make_cached_store(collection, clock)
+    assert store.find_by_slug(preset.slug) is not None
+
+    # Deleted by another worker process, so this store's snapshot still has it.
+    assert writer.delete_preset(preset.slug) is True
+    assert store.find_by_slug(preset.slug) is not None
+
+    clock.now += 31
+    assert store.find_by_slug(preset.slug) is None
+    assert collection.find_calls == 2
+
+
+def test_preset_cache_falls_back_to_mongo_for_large_collections() -> None:
+    collection = FakeCollection()
+    writer = _make_store(collection)
+    first = writer.upsert_preset("Oat", "bluey_label", {"Line1": "Oat"})
+    writer.upsert_preset("Rice", "bluey_label", {"Line1": "Rice"})
+    store = _make_store(collection)
+    store._cache = PresetCache(ttl_seconds=30, max_entries=1, clock=FakeClock())
+    find_one_calls = collection.find_one_calls
+
+    assert store.find_by_slug(first.slug) is not None
+    assert store.find_by_slug(first.slug) is not None
+
+    assert collection.find_calls == 1
+    assert collection.find_one_calls == find_one_calls + 2
+
+
+def test_print_count_buffer_coalesces_increments_into_one_bulk_write() -> None:
+    collection = FakeCollection()
+    store = _make_store(collection)
+    oat = store.upsert_preset("Oat", "bluey_label", {"Line1": "Oat"})
+    rice = store.upsert_preset("Rice", "bluey_label", {"Line1": "Rice"})
+    store._print_counts = PrintCountBuffer(store.record_prints, interval_seconds=3600)
+
+    store.record_print_later(oat.slug)
+    store.record_print_later(oat.slug)
+    store.record_print_later(rice.slug, 3)
+
+    assert collection.bulk_write_calls == []
+    assert store._print_counts.flush() == 5
+    assert len(collection.bulk_write_calls) == 1
+    assert len(collection.bulk_write_calls[0]) == 2
+    assert collection._docs[oat.slug]["print_count"] == 2
+    assert collection._docs[rice.slug]["print_count"] == 3
+    assert store._print_counts.flush() == 0
+
+
+def test_print_count_buffer_keeps_counts_when_flush_fails() -> None:
+    written: list[dict[str, int]] = []
+    failures = {"remaining": 1}
+
+    def flush(counts) -> None:
+        if failures["remaining"]:
+            failures["remaining"] -= 1
+            raise ConnectionError("mongodb unavailable")
+        written.append(dict(counts))
+
+    buffer = PrintCountBuffer(flush, interval_seconds=3600)
+    buffer.add("abc", 2)
+    with pytest.raises(ConnectionError):
+        buffer.flush()
+    buffer.add("abc")
+    buffer.close()
+
+    assert written == [{"abc": 3}]
+    assert buffer.stats() == {"pending": 0, "flushes": 1, "flushed_prints": 3, "errors": 1}
+
+
+def test_cached_store_buffers_prints_and_flushes_on_shutdown(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    collection = FakeCollection()
+    preset = _make_store(collection).upsert_preset("Oat", "bluey_label", {"Line1": "Oat"})
+    monkeypatch.setattr(
+        presets.PresetStore, "from_env", classmethod(lambda cls: _make_store(collection))
+    )
+    monkeypatch.setenv("PRESET_PRINT_FLUSH_SECONDS", "3600")
+
+    presets.reset_cached_store()
+    store = presets.get_cached_store()
+    assert store is not None
+    assert store._cache is not None
+    store.record_print_later(preset.slug)
+    assert collection._docs[preset.slug]["print_count"] == 0
+
+    presets.flush_cached_store()
+    assert collection._docs[preset.slug]["print_count"] == 1
+    presets.reset_cached_store()
+
+
+def test_preset_store_replicate_overwrites_and_deletes_in_one_bulk_write() -> None:
+    collection = FakeCollection()
+    collection._docs = _sortable_preset_documents()
+    store = _make_store(collection)
+    store._cache = PresetCache(clock=FakeClock())
+    assert store.find_by_slug("mike") is not None
+    replacement = {**collection._docs["zulu"], "name": "Alpha 2", "print_count": 9}
+
+    store.replicate([replacement], ["mike"])
+
+    assert len(collection.bulk_write_calls) == 1
+    assert collection._docs["zulu"]["name"] == "Alpha 2"
+    assert "mike" not in collection._docs
+    assert store.find_by_slug("mike") is None
+    zulu = store.find_by_slug("zulu")
+    assert zulu is not None and zulu.print_count == 9
+
+
+def test_pooled_mongo_ping_uses_shared_store_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = _make_store(FakeCollection())
+    store._config = MongoConfig(
+        url="mongodb://local-mongodb:27017/app",
+        redacted_url="mongodb://local-mongodb:27017/app",
+        host="local-mongodb",
+        port=27017,
+        database="app",
+        source="env:MONGODB_URL",
+    )
+    monkeypatch.setattr(presets.PresetStore, "from_env", classmethod(lambda cls: store))
+
+    presets.reset_cached_store()
+    assert presets.pooled_mongo_ping() is None
+    assert presets.get_cached_store() is store
+
+    pooled = presets.pooled_mongo_ping()
+    assert pooled is not None
+    config, ping = pooled
+    ping()
+    assert config.host == "local-mongodb"
+    assert cast(FakeClient, store._client).admin.commands == ["ping"]
+    presets.reset_cached_store()
+
+
+class FakeMetaCollection:
+    def __init__(self) -> None:
+        self.docs: dict[str, dict[str, Any]] = {}
+
+    def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+    def update_one(self, query, update, upsert=False):
+        self.docs.setdefault(query["_id"], {"_id": query["_id"]}).update(update["$set"])
+
+
+class FakeIndexedCollection(FakeCollection):
+    def __init__(self) -> None:
+        super().__init__()
+        self.create_indexes_calls: list[list[Any]] = []
+
+    def create_indexes(self, indexes):
+        self.create_indexes_calls.append(list(indexes))
+        return [index.document["name"] for index in indexes]
+
+
+def test_ensure_indexes_runs_once_per_index_version() -> None:
+    collection = FakeIndexedCollection()
+    meta = FakeMetaCollection()
+    store = _make_store(collection)
+    store._meta_collection = cast("Collection", meta)
+
+    store.ensure_indexes()
+    assert len(collection.create_indexes_calls) == 1
+    keys = [list(index.document["key"].items()) for index in collection.create_indexes_calls[0]]
+    assert [("template", 1), ("print_count", -1)] in keys
+    assert meta.docs["indexes"]["version"] == presets.PRESET_INDEX_VERSION
+
+    # A later start against the same database skips index creation.
+    restarted = _make_store(collection)
+    restarted._meta_collection = cast("Collection", meta)
+    restarted.ensure_indexes()
+    assert len(collection.create_indexes_calls) == 1
+
+    meta.docs["indexes"]["version"] = presets.PRESET_INDEX_VERSION - 1
+    restarted.ensure_indexes()
+    assert len(collection.create_indexes_calls) == 2
+
+
+def test_store_bootstrap_connects_in_background(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = _make_store(FakeCollection())
+    release = threading.Event()
+
+    def _slow_from_env(cls):
+        release.wait(5)
+        return store
+
+    monkeypatch.setattr(presets.PresetStore, "from_env", classmethod(_slow_from_env))
+    presets.reset_cached_store()
+
+    presets.start_store_bootstrap()
+    assert presets._STORE_INITIALIZED is False
+    release.set()
+    assert presets.wait_for_store_bootstrap(timeout=5) is store
+    assert presets.get_cached_store() is store
+    presets.reset_cached_store()
+
+
+def test_store_bootstrap_reraises_connection_errors(monkeypatch: pytest.MonkeyPatch) -> None:
+    def _offline(cls):
+        raise ConnectionError("mongo down")
+
+    monkeypatch.setattr(presets.PresetStore, "from_env", classmethod(_offline))
+    presets.reset_cached_store()
+
+    presets.start_store_bootstrap()
+    with pytest.raises(ConnectionError):
+        presets.wait_for_store_bootstrap(timeout=5)
+    presets.reset_cached_store()
@@ -10,7 +10,12 @@ from importlib import import_module
 import pytest
 from werkzeug.serving import make_server
 
-from printer_service.presets import Preset, canonical_query_string, slug_for_params
+from printer_service.presets import (
+    Preset,
+    PresetPage,
+    canonical_query_string,
+    slug_for_params,
+)
 
 app_module = import_module("printer_service.app")
 
@@ -22,8 +27,14 @@ class FakePresetStore:
         self._presets: dict[str, Preset] = {}
 
     def list_presets(
-        self, *, sort_by: str = "created", direction: str = "desc", limit: int = 200
-    ) -> list[Preset]:
+        self,
+        *,
+        sort_by: str = "created",
+        direction: str = "desc",
+        limit: int = 200,
+        after: str | None = None,
+        fields: list[str] | None = None,
+    ) -> PresetPage:
         presets = list(self._presets.values())
         sort_attributes = {
             "name": "name",
@@ -35,7 +46,12 @@ class FakePresetStore:
         }
         attribute = sort_attributes.get(sort_by, "created_at")
         presets.sort(key=lambda preset: getattr(preset, attribute), reverse=direction != "asc")
-        return presets[:limit]
+        start = int(after or 0)
+        end = start + limit
+        return PresetPage(presets[start:end], str(end) if end < len(presets) else None)
+
+    def presets_version(self) -> str:
+        return repr(sorted((p.slug, p.updated_at, p.print_count) for p in self._presets.values()))
 
     def find_by_slug(self, slug: str) -> Preset | None:
         return self._presets.get(slug)
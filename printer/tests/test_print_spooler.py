@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable
+
+import pytest
+
+from printer_service.print_spooler import (
+    PRIORITY_BULK,
+    PRIORITY_INTERACTIVE,
+    PrintSpooler,
+    SpoolerFull,
+)
+
+
+def _recording_work(order: list[str], name: str):
+    def work(progress: Callable[[str], None]) -> tuple[dict, int]:
+        progress("sending")
+        order.append(name)
+        return {"status": "sent", "name": name}, 200
+
+    return work
+
+
+def test_interactive_jobs_run_ahead_of_queued_bulk_jobs() -> None:
+    spooler = PrintSpooler()
+    release = threading.Event()
+    order: list[str] = []
+
+    def blocker(_progress: Callable[[str], None]) -> tuple[dict, int]:
+        release.wait(5)
+        return {"status": "sent"}, 200
+
+    first = spooler.submit("file", blocker, priority=PRIORITY_BULK)
+    bulk = spooler.submit("file", _recording_work(order, "bulk"), priority=PRIORITY_BULK)
+    countdown = spooler.submit(
+        "file", _recording_work(order, "countdown"), priority=PRIORITY_INTERACTIVE
+    )
+    release.set()
+
+    assert all(job.wait(5) for job in (first, bulk, countdown))
+    assert order == ["countdown", "bulk"]
+    spooler.shutdown(timeout=5)
+
+
+def test_backends_have_independent_workers() -> None:
+    spooler = PrintSpooler()
+    release = threading.Event()
+
+    def blocker(_progress: Callable[[str], None]) -> tuple[dict, int]:
+        release.wait(5)
+        return {"status": "sent"}, 200
+
+    stuck = spooler.submit("brother-network", blocker, priority=PRIORITY_INTERACTIVE)
+    other = spooler.submit("file", _recording_work([], "file"), priority=PRIORITY_INTERACTIVE)
+
+    assert other.wait(5)
+    assert not stuck.finished
+    release.set()
+    assert stuck.wait(5)
+    spooler.shutdown(timeout=5)
+
+
+def test_full_queue_rejects_new_jobs() -> None:
+    spooler = PrintSpooler(max_queued=1)
+    release = threading.Event()
+
+    def blocker(_progress: Callable[[str], None]) -> tuple[dict, int]:
+        release.wait(5)
+        return {"status": "sent"}, 200
+
+    job = spooler.submit("file", blocker, priority=PRIORITY_INTERACTIVE)
+    with pytest.raises(SpoolerFull):
+        spooler.submit("file", blocker, priority=PRIORITY_INTERACTIVE)
+    release.set()
+    assert job.wait(5)
+    spooler.submit("file", _recording_work([], "next"), priority=PRIORITY_INTERACTIVE).wait(5)
+    spooler.shutdown(timeout=5)
+
+
+def test_failed_jobs_report_error_and_timings() -> None:
+    spooler = PrintSpooler()
+
+    def unavailable(progress: Callable[[str], None]) -> tuple[dict, int]:
+        progress("sending")
+        return {"error": "Printer unavailable: timed out"}, 503
+
+    def crashes(_progress: Callable[[str], None]) -> tuple[dict, int]:
+        raise RuntimeError("boom")
+
+    failed = spooler.submit("file", unavailable, priority=PRIORITY_INTERACTIVE)
+    crashed = spooler.submit("file", crashes, priority=PRIORITY_INTERACTIVE)
+    assert failed.wait(5) and crashed.wait(5)
+
+    payload = failed.to_dict()
+    assert payload["state"] == "failed"
+    assert payload["status_code"] == 503
+    assert payload["error"] == "Printer unavailable: timed out"
+    assert set(failed.timings()) == {"queue_ms", "render_ms", "send_ms", "total_ms"}
+    assert crashed.status_code == 500
+    assert spooler.get(failed.id) is failed
+    spooler.shutdown(timeout=5)
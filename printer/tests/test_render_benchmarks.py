@@ -0,0 +1,277 @@
+"""Render benchmarks for every discovered label template.
+
+Each case in :data:`CORPUS` is rendered through ``LabelTemplate.render`` with the
+render cache switched off, so every iteration does the full drawing work. Font,
+SVG and QR caches stay warm, as they are in the running service. For every case
+the suite records:
+
+- ``ops_per_sec``: the best of several timed rounds.
+- ``relative_speed``: ``ops_per_sec`` divided by a fixed Pillow calibration
+  workload measured in the same run. This is the value compared against the
+  baseline, so a baseline recorded on a laptop still holds on a slower CI host.
+- ``peak_rss_kib``: how far one render raises the process's peak resident set
+  size. Unlike ``tracemalloc`` this includes Pillow's pixel buffers, which are
+  allocated outside the Python allocator. It needs Linux's ``/proc``; on other
+  platforms it is not recorded and not compared.
+
+Baselines live in ``tests/baselines/render_benchmarks.json`` and are checked into
+git. A case fails when its relative speed drops, or its peak RSS grows, by more
+than ``--benchmark-threshold`` (default 25%).
+
+## Running
+
+Benchmarks are skipped unless requested:
+    .venv/bin/pytest tests/test_render_benchmarks.py --benchmark -v
+
+Regenerate the baseline after an intentional change (or on new hardware):
+    .venv/bin/pytest tests/test_render_benchmarks.py --regenerate-benchmarks -v
+
+Loosen the threshold on a noisy machine:
+    .venv/bin/pytest tests/test_render_benchmarks.py --benchmark --benchmark-threshold 0.4
+"""
+
+from __future__ import annotations
+
+import ctypes
+import json
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Mapping
+
+import pytest
+from PIL import Image, ImageFilter
+
+from printer_service import label_templates
+from printer_service.label_templates import LabelTemplate, TemplateFormValue
+from printer_service.label_templates.helper import svg_symbol_options
+from printer_service.label_templates.render_cache import RenderCache
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "render_benchmarks.json"
+
+# A render must run for at least this long per round, and for at least this many
+# iterations, before its rate is trusted.
+ROUND_SECONDS = 0.2
+MIN_ITERATIONS = 3
+ROUNDS = 5
+
+# Peak RSS changes smaller than this are noise, whatever the percentage.
+PEAK_RSS_SLACK_KIB = 256.0
+
+LONG_LINE = "Roasted Butternut Squash & Sage Soup"
+LONG_SUBLINE = "with brown butter, toasted pepitas and crème fraîche"
+QR_URL = "http://homeassistant.local:8099/bb?tpl=best_by&Delta=2+weeks&print=true"
+
+_BLUEY_BASE: dict[str, TemplateFormValue] = {
+    "Line1": "Oat Milk",
+    "Line2": "Shelf 2",
+    "Side": "RT",
+    "Bottom": "07/11/25",
+}
+
+CORPUS: dict[str, dict[str, Mapping[str, TemplateFormValue]]] = {
+    "best_by": {
+        "default": {"BaseDate": "2025-07-11"},
+        "month_delta_custom_prefix": {
+            "BaseDate": "2025-07-11",
+            "Delta": "1 month",
+            "Prefix": "Use by: ",
+        },
+        "long_text": {"Text": f"{LONG_LINE} {LONG_SUBLINE}"},
+        "qr_label": {
+            "BaseDate": "2025-07-11",
+            "Delta": "2 weeks",
+            "QrUrl": QR_URL,
+            "QrText": LONG_LINE,
+        },
+    },
+    "bluey_label": {
+        "default": _BLUEY_BASE,
+        "long_captions": {
+            **_BLUEY_BASE,
+            "Line1": LONG_LINE,
+            "Line2": LONG_SUBLINE,
+            "Side": "Dairy-free",
+        },
+        **{
+            f"symbol_{option['slug']}": {**_BLUEY_BASE, "SymbolName": option["slug"]}
+            for option in svg_symbol_options()
+        },
+        "meter_low": {**_BLUEY_BASE, "Side": "=METER", "Percentage": "5:Low"},
+        "meter_full": {**_BLUEY_BASE, "Side": "=METER", "Percentage": "100:Full"},
+        "jar": {
+            **_BLUEY_BASE,
+            "Line1": "Sweet Potato",
+            "Line2": "Puree",
+            "Supplier": "Local Farm",
+            "Percentage": "50%",
+            "jar_label_request": "true",
+            "jar_qr_url": QR_URL,
+        },
+        "jar_long_captions": {
+            **_BLUEY_BASE,
+            "Line1": LONG_LINE,
+            "Line2": LONG_SUBLINE,
+            "Supplier": "Hudson Valley Farm Co-op",
+            "Percentage": "100%",
+            "jar_label_request": "true",
+            "jar_qr_url": QR_URL,
+        },
+    },
+}
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    ops_per_sec: float
+    relative_speed: float
+    peak_rss_kib: float | None
+
+
+def _corpus_cases() -> Iterator[tuple[LabelTemplate, str, Mapping[str, TemplateFormValue]]]:
+    for template in label_templates.all_templates():
+        cases = CORPUS.get(template.slug)
+        if cases is None:
+            # Templates without a curated corpus still get their warm-up forms.
+            cases = {
+                f"warmup_{index}": form_data
+                for index, form_data in enumerate(template.warmup_form_data())
+            }
+        for name, form_data in cases.items():
+            yield template, name, form_data
+
+
+def _case_ids() -> list[str]:
+    return [f"{template.slug}/{name}" for template, name, _ in _corpus_cases()]
+
+
+def _best_rate(run: Callable[[], object]) -> float:
+    """Return the best operations per second over :data:`ROUNDS` timed rounds."""
+    run()
+    best = 0.0
+    for _ in range(ROUNDS):
+        iterations = 0
+        started = time.perf_counter()
+        elapsed = 0.0
+        while iterations < MIN_ITERATIONS or elapsed < ROUND_SECONDS:
+            run()
+            iterations += 1
+            elapsed = time.perf_counter() - started
+        best = max(best, iterations / elapsed)
+    return best
+
+
+def _calibration_workload() -> None:
+    canvas = Image.new("L", (720, 390), color=255)
+    canvas.paste(0, (40, 40, 680, 350))
+    canvas.filter(ImageFilter.GaussianBlur(3)).resize((360, 195)).tobytes()
+    sum(index * index for index in range(20_000))
+
+
+def _proc_status_kib(*fields: str) -> list[int]:
+    status = dict(line.split(":", 1) for line in Path("/proc/self/status").read_text().splitlines())
+    return [int(status[field].split()[0]) for field in fields]
+
+
+def _peak_rss_kib(run: Callable[[], object]) -> float | None:
+    """Return how far one ``run`` raises the peak RSS, or ``None`` without ``/proc``."""
+    try:
+        libc = ctypes.CDLL(None)
+        # Hand freed heap pages back first, so the render has to fault in its own.
+        getattr(libc, "malloc_trim", lambda _pad: None)(0)
+        # "5" resets VmHWM, the peak RSS, to the current RSS.
+        Path("/proc/self/clear_refs").write_text("5")
+        (before,) = _proc_status_kib("VmRSS")
+    except OSError:
+        return None
+    run()
+    (peak,) = _proc_status_kib("VmHWM")
+    return float(peak - before)
+
+
+def _load_baseline() -> dict[str, dict[str, float]]:
+    if not BASELINE_PATH.exists():
+        return {}
+    payload = json.loads(BASELINE_PATH.read_text())
+    return payload["cases"]
+
+
+@pytest.fixture(scope="session")
+def calibration_ops_per_sec() -> float:
+    return _best_rate(_calibration_workload)
+
+
+@pytest.fixture(scope="session")
+def benchmark_recorder(request: pytest.FixtureRequest) -> Iterator[dict[str, dict[str, float]]]:
+    """Collect results and, when regenerating, write them out after the session."""
+    recorded: dict[str, dict[str, float]] = {}
+    yield recorded
+    if request.config.getoption("--regenerate-benchmarks") and recorded:
+        cases = {**_load_baseline(), **recorded}
+        BASELINE_PATH.write_text(
+            json.dumps({"cases": dict(sorted(cases.items()))}, indent=2) + "\n"
+        )
+        print(f"Wrote benchmark baseline: {BASELINE_PATH}")
+
+
+@pytest.fixture
+def uncached_renders(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(label_templates, "_RENDER_CACHE", RenderCache(max_bytes=0))
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("case_id", _case_ids())
+def test_render_benchmark(
+    case_id: str,
+    request: pytest.FixtureRequest,
+    calibration_ops_per_sec: float,
+    benchmark_recorder: dict[str, dict[str, float]],
+    uncached_renders: None,
+) -> None:
+    template, _name, form_data = next(
+        (template, name, form_data)
+        for template, name, form_data in _corpus_cases()
+        if f"{template.slug}/{name}" == case_id
+    )
+
+    def run() -> Image.Image:
+        return template.render(form_data)
+
+    ops_per_sec = _best_rate(run)
+    result = BenchmarkResult(
+        ops_per_sec=round(ops_per_sec, 2),
+        relative_speed=round(ops_per_sec / calibration_ops_per_sec, 4),
+        peak_rss_kib=_peak_rss_kib(run),
+    )
+    print(f"{case_id}: {result}")
+
+    baseline = _load_baseline().get(case_id)
+    if request.config.getoption("--regenerate-benchmarks") or baseline is None:
+        # Without /proc the baseline has no peak RSS, and later runs skip the check.
+        benchmark_recorder[case_id] = {
+            key: value for key, value in asdict(result).items() if value is not None
+        }
+        return
+
+    threshold = request.config.getoption("--benchmark-threshold")
+    slowest = baseline["relative_speed"] * (1 - threshold)
+    assert result.relative_speed >= slowest, (
+        f"{case_id} rendered at {result.relative_speed:.4f}x calibration "
+        f"({result.ops_per_sec:.1f} ops/s), below {slowest:.4f}x "
+        f"(baseline {baseline['relative_speed']:.4f}x, threshold {threshold:.0%}).\n"
+        f"  To update the baseline: pytest {__file__} --regenerate-benchmarks"
+    )
+    baseline_rss = baseline.get("peak_rss_kib")
+    if result.peak_rss_kib is None or baseline_rss is None:
+        return
+    largest = max(baseline_rss * (1 + threshold), baseline_rss + PEAK_RSS_SLACK_KIB)
+    assert result.peak_rss_kib <= largest, (
+        f"{case_id} raised peak RSS by {result.peak_rss_kib:.0f} KiB, "
+        f"above {largest:.0f} KiB (baseline {baseline_rss:.0f} KiB).\n"
+        f"  To update the baseline: pytest {__file__} --regenerate-benchmarks"
+    )
+
+
+def test_benchmark_baseline_covers_every_case() -> None:
+    """The committed baseline must stay in step with the discovered templates and corpus."""
+    assert sorted(_load_baseline()) == sorted(_case_ids())
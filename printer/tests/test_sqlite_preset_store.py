@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import cast
+
+import pytest
+
+import printer_service.presets as presets
+from printer_service.presets import (
+    MongoReplicator,
+    PresetBackend,
+    PresetStore,
+    SqlitePresetStore,
+    canonical_params,
+    canonical_query_string,
+    slug_for_params,
+)
+
+
+class FakeMongoStore:
+    """The part of a MongoDB ``PresetStore`` that ``MongoReplicator`` uses."""
+
+    def __init__(self, docs: Iterable[Mapping[str, object]] = ()) -> None:
+        self.docs: dict[str, dict[str, object]] = {str(doc["slug"]): dict(doc) for doc in docs}
+        self.replicate_calls: list[tuple[list[str], list[str]]] = []
+        self.fail = False
+
+    def replicate(self, documents: Iterable[Mapping[str, object]], deleted: Iterable[str]) -> None:
+        if self.fail:
+            raise ConnectionError("mongo down")
+        replaced = [dict(doc) for doc in documents]
+        removed = list(deleted)
+        self.replicate_calls.append(([str(doc["slug"]) for doc in replaced], removed))
+        for doc in replaced:
+            self.docs[str(doc["slug"])] = doc
+        for slug in removed:
+            self.docs.pop(slug, None)
+
+    def _load_documents(self) -> list[Mapping[str, object]]:
+        if self.fail:
+            raise ConnectionError("mongo down")
+        return list(self.docs.values())
+
+    def close(self, *, force: bool = False) -> None:
+        return None
+
+
+def _open_store(tmp_path: Path) -> SqlitePresetStore:
+    store = SqlitePresetStore(str(tmp_path / "presets.sqlite3"))
+    store.ensure_indexes()
+    return store
+
+
+def _attach_replicator(store: SqlitePresetStore, target: FakeMongoStore) -> MongoReplicator:
+    replicator = MongoReplicator(
+        store.documents_by_slug,
+        lambda: cast("PresetStore", target),
+        interval_seconds=3600,
+    )
+    store._replicator = replicator
+    return replicator
+
+
+def _seed_sortable_presets(store: SqlitePresetStore) -> None:
+    store.import_documents(
+        [
+            {
+                "slug": "zulu",
+                "name": "Alpha",
+                "template": "best_by",
+                "query": "tpl=best_by&Text=Alpha",
+                "params": {"Text": "Alpha"},
+                "created_at": "2024-03-01T00:00:00+00:00",
+                "updated_at": "2024-01-01T00:00:00+00:00",
+                "print_count": 2,
+            },
+            {
+                "slug": "alpha",
+                "name": "Charlie",
+                "template": "bluey_label",
+                "query": "tpl=bluey_label&Line1=Charlie",
+                "params": {"Line1": "Charlie"},
+                "created_at": "2024-01-01T00:00:00+00:00",
+                "updated_at": "2024-03-01T00:00:00+00:00",
+                "print_count": 1,
+            },
+            {
+                "slug": "mike",
+                "name": "Bravo",
+                "template": "bb_2_weeks",
+                "query": "tpl=bb_2_weeks&Text=Bravo",
+                "params": {"Text": "Bravo"},
+                "created_at": "2024-02-01T00:00:00+00:00",
+                "updated_at": "2024-02-01T00:00:00+00:00",
+                "print_count": 3,
+            },
+        ]
+    )
+
+
+def test_sqlite_store_upsert_uses_canonical_slugs(tmp_path: Path) -> None:
+    store = _open_store(tmp_path)
+    params = {"Line1": " Oat ", "Tags": ["b", " ", "a"], "template": "ignored"}
+
+    first = store.upsert_preset("  Oat Milk ", "Bluey_Label", params)
+    second = store.upsert_preset(
+        "Oat Milk Updated", "bluey_label", {"Line1": "Oat", "Tags": ["b", "a"]}
+    )
+
+    assert first.slug == slug_for_params("bluey_label", params)
+    assert first.query == canonical_query_string("bluey_label", params)
+    assert first.params == canonical_params(params)
+    assert second.slug == first.slug
+    assert second.created_at == first.created_at
+    assert second.name == "Oat Milk Updated"
+    assert second.print_count == 0
+    assert store.find_slug_for_params("bluey_label", params) == first.slug
+    found = store.find_by_slug(first.slug)
+    assert found is not None and found.name == "Oat Milk Updated"
+
+    assert store.delete_preset(first.slug) is True
+    assert store.find_by_slug(first.slug) is None
+    assert store.delete_preset(first.slug) is False
+
+
+@pytest.mark.parametrize(
+    ("sort_by", "expected_names"),
+    [
+        ("name", ["Alpha", "Bravo", "Charlie"]),
+        ("slug", ["Charlie", "Bravo", "Alpha"]),
+        ("template", ["Bravo", "Alpha", "Charlie"]),
+        ("created", ["Charlie", "Bravo", "Alpha"]),
+        ("updated", ["Alpha", "Bravo", "Charlie"]),
+        ("prints", ["Charlie", "Alpha", "Bravo"]),
+    ],
+)
+def test_sqlite_store_pages_every_sort_in_both_directions(
+    tmp_path: Path, sort_by: str, expected_names: list[str]
+) -> None:
+    store = _open_store(tmp_path)
+    _seed_sortable_presets(store)
+
+    for direction, expected in (("asc", expected_names), ("desc", expected_names[::-1])):
+        names: list[str] = []
+        after = None
+        while True:
+            page = store.list_presets(sort_by=sort_by, direction=direction, limit=1, after=after)
+            names.extend(preset.name for preset in page.presets)
+            if page.next_cursor is None:
+                break
+            after = page.next_cursor
+        assert names == expected
+
+
+def test_sqlite_store_sorts_use_indexes(tmp_path: Path) -> None:
+    store = _open_store(tmp_path)
+
+    with store._connection() as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        for field in ("name", "template", "created_at", "updated_at", "print_count"):
+            plan = " ".join(
+                row["detail"]
+                for row in connection.execute(
+                    f"EXPLAIN QUERY PLAN SELECT * FROM presets WHERE ({field}, slug) < (?, ?)"
+                    f" ORDER BY {field} DESC, slug DESC LIMIT 10",
+                    ("x", "y"),
+                )
+            )
+            assert f"presets_{field}_slug" in plan
+            assert "TEMP B-TREE" not in plan
+
+
+def test_sqlite_store_projects_fields_and_tracks_version(tmp_path: Path) -> None:
+    store = _open_store(tmp_path)
+    _seed_sortable_presets(store)
+
+    page = store.list_presets(sort_by="name", fields=["name"])
+    assert [preset.name for preset in page.presets] == ["Alpha", "Bravo", "Charlie"]
+    assert all(preset.params is None and preset.query == "" for preset in page.presets)
+
+    versions = [store.presets_version()]
+    store.record_prints({"zulu": 1})
+    versions.append(store.presets_version())
+    store.delete_preset("mike")
+    versions.append(store.presets_version())
+    assert len(set(versions)) == len(versions)
+
+
+def test_sqlite_store_increments_print_counts_atomically(tmp_path: Path) -> None:
+    store = _open_store(tmp_path)
+    preset = store.upsert_preset("Oat", "bluey_label", {"Line1": "Oat"})
+    # A second store on the same file stands in for another pre-fork worker.
+    other = _open_store(tmp_path)
+
+    def record(target: SqlitePresetStore) -> None:
+        for _ in range(25):
+            target.record_prints({preset.slug: 2})
+            target.record_print(preset.slug)
+
+    threads = [threading.Thread(target=record, args=(target,)) for target in (store, other) * 3]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    found = store.find_by_slug(preset.slug)
+    assert found is not None
+    assert found.print_count == 6 * 25 * 3
+    store.close()
+    other.close()
+
+
+def test_sqlite_store_keeps_a_bounded_pool_across_short_lived_threads(tmp_path: Path) -> None:
+    store = _open_store(tmp_path)
+    preset = store.upsert_preset("Oat", "bluey_label", {"Line1": "Oat"})
+    errors: list[BaseException] = []
+
+    def request() -> None:
+        # One threaded-server request: a thread that lives for a single lookup.
+        try:
+            assert store._find_by_slug(preset.slug) is not None
+            store.list_presets(limit=5)
+        except BaseException as exc:
+            errors.append(exc)
+
+    for _ in range(30):
+        threads = [threading.Thread(target=request) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert errors == []
+    assert len(store._connections) <= store.max_connections
+    assert len(store._idle) == len(store._connections)
+    store.close()
+    assert store._connections == []
+
+
+def test_sqlite_store_replicates_changes_to_mongo(tmp_path: Path) -> None:
+    store = _open_store(tmp_path)
+    target = FakeMongoStore()
+    replicator = _attach_replicator(store, target)
+
+    kept = store.upsert_preset("Oat", "bluey_label", {"Line1": "Oat"})
+    removed = store.upsert_preset("Rice", "bluey_label", {"Line1": "Rice"})
+    store.record_prints({kept.slug: 2})
+    store.delete_preset(removed.slug)
+    assert target.replicate_calls == []
+
+    assert replicator.flush() > 0
+    assert target.replicate_calls == [([kept.slug], [removed.slug])]
+    assert target.docs[kept.slug]["print_count"] == 2
+    assert target.docs[kept.slug]["params"] == {"Line1": "Oat"}
+    assert removed.slug not in target.docs
+    assert replicator.stats()["replicated"] == 4
+
+
+def test_sqlite_store_implements_the_backend_without_mongo_members(tmp_path: Path) -> None:
+    store = _open_store(tmp_path)
+
+    assert isinstance(store, PresetBackend)
+    assert not isinstance(store, PresetStore)
+    assert not hasattr(store, "collection")
+    assert not hasattr(store, "replicate")
+    assert store.pooled_ping() is None
+    assert store.background_writers() == []
+
+    replicator = _attach_replicator(store, FakeMongoStore())
+    assert store.background_writers() == [replicator]
+    store.close()
+
+
+def test_sqlite_store_keeps_changes_while_mongo_is_down(tmp_path: Path) -> None:
+    store = _open_store(tmp_path)
+    target = FakeMongoStore()
+    target.fail = True
+    replicator = _attach_replicator(store, target)
+    preset = store.upsert_preset("Oat", "bluey_label", {"Line1": "Oat"})
+
+    with pytest.raises(ConnectionError):
+        replicator.flush()
+    assert replicator.stats()["errors"] == 1
+    assert store.find_by_slug(preset.slug) is not None
+
+    target.fail = False
+    replicator.close()
+    assert preset.slug in target.docs
+
+
+def test_cached_sqlite_store_imports_mongo_presets_once(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    target = FakeMongoStore(
+        [
+            {
+                "slug": "legacy",
+                "name": "Legacy",
+                "template": "bluey_label",
+                "query": "tpl=bluey_label&Line1=Legacy",
+                "params": {"Line1": "Legacy"},
+                "created_at": "2024-01-01T00:00:00+00:00",
+                "updated_at": "2024-01-01T00:00:00+00:00",
+            }
+        ]
+    )
+    monkeypatch.setenv("PRESET_STORE_BACKEND", "sqlite")
+    monkeypatch.setenv("PRESET_SQLITE_PATH", str(tmp_path / "presets.sqlite3"))
+    monkeypatch.setenv("PRESET_SQLITE_REPLICATE", "1")
+    monkeypatch.setenv("MONGODB_URL", "mongodb://localhost:27017/smarthome")
+    monkeypatch.setattr(presets.PresetStore, "from_env", classmethod(lambda cls: target))
+
+    presets.reset_cached_store()
+    store = presets.get_cached_store()
+    assert isinstance(store, SqlitePresetStore)
+    assert store._cache is None and store._print_counts is None
+    legacy = store.find_by_slug("legacy")
+    assert legacy is not None and legacy.print_count == 0
+
+    store.record_print_later("legacy", 2)
+    target.docs.clear()
+    presets.flush_cached_store()
+    assert target.docs["legacy"]["print_count"] == 2
+
+    # Later starts do not import again, so presets deleted locally stay deleted.
+    store.delete_preset("legacy")
+    presets.reset_cached_store()
+    target.docs["legacy"] = {"slug": "legacy", "name": "Legacy"}
+    reopened = presets.get_cached_store()
+    assert reopened is not None
+    assert reopened.find_by_slug("legacy") is None
+    presets.reset_cached_store()
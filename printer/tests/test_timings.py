@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+
+from printer_service.timings import PhaseTimings, collecting, phase, submit_in_context
+
+
+def test_phases_are_ignored_without_a_collector() -> None:
+    timings = PhaseTimings()
+    with phase("render"):
+        pass
+
+    assert timings.to_dict() == {}
+    assert timings.server_timing() == ""
+
+
+def test_phases_are_summed_across_executor_workers() -> None:
+    timings = PhaseTimings()
+
+    def render() -> int:
+        with phase("render"):
+            return 1
+
+    with collecting(timings), ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [submit_in_context(executor, render) for _ in range(3)]
+        assert [future.result() for future in futures] == [1, 1, 1]
+        with phase("encode"):
+            pass
+
+    assert list(timings.to_dict()) == ["render_ms", "encode_ms"]
+    header = timings.server_timing()
+    assert header.startswith("render;dur=")
+    assert ", encode;dur=" in header
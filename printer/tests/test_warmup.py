@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import http.client
+import importlib
+import json
+import signal
+import threading
+from typing import Any
+
+from werkzeug.serving import BaseWSGIServer
+
+from printer_service import label_templates, presets
+from printer_service.app import create_app
+from printer_service.warmup import WarmupState, WarmupStep, default_steps, run_warmup
+
+
+def test_run_warmup_is_not_ready_until_every_step_finished() -> None:
+    state = WarmupState()
+    observed: list[bool] = []
+
+    def failing_step() -> None:
+        observed.append(state.ready)
+        raise RuntimeError("store offline")
+
+    report = run_warmup(
+        state,
+        [
+            WarmupStep("fonts", lambda: {"path": "font.ttf"}),
+            WarmupStep("presets", failing_step),
+        ],
+    )
+
+    assert observed == [False]
+    assert state.ready
+    assert list(report.steps_ms) == ["fonts", "presets"]
+    assert report.results == {"fonts": {"path": "font.ttf"}}
+    assert report.errors == {"presets": "RuntimeError: store offline"}
+    assert state.snapshot()["warmup"] == report.to_dict()
+
+
+def test_default_steps_render_every_template_and_touch_presets() -> None:
+    names = [step.name for step in default_steps()]
+
+    assert names[:2] == ["templates", "fonts"]
+    for template in label_templates.all_templates():
+        assert f"render.{template.slug}" in names
+    assert names[-1] == "presets"
+
+
+def test_presets_step_stops_waiting_for_a_slow_store(monkeypatch) -> None:
+    connecting = threading.Event()
+    bootstrap = threading.Thread(target=connecting.wait, args=(10,), daemon=True)
+    bootstrap.start()
+    monkeypatch.setattr(presets, "_BOOTSTRAP", bootstrap)
+    monkeypatch.setattr(presets, "_BOOTSTRAP_ERROR", None)
+    monkeypatch.setenv("PRESET_BOOTSTRAP_WAIT_SECONDS", "0.05")
+    state = WarmupState()
+    try:
+        report = run_warmup(state, [step for step in default_steps() if step.name == "presets"])
+    finally:
+        connecting.set()
+
+    assert state.ready
+    assert report.errors["presets"].startswith("TimeoutError")
+    assert report.steps_ms["presets"] < 5000
+
+
+def test_readiness_route_follows_warmup_state() -> None:
+    app = create_app()
+    client = app.test_client()
+    state = app.extensions["warmup"]
+
+    assert client.get("/health/ready").status_code == 200
+
+    state.begin()
+    response = client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "warming"
+
+    run_warmup(state, [WarmupStep("noop", lambda: None)])
+    response = client.get("/health/ready")
+    assert response.status_code == 200
+    assert response.get_json()["warmup"]["steps_ms"].keys() == {"noop"}
+
+
+def test_real_server_is_not_ready_while_warmup_runs(monkeypatch) -> None:
+    app_module = importlib.import_module("printer_service.app")
+    real_make_server = app_module.make_server
+    servers: list[BaseWSGIServer] = []
+    release = threading.Event()
+
+    def capture_server(host, _port, *args, **kwargs):
+        server = real_make_server(host, 0, *args, **kwargs)
+        servers.append(server)
+        return server
+
+    def ready_status(port: int) -> tuple[int, dict[str, Any]]:
+        connection = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        try:
+            connection.request("GET", "/health/ready")
+            response = connection.getresponse()
+            return response.status, json.loads(response.read())
+        finally:
+            connection.close()
+
+    monkeypatch.delenv("PRINTER_WORKERS", raising=False)
+    monkeypatch.setattr(app_module, "make_server", capture_server)
+    # Signal handlers can only be installed from the main thread.
+    monkeypatch.setattr(app_module.signal, "signal", lambda *_args: signal.SIG_DFL)
+    monkeypatch.setattr(
+        app_module, "default_steps", lambda: [WarmupStep("slow", lambda: release.wait(10))]
+    )
+    serving = threading.Thread(
+        target=app_module._serve_production, args=(create_app(), "127.0.0.1", 0), daemon=True
+    )
+    serving.start()
+    try:
+        for _ in range(500):
+            if servers:
+                break
+            threading.Event().wait(0.01)
+        port = servers[0].server_port
+
+        status, body = ready_status(port)
+        assert (status, body["status"]) == (503, "warming")
+
+        release.set()
+        for _ in range(500):
+            status, body = ready_status(port)
+            if status == 200:
+                break
+            threading.Event().wait(0.01)
+        assert status == 200
+        assert body["warmup"]["steps_ms"].keys() == {"slow"}
+    finally:
+        release.set()
+        if servers:
+            servers[0].shutdown()
+        serving.join(timeout=10)
+    assert not serving.is_alive()